@@ -41,6 +41,19 @@ from ..utils.formatting_utils import (
 
 logger = logging.getLogger(__name__)
 
+# Fields of the model's <answer> block (closing tag optional) and legacy format,
+# compiled once instead of on every fact
+_ANSWER_RE = re.compile(r"<answer>(.*?)(?:</answer>|$)", re.DOTALL)
+_LOCATION_RE = re.compile(r"Location:\s*(.+?)(?:\n|$)")
+_COORDINATES_RE = re.compile(r"Coordinates:\s*([\-\d\.]+)\s*,\s*([\-\d\.]+)")
+_SEARCH_RE = re.compile(r"Search:\s*(.+?)(?:\n|$)")
+_FACT_RE = re.compile(
+    r"Interesting fact:\s*(.*?)(?=\n(?:Sources|Источники)\s*:|$)", re.DOTALL
+)
+_SEARCH_LEGACY_RE = re.compile(r"Поиск:\s*(.+?)(?:\n|$)")
+# Square brackets would break the Markdown link built around a source title
+_LINK_BRACKETS_RE = re.compile(r"[\[\]]")
+
 # Localized messages for location handler
 LOCATION_MESSAGES = {
     "ru": {
@@ -621,20 +634,18 @@ async def handle_location(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
         # Try to parse structured response from <answer> tags first
         # Make regex flexible: accept with or without closing tag
-        answer_match = re.search(r"<answer>(.*?)(?:</answer>|$)", response, re.DOTALL)
+        answer_match = _ANSWER_RE.search(response)
         if answer_match:
             answer_content = answer_match.group(1).strip()
             poi_coords: tuple[float, float] | None = None
 
             # Extract location from answer content
-            location_match = re.search(r"Location:\s*(.+?)(?:\n|$)", answer_content)
+            location_match = _LOCATION_RE.search(answer_content)
             if location_match:
                 place = location_match.group(1).strip()
 
             # Extract precise coordinates if provided
-            coord_match = re.search(
-                r"Coordinates:\s*([\-\d\.]+)\s*,\s*([\-\d\.]+)", answer_content
-            )
+            coord_match = _COORDINATES_RE.search(answer_content)
             if coord_match:
                 try:
                     lat = float(coord_match.group(1))
@@ -644,16 +655,12 @@ async def handle_location(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
                     pass
 
             # Extract search keywords from answer content
-            search_match = re.search(r"Search:\s*(.+?)(?:\n|$)", answer_content)
+            search_match = _SEARCH_RE.search(answer_content)
             if search_match:
                 final_search_keywords = search_match.group(1).strip()
 
             # Extract fact from answer content (stop before Sources/Источники if present)
-            fact_match = re.search(
-                r"Interesting fact:\s*(.*?)(?=\n(?:Sources|Источники)\s*:|$)",
-                answer_content,
-                re.DOTALL,
-            )
+            fact_match = _FACT_RE.search(answer_content)
             if fact_match:
                 fact = _strip_sources_section(fact_match.group(1).strip())
                 # Remove bare links in body (e.g., (example.com))
@@ -680,7 +687,7 @@ async def handle_location(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
                     break
 
             # Extract search keywords from legacy format
-            legacy_search_match = re.search(r"Поиск:\s*(.+?)(?:\n|$)", response)
+            legacy_search_match = _SEARCH_LEGACY_RE.search(response)
             if legacy_search_match:
                 final_search_keywords = legacy_search_match.group(1).strip()
 
@@ -694,7 +701,7 @@ async def handle_location(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
                 bullets = []
                 for title, url in sources[:4]:
                     # Build bolded emoji bullet with Markdown link
-                    safe_title = re.sub(r"[\[\]]", "", title)[:80]
+                    safe_title = _LINK_BRACKETS_RE.sub("", title)[:80]
                     safe_url = _sanitize_url(url)
                     bullets.append(f"- **[{safe_title}]({safe_url})**")
                 sources_block = f"\n\n{src_label}\n" + "\n".join(bullets)
@@ -715,7 +722,7 @@ async def handle_location(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
                 src_label = await get_localized_message(user_id, "sources_label")
                 bullets = []
                 for title, url in sources[:4]:
-                    safe_title = re.sub(r"[\[\]]", "", title)[:80]
+                    safe_title = _LINK_BRACKETS_RE.sub("", title)[:80]
                     safe_url = _sanitize_url(url)
                     bullets.append(f"- **[{safe_title}]({safe_url})**")
                 sources_block = f"\n\n{src_label}\n" + "\n".join(bullets)
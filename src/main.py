@@ -38,6 +38,8 @@ from src.handlers.location import (
     handle_location,
 )
 from src.services.async_donors_wrapper import get_async_donors_db
+from src.services.claude_client import get_claude_client
+from src.services.donors_db import close_donors_db
 from src.services.firebase_stats import ensure_user as fb_ensure_user
 
 # Load environment variables from .env file
@@ -342,6 +344,18 @@ async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> N
     logger.error(f"Exception while handling an update: {context.error}")
 
 
+async def post_shutdown(application: Application) -> None:
+    """Close the shared HTTP session and the sync database wrapper."""
+    try:
+        await get_claude_client().close()
+    except Exception as e:
+        logger.warning(f"Failed to close HTTP session: {e}")
+    try:
+        close_donors_db()
+    except Exception as e:
+        logger.warning(f"Failed to close donors database: {e}")
+
+
 def main() -> None:
     """Main function to run the bot."""
     logger.info("Starting Bot Voyage...")
@@ -404,7 +418,9 @@ def main() -> None:
         raise ValueError("TELEGRAM_BOT_TOKEN environment variable is required")
 
     # Create application
-    application = Application.builder().token(bot_token).build()
+    application = (
+        Application.builder().token(bot_token).post_shutdown(post_shutdown).build()
+    )
 
     # Add command handlers
     application.add_handler(CommandHandler("start", start_command))
@@ -1,19 +1,175 @@
 """Claude client for generating location-based facts using Anthropic API."""
 
 import asyncio
+import functools
+import heapq
+import itertools
 import logging
 import os
 import re
+import sys
 import time
-from urllib.parse import quote
+from collections import OrderedDict, deque
+from collections.abc import Iterable, Iterator
 
 import aiohttp
+import orjson
 from anthropic import AsyncAnthropic
 
+from .lookup_common import (
+    NOMINATIM_TYPE_SCORES,
+    SharedLookupsMixin,
+    quote_title,
+    wiki_article_titles,
+    wiki_fallback_languages,
+)
 from .web_search import get_web_search_service
 
 logger = logging.getLogger(__name__)
 
+# Patterns for the <answer> block and the fields inside it (plus legacy fields)
+_ANSWER_RE = re.compile(r"<answer>(.*?)</answer>", re.DOTALL)
+_SEARCH_RE = re.compile(r"Search:\s*(.+?)(?:\n|$)")
+_LOCATION_RE = re.compile(r"Location:\s*(.+?)(?:\n|$)")
+_SEARCH_LEGACY_RE = re.compile(r"Поиск:\s*(.+?)(?:\n|$)")
+_LOCATION_LEGACY_RE = re.compile(r"Локация:\s*(.+?)(?:\n|$)")
+
+# Wikipedia image searches are memoized per client, bounded in size (LRU)
+_WIKI_SEARCH_CACHE_MAX_ENTRIES = 2048
+
+# Country (as Nominatim reports it) -> (language, local history / historic
+# building / unusual places search terms) for web searches
+_LOCAL_SEARCH_TERMS = {
+    "France": (
+        "fr",
+        "histoire",
+        "bâtiment historique",
+        "lieux insolites",
+    ),
+    "Deutschland": (
+        "de",
+        "Geschichte",
+        "historisches Gebäude",
+        "ungewöhnliche Orte",
+    ),
+    "Germany": (
+        "de",
+        "Geschichte",
+        "historisches Gebäude",
+        "ungewöhnliche Orte",
+    ),
+    "España": (
+        "es",
+        "historia",
+        "edificio histórico",
+        "lugares inusuales",
+    ),
+    "Spain": (
+        "es",
+        "historia",
+        "edificio histórico",
+        "lugares inusuales",
+    ),
+    "Italia": ("it", "storia", "edificio storico", "luoghi insoliti"),
+    "Italy": ("it", "storia", "edificio storico", "luoghi insoliti"),
+    "Россия": (
+        "ru",
+        "история",
+        "историческое здание",
+        "необычные места",
+    ),
+    "Russia": (
+        "ru",
+        "история",
+        "историческое здание",
+        "необычные места",
+    ),
+}
+
+# Wikipedia media-list titles that are icons/decorations rather than photos
+_WIKI_SKIP_RE = re.compile("commons-logo|edit-icon|wikimedia|stub|ambox|flag")
+
+# Quote characters dropped from search keywords (one translate pass)
+_STRIP_QUOTES = str.maketrans("", "", "\"'")
+
+# Fallback queries are fired this many at a time, first accepted hit wins
+_FALLBACK_BATCH_SIZE = 4
+# Wall-clock bound per Claude API attempt (the SDK's own timeout is per HTTP
+# try and is retried, so a stalled request could otherwise hang for minutes)
+_CLAUDE_REQUEST_TIMEOUT_SECONDS = 60
+
+# City names recognised in search keywords, checked in order
+_KNOWN_CITY_NAMES = (
+    "Paris",
+    "Москва",
+    "Moscow",
+    "London",
+    "New York",
+    "Санкт-Петербург",
+    "Saint Petersburg",
+    "St Petersburg",
+)
+_STREET_INDICATORS = ("rue", "avenue", "boulevard", "street", "road", "place", "square")
+
+
+def _iter_street_patterns(search_keywords: str) -> Iterator[str]:
+    """Yield raw street-based fallback queries, possibly empty or repeated."""
+    if "," not in search_keywords:
+        return
+    parts = [p.strip() for p in search_keywords.split(",")]
+    if len(parts) < 2:
+        return
+    for i, part in enumerate(parts):
+        part_lower = part.lower()
+        if any(indicator in part_lower for indicator in _STREET_INDICATORS):
+            if i < len(parts) - 1:
+                yield f"{part}, {parts[-1]}"
+            if re.search(r"\d+", part):
+                yield part
+            return
+
+
+@functools.lru_cache(maxsize=1024)
+def _fallback_search_patterns(search_keywords: str) -> tuple[str, ...]:
+    """Build the fallback Nominatim queries for keywords, cached per keywords.
+
+    Returns stripped, de-duplicated queries in priority order, excluding the
+    original keywords themselves.
+    """
+    # Strip, drop empties and de-duplicate in one pass (dict as ordered set)
+    patterns = map(str.strip, _iter_street_patterns(search_keywords))
+    return tuple(dict.fromkeys(p for p in patterns if p and p != search_keywords))
+
+
+# Place/fact lines of a fact response (at the start of a line), and the lines
+# after the fact that belong to the sources list rather than the fact itself
+_PLACE_LINE_RE = re.compile(r"^(?:Локация|Location):(.*)$", re.MULTILINE)
+_FACT_LINE_RE = re.compile(r"^(?:Интересный факт|Interesting fact):(.*)$", re.MULTILINE)
+_FACT_STOP_PREFIXES = ("Источники", "Sources", "-")
+
+
+def _parse_place_and_fact(fact_response: str) -> tuple[str, str]:
+    """Split a fact response into the place and fact stored in the history."""
+    fact_match = _FACT_LINE_RE.search(fact_response)
+    head = fact_response[: fact_match.start()] if fact_match else fact_response
+    places = _PLACE_LINE_RE.findall(head)
+    place = places[-1].strip() if places else "рядом с вами"
+    if not fact_match:
+        return place, fact_response
+
+    tail = fact_response[fact_match.end() :].split("\n")
+    fact = " ".join(
+        [
+            fact_match.group(1).strip(),
+            *(
+                line.strip()
+                for line in tail
+                if line.strip() and not line.startswith(_FACT_STOP_PREFIXES)
+            ),
+        ]
+    )
+    return place, fact
+
 
 class StaticLocationHistory:
     """Simple in-memory cache for static location facts to avoid repetition."""
@@ -25,9 +181,15 @@ class StaticLocationHistory:
             max_entries: Maximum number of entries to keep in cache
             ttl_hours: Time to live for entries in hours
         """
-        self._cache = {}  # {search_keywords: {"facts": [facts], "timestamp": time}}
+        # {search_keywords: {"facts": [facts], "timestamp": monotonic}}, in LRU order
+        self._cache: OrderedDict[str, dict] = OrderedDict()
         self._max_entries = max_entries
         self._ttl_seconds = ttl_hours * 3600
+        # Expired entries are swept at most once per interval
+        self._cleanup_interval = 60.0
+        self._last_cleanup = float("-inf")
+        # Min-heap of (expiry_ts, search_keywords); refreshed keys leave stale items
+        self._expiry_heap: list[tuple[float, str]] = []
 
     def get_previous_facts(self, search_keywords: str) -> list[str]:
         """Get previous facts for a location.
@@ -41,8 +203,11 @@ class StaticLocationHistory:
         self._cleanup_expired()
 
         entry = self._cache.get(search_keywords)
-        if entry and (time.time() - entry["timestamp"]) < self._ttl_seconds:
-            return entry["facts"][-5:]  # Return last 5 facts like live location
+        if entry and (time.monotonic() - entry["timestamp"]) < self._ttl_seconds:
+            self._cache.move_to_end(search_keywords)
+            facts = entry["facts"]
+            # Return last 5 facts like live location
+            return list(itertools.islice(facts, max(len(facts) - 5, 0), None))
         return []
 
     def add_fact(self, search_keywords: str, place: str, fact: str):
@@ -55,43 +220,58 @@ class StaticLocationHistory:
         """
         self._cleanup_expired()
 
+        # The key is held by both the cache and the expiry heap; share one copy
+        search_keywords = sys.intern(search_keywords)
+
         if search_keywords not in self._cache:
-            self._cache[search_keywords] = {"facts": [], "timestamp": time.time()}
+            if len(self._cache) >= self._max_entries:
+                # Make room from expired entries before evicting live ones
+                self._cleanup_expired(force=True)
+            # Keep only last 10 facts per location to prevent memory bloat
+            self._cache[search_keywords] = {
+                "facts": deque(maxlen=10),
+                "timestamp": time.monotonic(),
+            }
 
         # Add fact in same format as live location
         fact_entry = f"{place}: {fact}"
+        now = time.monotonic()
         self._cache[search_keywords]["facts"].append(fact_entry)
-        self._cache[search_keywords]["timestamp"] = time.time()
-
-        # Keep only last 10 facts per location to prevent memory bloat
-        if len(self._cache[search_keywords]["facts"]) > 10:
-            self._cache[search_keywords]["facts"] = self._cache[search_keywords][
-                "facts"
-            ][-10:]
+        self._cache[search_keywords]["timestamp"] = now
+        heapq.heappush(self._expiry_heap, (now + self._ttl_seconds, search_keywords))
+
+        # Mark as most recently used and evict least recently used locations
+        self._cache.move_to_end(search_keywords)
+        while len(self._cache) > self._max_entries:
+            self._cache.popitem(last=False)
+
+        # Refreshed and evicted keys leave stale heap items behind; rebuild the
+        # heap from live entries once they clearly outnumber the cache
+        if len(self._expiry_heap) > 2 * len(self._cache) + 64:
+            self._expiry_heap = [
+                (entry["timestamp"] + self._ttl_seconds, key)
+                for key, entry in self._cache.items()
+            ]
+            heapq.heapify(self._expiry_heap)
 
         logger.debug(f"Added fact to static location history: {place}")
 
-    def _cleanup_expired(self):
-        """Remove expired entries and limit cache size."""
-        current_time = time.time()
+    def _cleanup_expired(self, force: bool = False):
+        """Remove expired entries (size is bounded by LRU eviction in add_fact).
 
-        # Remove expired entries
-        expired_keys = [
-            key
-            for key, entry in self._cache.items()
-            if (current_time - entry["timestamp"]) >= self._ttl_seconds
-        ]
-        for key in expired_keys:
-            del self._cache[key]
-
-        # Limit cache size
-        if len(self._cache) > self._max_entries:
-            # Remove oldest entries
-            sorted_items = sorted(self._cache.items(), key=lambda x: x[1]["timestamp"])
-            keys_to_remove = [
-                item[0] for item in sorted_items[: len(self._cache) - self._max_entries]
-            ]
-            for key in keys_to_remove:
+        Args:
+            force: Sweep even if the last sweep was less than an interval ago
+        """
+        current_time = time.monotonic()
+        if not force and current_time - self._last_cleanup < self._cleanup_interval:
+            return
+        self._last_cleanup = current_time
+
+        # Pop due expiries; skip keys refreshed or evicted since they were pushed
+        while self._expiry_heap and self._expiry_heap[0][0] <= current_time:
+            _, key = heapq.heappop(self._expiry_heap)
+            entry = self._cache.get(key)
+            if entry and (current_time - entry["timestamp"]) >= self._ttl_seconds:
                 del self._cache[key]
 
     def get_cache_stats(self) -> dict:
@@ -107,105 +287,9 @@ class StaticLocationHistory:
         }
 
 
-class ClaudeClient:
-    """Client for interacting with Anthropic Claude API to generate location facts."""
-
-    # Model constants
-    MODEL_OPUS = "claude-opus-4-5-20251101"
-    MODEL_SONNET = "claude-sonnet-4-5-20250929"
-    MODEL_HAIKU = "claude-haiku-4-5-20251001"
-
-    def __init__(self, api_key: str | None = None):
-        """Initialize Claude client.
-
-        Args:
-            api_key: Anthropic API key. If None, will use ANTHROPIC_API_KEY env var.
-        """
-        self.client = AsyncAnthropic(api_key=api_key or os.getenv("ANTHROPIC_API_KEY"))
-        self.web_search = get_web_search_service()
-        self.static_history = StaticLocationHistory()
-        # Lightweight caches for Wikimedia pipeline
-        self._qid_cache: dict[str, tuple[str, float]] = {}
-        self._p18_cache: dict[str, tuple[str, float]] = {}
-        self._fileinfo_cache: dict[str, tuple[dict, float]] = {}
-        self._image_cache_ttl_seconds = 24 * 3600
-        # Semaphore to limit concurrent API requests
-        self._api_semaphore = asyncio.Semaphore(3)
-
-    def _parse_int_env(self, key: str) -> int | None:
-        value = os.getenv(key)
-        if value is None or value == "":
-            return None
-        try:
-            return int(value)
-        except ValueError:
-            logger.warning(f"Invalid int for {key}: {value}")
-            return None
-
-    def _get_thinking_budget(self, reasoning_level: str | None) -> int | None:
-        if not reasoning_level:
-            return None
-
-        level_key = reasoning_level.upper()
-        env_keys = [
-            f"CLAUDE_THINKING_BUDGET_TOKENS_{level_key}",
-            f"ANTHROPIC_THINKING_BUDGET_TOKENS_{level_key}",
-            "CLAUDE_THINKING_BUDGET_TOKENS",
-            "ANTHROPIC_THINKING_BUDGET_TOKENS",
-        ]
-        for key in env_keys:
-            value = self._parse_int_env(key)
-            if value is not None:
-                return value
-        return None
-
-    def _build_thinking_config(
-        self, reasoning_level: str | None, force_reasoning_none: bool
-    ) -> dict | None:
-        if force_reasoning_none or not reasoning_level or reasoning_level == "none":
-            return {"type": "disabled"}
-
-        default_budgets = {
-            "low": 1024,
-            "medium": 2048,
-            "high": 4096,
-        }
-        budget = self._get_thinking_budget(reasoning_level)
-        if budget is None:
-            budget = default_budgets.get(reasoning_level, 1024)
-
-        if budget < 1024:
-            logger.warning(
-                f"Thinking budget too low ({budget}); clamping to 1024 minimum"
-            )
-            budget = 1024
-
-        return {"type": "enabled", "budget_tokens": budget}
-
-    def _is_thinking_budget_error(self, error: Exception) -> bool:
-        message = str(error).lower()
-        return "thinking.enabled.budget_tokens" in message or (
-            "thinking" in message and "budget" in message and "tokens" in message
-        )
-
-    async def _create_message_with_thinking_fallback(self, request_kwargs: dict):
-        try:
-            return await self.client.messages.create(**request_kwargs)
-        except Exception as e:
-            if self._is_thinking_budget_error(e):
-                current = request_kwargs.get("thinking", {})
-                if current.get("type") != "disabled":
-                    logger.warning(
-                        "Thinking budget error from Claude API; retrying with thinking disabled"
-                    )
-                    retry_kwargs = dict(request_kwargs)
-                    retry_kwargs["thinking"] = {"type": "disabled"}
-                    return await self.client.messages.create(**retry_kwargs)
-            raise
-
-    def _get_russian_style_instructions(self) -> str:
-        """Get detailed Russian language style instructions for Atlas Obscura quality."""
-        return """
+# Prompt text is static apart from a few slots, so the templates are assembled
+# once at import time and each request only pays for a single ``str.format``.
+_RU_STYLE_INSTRUCTIONS = """
 СПЕЦИАЛЬНЫЕ ТРЕБОВАНИЯ ДЛЯ РУССКОГО ЯЗЫКА (стиль Atlas Obscura):
 
 СТИЛЬ ИЗЛОЖЕНИЯ:
@@ -243,14 +327,7 @@ class ClaudeClient:
 - Имена собственные пишите в принятой русской транскрипции, если она существует (например, «Жорж-Эжен Осман», «Пьер Кюри»)
 - Не переключайтесь на французский/английский внутри русского текста без необходимости; держите единый русский язык всего ответа"""
 
-    def _build_system_prompt_russian(
-        self, is_live_location: bool, web_search_results: str = ""
-    ) -> str:
-        """Build system prompt for Russian language - separate for quality."""
-
-        web_context = ""
-        if web_search_results:
-            web_context = f"""
+_RU_WEB_CONTEXT_TEMPLATE = """
 
 РЕЗУЛЬТАТЫ ПОИСКА В ИНТЕРНЕТЕ:
 {web_search_results}
@@ -262,9 +339,9 @@ class ClaudeClient:
 - Каждый URL в "Источниках" ДОЛЖЕН быть скопирован ДОСЛОВНО из "РЕЗУЛЬТАТЫ ПОИСКА"
 - Если ни один URL из поиска не подходит для твоего факта - лучше верни [[NO_POI_FOUND]]
 - Проверь: каждая ссылка в твоём ответе есть в списке выше? Если нет - это ОШИБКА."""
-        else:
-            # Fallback mode: web search unavailable (rate limited or failed)
-            web_context = """
+
+# Fallback mode: web search unavailable (rate limited or failed)
+_RU_NO_WEB_CONTEXT = """
 
 **РЕЖИМ БЕЗ ВЕБ-ПОИСКА**: Веб-поиск временно недоступен. Используй свои знания об этом месте.
 - НЕ возвращай [[NO_POI_FOUND]] только из-за отсутствия результатов поиска
@@ -273,7 +350,8 @@ class ClaudeClient:
 - Если не знаешь проверенных источников - НЕ УКАЗЫВАЙ раздел "Источники"
 - Фокусируйся на общеизвестных исторических фактах, которые легко проверить"""
 
-        base_rules = f"""Ты — автор фактов для Atlas Obscura на русском языке. Твоя миссия: найти самую удивительную, конкретную, проверенную деталь о РЕАЛЬНОМ МЕСТЕ рядом с указанными координатами.
+_RU_SYSTEM_RULES_TEMPLATE = (
+    """Ты — автор фактов для Atlas Obscura на русском языке. Твоя миссия: найти самую удивительную, конкретную, проверенную деталь о РЕАЛЬНОМ МЕСТЕ рядом с указанными координатами.
 
 ТЫ — АВТОР ФАКТОВ, А НЕ ПОИСКОВЫЙ АССИСТЕНТ. Никогда не извиняйся, не проси разрешения, не объясняй трудности. Либо напиши полноценный факт, либо верни [[NO_POI_FOUND]].
 {web_context}
@@ -339,12 +417,13 @@ class ClaudeClient:
 
 ЕСЛИ НЕ МОЖЕШЬ НАЙТИ ФАКТ: Верни ТОЛЬКО "[[NO_POI_FOUND]]" — ничего больше.
 
-{self._get_russian_style_instructions()}"""
+"""
+    + _RU_STYLE_INSTRUCTIONS
+)
 
-        if is_live_location:
-            return (
-                base_rules
-                + """
+_RU_SYSTEM_LIVE_TEMPLATE = (
+    _RU_SYSTEM_RULES_TEMPLATE
+    + """
 
 ФОРМАТ ОТВЕТА (живая локация, 100-120 слов):
 <answer>
@@ -358,11 +437,11 @@ Interesting fact: [Удивительное начало → История с 
 </answer>
 
 ПРОВЕРЬ ПЕРЕД ОТПРАВКОЙ: Каждый URL в Источниках есть в РЕЗУЛЬТАТАХ ПОИСКА выше? Если хоть один URL выдуман - это КРИТИЧЕСКАЯ ОШИБКА!"""
-            )
-        else:
-            return (
-                base_rules
-                + """
+)
+
+_RU_SYSTEM_STATIC_TEMPLATE = (
+    _RU_SYSTEM_RULES_TEMPLATE
+    + """
 
 ФОРМАТ ОТВЕТА (статичная локация, 60-80 слов):
 <answer>
@@ -376,19 +455,9 @@ Interesting fact: [Удивительная деталь → Краткий ко
 </answer>
 
 ПРОВЕРЬ ПЕРЕД ОТПРАВКОЙ: Каждый URL в Источниках есть в РЕЗУЛЬТАТАХ ПОИСКА выше? Если хоть один URL выдуман - это КРИТИЧЕСКАЯ ОШИБКА!"""
-            )
+)
 
-    def _build_system_prompt_english(
-        self,
-        user_language: str,
-        is_live_location: bool,
-        web_search_results: str = "",
-    ) -> str:
-        """Build system prompt for non-Russian languages."""
-
-        web_context = ""
-        if web_search_results:
-            web_context = f"""
+_EN_WEB_CONTEXT_TEMPLATE = """
 
 WEB SEARCH RESULTS:
 {web_search_results}
@@ -400,9 +469,9 @@ WEB SEARCH RESULTS:
 - Each URL in "Sources" MUST be copied VERBATIM from "WEB SEARCH RESULTS"
 - If no URL from search results fits your fact - better return [[NO_POI_FOUND]]
 - Verify: is each link in your answer present in the list above? If not - this is an ERROR."""
-        else:
-            # Fallback mode: web search unavailable (rate limited or failed)
-            web_context = """
+
+# Fallback mode: web search unavailable (rate limited or failed)
+_EN_NO_WEB_CONTEXT = """
 
 **NO WEB SEARCH MODE**: Web search temporarily unavailable. Use your knowledge of this place.
 - DO NOT return [[NO_POI_FOUND]] just because search results are missing
@@ -411,7 +480,7 @@ WEB SEARCH RESULTS:
 - If you don't know verified sources - DO NOT include "Sources" section
 - Focus on well-known historical facts that are easy to verify"""
 
-        base_rules = f"""You are an Atlas Obscura fact writer. Your mission: find the most surprising, specific, verified detail about a REAL PLACE near the given coordinates.
+_EN_SYSTEM_RULES_TEMPLATE = """You are an Atlas Obscura fact writer. Your mission: find the most surprising, specific, verified detail about a REAL PLACE near the given coordinates.
 
 YOU ARE A FACT WRITER, NOT A SEARCH ASSISTANT. Never apologize, never ask permission, never explain difficulties. Either write a complete fact or return [[NO_POI_FOUND]].
 {web_context}
@@ -479,10 +548,9 @@ FORBIDDEN PHRASES (NEVER USE):
 
 IF YOU CANNOT FIND A FACT: Return ONLY "[[NO_POI_FOUND]]" - nothing else. Do NOT apologize or explain."""
 
-        if is_live_location:
-            return (
-                base_rules
-                + f"""
+_EN_SYSTEM_LIVE_TEMPLATE = (
+    _EN_SYSTEM_RULES_TEMPLATE
+    + """
 
 OUTPUT FORMAT (live location, 100-120 words):
 <answer>
@@ -498,11 +566,11 @@ Sources:
 VERIFY BEFORE SENDING: Is each URL in Sources present in WEB SEARCH RESULTS above? If even one URL is invented - this is a CRITICAL ERROR!
 
 Write in {user_language}."""
-            )
-        else:
-            return (
-                base_rules
-                + f"""
+)
+
+_EN_SYSTEM_STATIC_TEMPLATE = (
+    _EN_SYSTEM_RULES_TEMPLATE
+    + """
 
 OUTPUT FORMAT (static location, 60-80 words):
 <answer>
@@ -518,35 +586,9 @@ Sources:
 VERIFY BEFORE SENDING: Is each URL in Sources present in WEB SEARCH RESULTS above? If even one URL is invented - this is a CRITICAL ERROR!
 
 Write in {user_language}."""
-            )
-
-    def _build_user_prompt(
-        self,
-        lat: float,
-        lon: float,
-        is_live_location: bool,
-        previous_facts: list | None,
-        user_language: str,
-    ) -> str:
-        """Build user prompt with coordinates and previous facts."""
+)
 
-        prev_block = ""
-        if previous_facts:
-            place_names = []
-            fact_entries = []
-            for entry in previous_facts[-5:]:
-                if ": " in entry:
-                    place_name = entry.split(": ", 1)[0].strip()
-                    if place_name:
-                        place_names.append(place_name)
-                fact_entries.append(f"- {entry}")
-
-            prev_text = "\n".join(fact_entries)
-
-            if place_names:
-                places_list = ", ".join([f'"{p}"' for p in place_names])
-                if user_language == "ru":
-                    prev_block = f"""
+_RU_PREVIOUS_FACTS_TEMPLATE = """
 
 УЖЕ УПОМЯНУТЫЕ ФАКТЫ:
 {prev_text}
@@ -555,8 +597,8 @@ Write in {user_language}."""
 {places_list}
 
 КРИТИЧНО: Выбери ПОЛНОСТЬЮ ДРУГОЕ место. НЕ упоминай те же здания/памятники/локации под другим названием."""
-                else:
-                    prev_block = f"""
+
+_EN_PREVIOUS_FACTS_TEMPLATE = """
 
 PREVIOUS FACTS ALREADY MENTIONED:
 {prev_text}
@@ -566,9 +608,7 @@ PREVIOUS FACTS ALREADY MENTIONED:
 
 CRITICAL: Choose a COMPLETELY DIFFERENT place. Do NOT mention the same building/monument/location with a different name."""
 
-        if is_live_location:
-            if user_language == "ru":
-                return f"""Проанализируй координаты: {lat}, {lon}
+_RU_LIVE_USER_TEMPLATE = """Проанализируй координаты: {lat}, {lon}
 
 КРИТИЧНО: Это ТЕКУЩЕЕ местоположение пользователя. Упоминай только места, которые реально находятся рядом (≤1200м) с этими точными координатами. НЕ притягивай знаменитые достопримечательности из других частей города, если они не находятся прямо здесь.{prev_block}
 
@@ -592,8 +632,8 @@ Interesting fact: [100-120 слов. Удивительное начало → 
 - [Краткое название источника] — [URL]
 (Добавь ещё 1-2 источника если уместно)
 </answer>"""
-            else:
-                return f"""Analyze coordinates: {lat}, {lon}
+
+_EN_LIVE_USER_TEMPLATE = """Analyze coordinates: {lat}, {lon}
 
 CRITICAL: This is the user's CURRENT location. Mention only places actually at or very near (≤1200m) these exact coordinates. Do NOT pull famous landmarks from other parts of the city unless they are genuinely at this exact spot.{prev_block}
 
@@ -617,9 +657,8 @@ Sources:
 - [Concise source title] — [URL]
 (Add 1-2 more sources if relevant)
 </answer>"""
-        else:
-            if user_language == "ru":
-                return f"""Координаты для анализа:
+
+_RU_STATIC_USER_TEMPLATE = """Координаты для анализа:
 <coordinates>
 Широта: {lat}
 Долгота: {lon}
@@ -648,8 +687,8 @@ Interesting fact: [60-80 слов. Удивительная деталь → К
 - [Краткое название источника] — [URL]
 (Добавь ещё 1-2 источника если уместно)
 </answer>"""
-            else:
-                return f"""Coordinates to analyze:
+
+_EN_STATIC_USER_TEMPLATE = """Coordinates to analyze:
 <coordinates>
 Latitude: {lat}
 Longitude: {lon}
@@ -679,6 +718,215 @@ Sources:
 (Add 1-2 more sources if relevant)
 </answer>"""
 
+
+class ClaudeClient(SharedLookupsMixin):
+    """Client for interacting with Anthropic Claude API to generate location facts."""
+
+    # Model constants
+    MODEL_OPUS = "claude-opus-4-5-20251101"
+    MODEL_SONNET = "claude-sonnet-4-5-20250929"
+    MODEL_HAIKU = "claude-haiku-4-5-20251001"
+
+    def __init__(self, api_key: str | None = None):
+        """Initialize Claude client.
+
+        Args:
+            api_key: Anthropic API key. If None, will use ANTHROPIC_API_KEY env var.
+        """
+        super().__init__()
+        self.client = AsyncAnthropic(api_key=api_key or os.getenv("ANTHROPIC_API_KEY"))
+        self.web_search = get_web_search_service()
+        self.static_history = StaticLocationHistory()
+        # Lightweight caches for Wikimedia pipeline
+        self._qid_cache: dict[str, tuple[str, float]] = {}
+        self._p18_cache: dict[str, tuple[str, float]] = {}
+        self._fileinfo_cache: dict[str, tuple[dict, float]] = {}
+        # (lang, search term, max_images) -> (image urls, ts), in LRU order
+        self._wiki_search_cache: OrderedDict[
+            tuple[str, str, int], tuple[list[str], float]
+        ] = OrderedDict()
+        self._image_cache_ttl_seconds = 24 * 3600
+        # Semaphore to limit concurrent API requests
+        self._api_semaphore = asyncio.Semaphore(3)
+        # Shared HTTP session for geocoding and Wikimedia, created lazily
+        self._http_session: aiohttp.ClientSession | None = None
+
+    async def _get_http_session(self) -> aiohttp.ClientSession:
+        """Return the shared aiohttp session, creating it on first use."""
+        if self._http_session is None or self._http_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=100, ttl_dns_cache=300, keepalive_timeout=60
+            )
+            self._http_session = aiohttp.ClientSession(connector=connector)
+        return self._http_session
+
+    async def close(self):
+        """Close the shared HTTP session."""
+        if self._http_session and not self._http_session.closed:
+            await self._http_session.close()
+        self._http_session = None
+
+    def _parse_int_env(self, key: str) -> int | None:
+        value = os.getenv(key)
+        if value is None or value == "":
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            logger.warning(f"Invalid int for {key}: {value}")
+            return None
+
+    def _get_thinking_budget(self, reasoning_level: str | None) -> int | None:
+        if not reasoning_level:
+            return None
+
+        level_key = reasoning_level.upper()
+        env_keys = [
+            f"CLAUDE_THINKING_BUDGET_TOKENS_{level_key}",
+            f"ANTHROPIC_THINKING_BUDGET_TOKENS_{level_key}",
+            "CLAUDE_THINKING_BUDGET_TOKENS",
+            "ANTHROPIC_THINKING_BUDGET_TOKENS",
+        ]
+        for key in env_keys:
+            value = self._parse_int_env(key)
+            if value is not None:
+                return value
+        return None
+
+    def _build_thinking_config(
+        self, reasoning_level: str | None, force_reasoning_none: bool
+    ) -> dict | None:
+        if force_reasoning_none or not reasoning_level or reasoning_level == "none":
+            return {"type": "disabled"}
+
+        default_budgets = {
+            "low": 1024,
+            "medium": 2048,
+            "high": 4096,
+        }
+        budget = self._get_thinking_budget(reasoning_level)
+        if budget is None:
+            budget = default_budgets.get(reasoning_level, 1024)
+
+        if budget < 1024:
+            logger.warning(
+                f"Thinking budget too low ({budget}); clamping to 1024 minimum"
+            )
+            budget = 1024
+
+        return {"type": "enabled", "budget_tokens": budget}
+
+    def _is_thinking_budget_error(self, error: Exception) -> bool:
+        message = str(error).lower()
+        return "thinking.enabled.budget_tokens" in message or (
+            "thinking" in message and "budget" in message and "tokens" in message
+        )
+
+    async def _create_message_with_thinking_fallback(self, request_kwargs: dict):
+        try:
+            async with asyncio.timeout(_CLAUDE_REQUEST_TIMEOUT_SECONDS):
+                return await self.client.messages.create(**request_kwargs)
+        except Exception as e:
+            # A stalled thinking trace is retried the same way as a budget error
+            timed_out = isinstance(e, TimeoutError)
+            if timed_out or self._is_thinking_budget_error(e):
+                current = request_kwargs.get("thinking", {})
+                if current.get("type") != "disabled":
+                    reason = "timed out" if timed_out else "thinking budget error"
+                    logger.warning(
+                        f"Claude API {reason}; retrying with thinking disabled"
+                    )
+                    retry_kwargs = dict(request_kwargs)
+                    retry_kwargs["thinking"] = {"type": "disabled"}
+                    async with asyncio.timeout(_CLAUDE_REQUEST_TIMEOUT_SECONDS):
+                        return await self.client.messages.create(**retry_kwargs)
+            raise
+
+    def _get_russian_style_instructions(self) -> str:
+        """Get detailed Russian language style instructions for Atlas Obscura quality."""
+        return _RU_STYLE_INSTRUCTIONS
+
+    def _build_system_prompt_russian(
+        self, is_live_location: bool, web_search_results: str = ""
+    ) -> str:
+        """Build system prompt for Russian language - separate for quality."""
+
+        if web_search_results:
+            web_context = _RU_WEB_CONTEXT_TEMPLATE.format(
+                web_search_results=web_search_results
+            )
+        else:
+            web_context = _RU_NO_WEB_CONTEXT
+
+        template = (
+            _RU_SYSTEM_LIVE_TEMPLATE if is_live_location else _RU_SYSTEM_STATIC_TEMPLATE
+        )
+        return template.format(web_context=web_context)
+
+    def _build_system_prompt_english(
+        self,
+        user_language: str,
+        is_live_location: bool,
+        web_search_results: str = "",
+    ) -> str:
+        """Build system prompt for non-Russian languages."""
+
+        if web_search_results:
+            web_context = _EN_WEB_CONTEXT_TEMPLATE.format(
+                web_search_results=web_search_results
+            )
+        else:
+            web_context = _EN_NO_WEB_CONTEXT
+
+        template = (
+            _EN_SYSTEM_LIVE_TEMPLATE if is_live_location else _EN_SYSTEM_STATIC_TEMPLATE
+        )
+        return template.format(web_context=web_context, user_language=user_language)
+
+    def _build_user_prompt(
+        self,
+        lat: float,
+        lon: float,
+        is_live_location: bool,
+        previous_facts: list | None,
+        user_language: str,
+    ) -> str:
+        """Build user prompt with coordinates and previous facts."""
+
+        prev_block = ""
+        if previous_facts:
+            recent_facts = previous_facts[-5:]
+            place_names = []
+            for entry in recent_facts:
+                if ": " in entry:
+                    place_name = entry.split(": ", 1)[0].strip()
+                    if place_name:
+                        place_names.append(place_name)
+
+            prev_text = "\n".join(f"- {entry}" for entry in recent_facts)
+
+            if place_names:
+                places_list = ", ".join(f'"{p}"' for p in place_names)
+                if user_language == "ru":
+                    prev_template = _RU_PREVIOUS_FACTS_TEMPLATE
+                else:
+                    prev_template = _EN_PREVIOUS_FACTS_TEMPLATE
+                prev_block = prev_template.format(
+                    prev_text=prev_text, places_list=places_list
+                )
+
+        if is_live_location:
+            if user_language == "ru":
+                template = _RU_LIVE_USER_TEMPLATE
+            else:
+                template = _EN_LIVE_USER_TEMPLATE
+        else:
+            if user_language == "ru":
+                template = _RU_STATIC_USER_TEMPLATE
+            else:
+                template = _EN_STATIC_USER_TEMPLATE
+        return template.format(lat=lat, lon=lon, prev_block=prev_block)
+
     async def get_nearby_fact(
         self,
         lat: float,
@@ -690,6 +938,9 @@ Sources:
     ) -> str:
         """Get an interesting fact about a location.
 
+        Identical concurrent requests (same rounded coordinates, mode, user and
+        history) share one API call instead of each starting their own.
+
         Args:
             lat: Latitude coordinate
             lon: Longitude coordinate
@@ -704,6 +955,36 @@ Sources:
         Raises:
             Exception: If Claude API call fails
         """
+        key = (
+            round(lat, 4),
+            round(lon, 4),
+            is_live_location,
+            user_id,
+            force_reasoning_none,
+            tuple(previous_facts or ()),
+        )
+        return await self._coalesce_fact_request(
+            key,
+            lambda: self._generate_nearby_fact(
+                lat,
+                lon,
+                is_live_location,
+                previous_facts,
+                user_id,
+                force_reasoning_none,
+            ),
+        )
+
+    async def _generate_nearby_fact(
+        self,
+        lat: float,
+        lon: float,
+        is_live_location: bool,
+        previous_facts: list | None,
+        user_id: int | None,
+        force_reasoning_none: bool,
+    ) -> str:
+        """Generate a fact for get_nearby_fact (see there for the arguments)."""
         try:
             # Get user preferences
             user_language = "ru"  # Default to Russian
@@ -787,60 +1068,14 @@ Sources:
                             location_name = f"{road}, {city}"
 
                 # Determine local language based on country
-                local_queries_map = {
-                    "France": (
-                        "fr",
-                        "histoire",
-                        "bâtiment historique",
-                        "lieux insolites",
-                    ),
-                    "Deutschland": (
-                        "de",
-                        "Geschichte",
-                        "historisches Gebäude",
-                        "ungewöhnliche Orte",
-                    ),
-                    "Germany": (
-                        "de",
-                        "Geschichte",
-                        "historisches Gebäude",
-                        "ungewöhnliche Orte",
-                    ),
-                    "España": (
-                        "es",
-                        "historia",
-                        "edificio histórico",
-                        "lugares inusuales",
-                    ),
-                    "Spain": (
-                        "es",
-                        "historia",
-                        "edificio histórico",
-                        "lugares inusuales",
-                    ),
-                    "Italia": ("it", "storia", "edificio storico", "luoghi insoliti"),
-                    "Italy": ("it", "storia", "edificio storico", "luoghi insoliti"),
-                    "Россия": (
-                        "ru",
-                        "история",
-                        "историческое здание",
-                        "необычные места",
-                    ),
-                    "Russia": (
-                        "ru",
-                        "история",
-                        "историческое здание",
-                        "необычные места",
-                    ),
-                }
-
                 local_terms = None
                 if country:
-                    local_terms = local_queries_map.get(country)
+                    local_terms = _LOCAL_SEARCH_TERMS.get(country)
                     if not local_terms:
                         # Try partial match
-                        for country_name, terms in local_queries_map.items():
-                            if country_name.lower() in country.lower():
+                        country_lower = country.lower()
+                        for country_name, terms in _LOCAL_SEARCH_TERMS.items():
+                            if country_name.lower() in country_lower:
                                 local_terms = terms
                                 break
 
@@ -1052,7 +1287,7 @@ Sources:
         # Use Nominatim directly - more reliable than asking AI
         return await self.get_coordinates_from_nominatim(place_name)
 
-    async def get_coordinates_from_nominatim(
+    async def _fetch_nominatim_coordinates(
         self, place_name: str, user_lat: float = None, user_lon: float = None
     ) -> tuple[float, float] | None:
         """Get coordinates using OpenStreetMap Nominatim service.
@@ -1140,77 +1375,92 @@ Sources:
 
         url = "https://nominatim.openstreetmap.org/search"
         headers = {"User-Agent": "BotVoyage/2.0 (Educational Project)"}
+        place_lower = place_name.lower()
+        expects_paris = "paris" in place_lower
+        expects_moscow = "москва" in place_lower
 
-        async with aiohttp.ClientSession() as session:
-            for i, params in enumerate(search_strategies):
-                try:
-                    logger.debug(
-                        f"Trying Nominatim strategy {i+1}/{len(search_strategies)}"
-                    )
+        session = await self._get_http_session()
+        for i, params in enumerate(search_strategies):
+            try:
+                logger.debug(
+                    f"Trying Nominatim strategy {i+1}/{len(search_strategies)}"
+                )
 
-                    async with session.get(
-                        url, params=params, headers=headers, timeout=5
-                    ) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            if data:
-                                best_result = None
-                                best_score = -1
-
-                                for result in data:
-                                    score = 0
-                                    result_type = result.get("type", "")
-
-                                    if result_type in [
-                                        "building",
-                                        "house",
-                                        "amenity",
-                                        "historic",
-                                    ]:
-                                        score += 3
-                                    elif result_type in ["street", "road"]:
-                                        score += 2
-                                    elif result_type in ["suburb", "neighbourhood"]:
-                                        score += 1
-
-                                    display_name = result.get(
-                                        "display_name", ""
-                                    ).lower()
-                                    if (
-                                        "paris" in place_name.lower()
-                                        and "paris" in display_name
-                                    ):
-                                        score += 5
-                                    elif (
-                                        "москва" in place_name.lower()
-                                        and "москва" in display_name
-                                    ):
-                                        score += 5
-
-                                    importance = result.get("importance", 0)
-                                    score += importance
-
-                                    if score > best_score:
-                                        best_score = score
-                                        best_result = result
-
-                                if best_result:
-                                    lat = float(best_result["lat"])
-                                    lon = float(best_result["lon"])
-
-                                    if -90 <= lat <= 90 and -180 <= lon <= 180:
-                                        logger.info(
-                                            f"Found Nominatim coordinates for '{place_name}': {lat}, {lon}"
-                                        )
-                                        return lat, lon
+                async with session.get(
+                    url, params=params, headers=headers, timeout=5
+                ) as response:
+                    if response.status == 200:
+                        data = await response.json()
+                        if data:
+                            best_result = None
+                            best_score = -1
+
+                            for result in data:
+                                score = NOMINATIM_TYPE_SCORES.get(
+                                    result.get("type", ""), 0
+                                )
 
-                except Exception as e:
-                    logger.debug(f"Strategy {i+1} failed: {e}")
-                    continue
+                                display_name = result.get("display_name", "").lower()
+                                if (expects_paris and "paris" in display_name) or (
+                                    expects_moscow and "москва" in display_name
+                                ):
+                                    score += 5
+
+                                importance = result.get("importance", 0)
+                                score += importance
+
+                                if score > best_score:
+                                    best_score = score
+                                    best_result = result
+
+                            if best_result:
+                                lat = float(best_result["lat"])
+                                lon = float(best_result["lon"])
+
+                                if -90 <= lat <= 90 and -180 <= lon <= 180:
+                                    logger.info(
+                                        f"Found Nominatim coordinates for '{place_name}': {lat}, {lon}"
+                                    )
+                                    return lat, lon
+
+            except Exception as e:
+                logger.debug(f"Strategy {i+1} failed: {e}")
+                continue
 
         logger.debug(f"No coordinates found in Nominatim for: {place_name}")
         return None
 
+    async def _try_fallback_pattern(
+        self, pattern: str, user_lat: float | None, user_lon: float | None
+    ) -> tuple[float, float] | None:
+        """Geocode one fallback pattern, rejecting hits far from the user.
+
+        Args:
+            pattern: Fallback search query
+            user_lat: User's current latitude for validation
+            user_lon: User's current longitude for validation
+
+        Returns:
+            Tuple of (latitude, longitude) if accepted, None otherwise
+        """
+        logger.info(f"Trying fallback search: {pattern}")
+        coords = await self.get_coordinates_from_nominatim(pattern, user_lat, user_lon)
+        if not coords:
+            return None
+
+        if user_lat and user_lon:
+            distance = self._calculate_distance(
+                user_lat, user_lon, coords[0], coords[1]
+            )
+            if distance > 50:
+                logger.warning(
+                    f"Fallback coordinates {coords} are {distance:.1f}km away"
+                )
+                return None
+
+        logger.info(f"Found coordinates with fallback '{pattern}': {coords}")
+        return coords
+
     async def get_coordinates_from_search_keywords(
         self, search_keywords: str, user_lat: float = None, user_lon: float = None
     ) -> tuple[float, float] | None:
@@ -1226,24 +1476,11 @@ Sources:
         """
         logger.info(f"Searching coordinates for keywords: {search_keywords}")
 
-        clean_keywords = search_keywords.replace('"', "").replace("'", "").strip()
-
-        city_name = None
-        common_cities = {
-            "Paris": (48.8566, 2.3522, 15),
-            "Москва": (55.7558, 37.6173, 30),
-            "Moscow": (55.7558, 37.6173, 30),
-            "London": (51.5074, -0.1278, 20),
-            "New York": (40.7128, -74.0060, 25),
-            "Санкт-Петербург": (59.9311, 30.3609, 20),
-            "Saint Petersburg": (59.9311, 30.3609, 20),
-            "St Petersburg": (59.9311, 30.3609, 20),
-        }
+        clean_keywords = search_keywords.translate(_STRIP_QUOTES).strip()
 
-        for city, (_city_lat, _city_lon, _radius) in common_cities.items():
-            if city in clean_keywords:
-                city_name = city
-                break
+        city_name = next(
+            (city for city in _KNOWN_CITY_NAMES if city in clean_keywords), None
+        )
 
         nominatim_coords = await self.get_coordinates_from_nominatim(
             clean_keywords, user_lat, user_lon
@@ -1261,56 +1498,24 @@ Sources:
 
         logger.info(f"Nominatim failed for original keywords: {search_keywords}")
 
-        # Fallback patterns
-        fallback_patterns = []
-
-        if "," in search_keywords:
-            parts = [p.strip() for p in search_keywords.split(",")]
-            if len(parts) >= 2:
-                street_indicators = [
-                    "rue",
-                    "avenue",
-                    "boulevard",
-                    "street",
-                    "road",
-                    "place",
-                    "square",
-                ]
-                for i, part in enumerate(parts):
-                    if any(
-                        indicator in part.lower() for indicator in street_indicators
-                    ):
-                        if i < len(parts) - 1:
-                            street_with_city = f"{part}, {parts[-1]}"
-                            fallback_patterns.append(street_with_city)
-                        if re.search(r"\d+", part):
-                            fallback_patterns.append(part)
-                        break
-
-        fallback_patterns = [p.strip() for p in fallback_patterns if p and p.strip()]
-        fallback_patterns = list(dict.fromkeys(fallback_patterns))
-
-        for pattern in fallback_patterns:
-            if pattern and pattern != search_keywords:
-                logger.info(f"Trying fallback search: {pattern}")
-                coords = await self.get_coordinates_from_nominatim(
-                    pattern, user_lat, user_lon
+        # Query fallbacks in small concurrent batches; the semaphore keeps us
+        # polite to Nominatim and the first accepted hit cancels the rest
+        patterns = _fallback_search_patterns(search_keywords)
+        for start in range(0, len(patterns), _FALLBACK_BATCH_SIZE):
+            tasks = [
+                asyncio.create_task(
+                    self._try_fallback_pattern(pattern, user_lat, user_lon)
                 )
-                if coords:
-                    if user_lat and user_lon:
-                        distance = self._calculate_distance(
-                            user_lat, user_lon, coords[0], coords[1]
-                        )
-                        if distance > 50:
-                            logger.warning(
-                                f"Fallback coordinates {coords} are {distance:.1f}km away"
-                            )
-                            continue
-
-                    logger.info(
-                        f"Found coordinates with fallback '{pattern}': {coords}"
-                    )
-                    return coords
+                for pattern in patterns[start : start + _FALLBACK_BATCH_SIZE]
+            ]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    coords = await next_done
+                    if coords:
+                        return coords
+            finally:
+                for task in tasks:
+                    task.cancel()
 
         logger.warning(f"No coordinates found for keywords: {search_keywords}")
         return None
@@ -1334,7 +1539,7 @@ Sources:
             Tuple of (latitude, longitude) if found, None otherwise
         """
         try:
-            answer_match = re.search(r"<answer>(.*?)</answer>", response, re.DOTALL)
+            answer_match = _ANSWER_RE.search(response)
             if answer_match:
                 answer_content = answer_match.group(1).strip()
 
@@ -1377,7 +1582,7 @@ Sources:
                         logger.warning(f"Failed to parse Coordinates field: {e}")
 
                 # PRIORITY 2: Fallback to Search: keywords via Nominatim
-                search_match = re.search(r"Search:\s*(.+?)(?:\n|$)", answer_content)
+                search_match = _SEARCH_RE.search(answer_content)
                 if search_match:
                     search_keywords = search_match.group(1).strip()
                     logger.info(
@@ -1391,7 +1596,7 @@ Sources:
                         return coords
 
                 # PRIORITY 3: Fallback to Location: name via Nominatim
-                location_match = re.search(r"Location:\s*(.+?)(?:\n|$)", answer_content)
+                location_match = _LOCATION_RE.search(answer_content)
                 if location_match:
                     place_name = location_match.group(1).strip()
                     logger.info(
@@ -1405,7 +1610,7 @@ Sources:
                         return coords
             else:
                 # Legacy format fallback
-                search_match = re.search(r"Поиск:\s*(.+?)(?:\n|$)", response)
+                search_match = _SEARCH_LEGACY_RE.search(response)
                 if search_match:
                     search_keywords = search_match.group(1).strip()
                     coords = await self.get_coordinates_from_search_keywords(
@@ -1414,7 +1619,7 @@ Sources:
                     if coords:
                         return coords
 
-                place_match = re.search(r"Локация:\s*(.+?)(?:\n|$)", response)
+                place_match = _LOCATION_LEGACY_RE.search(response)
                 if place_match:
                     place_name = place_match.group(1).strip()
                     coords = await self.get_coordinates_from_search_keywords(
@@ -1471,13 +1676,15 @@ Sources:
                     region = YandexImageSearch.detect_region(lat, lon)
 
                     collected: list[str] = []
+                    seen: set[str] = set()
                     for q in variants:
                         images = await yandex.search_images(
                             query=q, max_images=max(2, max_images), region=region
                         )
                         if images:
                             for u in images:
-                                if u not in collected:
+                                if u not in seen:
+                                    seen.add(u)
                                     collected.append(u)
                         if len(collected) >= max_images:
                             break
@@ -1513,17 +1720,39 @@ Sources:
 
         # Final fallback to Wikipedia search
         if clean_keywords:
-            for lang in ["en", "ru", "fr"]:
+            return await self._search_wikipedia_images_by_priority(
+                clean_keywords, wiki_fallback_languages(clean_keywords), max_images
+            )
+
+        return []
+
+    async def _search_wikipedia_images_by_priority(
+        self, search_term: str, languages: Iterable[str], max_images: int = 5
+    ) -> list[str]:
+        """Search several Wikipedia languages concurrently.
+
+        Returns the images of the first language (in the given order) that has
+        any, so the preference order is kept while the wall time is bounded by
+        the slowest lookup that still matters. Remaining lookups are cancelled.
+        """
+        tasks = [
+            asyncio.create_task(
+                self._search_wikipedia_images(search_term, lang, max_images)
+            )
+            for lang in languages
+        ]
+        try:
+            for task in tasks:
                 try:
-                    results = await self._search_wikipedia_images(
-                        clean_keywords, lang, max_images
-                    )
-                    if results:
-                        return results
+                    results = await task
                 except Exception:
                     continue
-
-        return []
+                if results:
+                    return results
+            return []
+        finally:
+            for task in tasks:
+                task.cancel()
 
     async def _commons_geosearch(
         self, lat: float, lon: float, max_images: int = 5
@@ -1541,31 +1770,52 @@ Sources:
         headers = {"User-Agent": "BotVoyage/2.0 (Educational Project)"}
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url, params=params, headers=headers, timeout=5
-                ) as response:
-                    if response.status != 200:
-                        return []
-                    data = await response.json()
-
-                    results = []
-                    for item in data.get("query", {}).get("geosearch", []):
-                        title = item.get("title", "")
-                        if title.startswith("File:"):
-                            filename = title[5:]
-                            image_url = f"https://commons.wikimedia.org/wiki/Special:FilePath/{quote(filename)}?width=800"
-                            results.append(image_url)
-                            if len(results) >= max_images:
-                                break
+            session = await self._get_http_session()
+            async with session.get(
+                url, params=params, headers=headers, timeout=5
+            ) as response:
+                if response.status != 200:
+                    return []
+                data = await response.json(loads=orjson.loads)
+
+                results = []
+                for item in data.get("query", {}).get("geosearch", []):
+                    title = item.get("title", "")
+                    if title.startswith("File:"):
+                        filename = title[5:]
+                        image_url = f"https://commons.wikimedia.org/wiki/Special:FilePath/{quote_title(filename)}?width=800"
+                        results.append(image_url)
+                        if len(results) >= max_images:
+                            break
 
-                    return results
+                return results
         except Exception as e:
             logger.debug(f"Commons geosearch error: {e}")
             return []
 
     async def _search_wikipedia_images(
         self, search_term: str, lang: str, max_images: int = 5
+    ) -> list[str]:
+        """Search for images on Wikipedia, caching non-empty results."""
+        key = (lang, search_term, max_images)
+        cached = self._wiki_search_cache.get(key)
+        if cached:
+            images, ts = cached
+            if (time.time() - ts) <= self._image_cache_ttl_seconds:
+                self._wiki_search_cache.move_to_end(key)
+                return list(images)
+            del self._wiki_search_cache[key]
+
+        images = await self._fetch_wikipedia_images(search_term, lang, max_images)
+        if images:
+            self._wiki_search_cache[key] = (list(images), time.time())
+            self._wiki_search_cache.move_to_end(key)
+            while len(self._wiki_search_cache) > _WIKI_SEARCH_CACHE_MAX_ENTRIES:
+                self._wiki_search_cache.popitem(last=False)
+        return images
+
+    async def _fetch_wikipedia_images(
+        self, search_term: str, lang: str, max_images: int = 5
     ) -> list[str]:
         """Search for images on Wikipedia."""
         try:
@@ -1578,73 +1828,83 @@ Sources:
             }
             headers = {"User-Agent": "BotVoyage/2.0 (Educational Project)"}
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    search_url, params=params, headers=headers, timeout=5
-                ) as response:
-                    if response.status != 200:
-                        return []
+            session = await self._get_http_session()
+            async with session.get(
+                search_url, params=params, headers=headers, timeout=5
+            ) as response:
+                if response.status != 200:
+                    return []
+
+                search_data = await response.json(loads=orjson.loads)
+                search_results = search_data.get("query", {}).get("search", [])
+
+                if not search_results:
+                    return []
+
+                all_images = []
+                # Related pages often share photos; keep each file once
+                seen_files: set[str] = set()
+
+                # Fetch media lists for the first few pages concurrently
+                page_titles = wiki_article_titles(search_results)
+                pages_items = await asyncio.gather(
+                    *(
+                        self._fetch_media_items(session, lang, page_title, headers)
+                        for page_title in page_titles
+                    ),
+                    return_exceptions=True,
+                )
 
-                    search_data = await response.json()
-                    search_results = search_data.get("query", {}).get("search", [])
+                # Spare candidates replace any that fail the URL probe
+                keep = max_images * 2
+                for items in pages_items:
+                    if isinstance(items, BaseException) or len(all_images) >= keep:
+                        continue
 
-                    if not search_results:
-                        return []
+                    for item in items:
+                        if item.get("type") != "image":
+                            continue
 
-                    all_images = []
+                        title = item.get("title", "").lower()
 
-                    for result in search_results[:5]:
-                        page_title = result.get("title")
-                        if not page_title:
+                        if _WIKI_SKIP_RE.search(title):
                             continue
 
-                        media_url = f"https://{lang}.wikipedia.org/api/rest_v1/page/media-list/{quote(page_title)}"
-
-                        try:
-                            async with session.get(
-                                media_url, headers=headers, timeout=5
-                            ) as media_response:
-                                if media_response.status != 200:
-                                    continue
-
-                                media_data = await media_response.json()
-                                items = media_data.get("items", [])
-
-                                for item in items:
-                                    if item.get("type") != "image":
-                                        continue
-
-                                    title = item.get("title", "").lower()
-
-                                    skip_patterns = [
-                                        "commons-logo",
-                                        "edit-icon",
-                                        "wikimedia",
-                                        "stub",
-                                        "ambox",
-                                        "flag",
-                                    ]
-                                    if any(p in title for p in skip_patterns):
-                                        continue
-
-                                    clean_title = item["title"]
-                                    if clean_title.startswith("File:"):
-                                        clean_title = clean_title[5:]
-
-                                    image_url = f"https://commons.wikimedia.org/wiki/Special:FilePath/{quote(f'File:{clean_title}')}?width=800"
-                                    all_images.append(image_url)
-
-                                    if len(all_images) >= max_images:
-                                        return all_images
-                        except Exception:
+                        clean_title = item["title"]
+                        if clean_title.startswith("File:"):
+                            clean_title = clean_title[5:]
+                        if clean_title in seen_files:
                             continue
+                        seen_files.add(clean_title)
+
+                        image_url = f"https://commons.wikimedia.org/wiki/Special:FilePath/{quote_title(f'File:{clean_title}')}?width=800"
+                        all_images.append(image_url)
 
-                    return all_images[:max_images]
+                        if len(all_images) >= keep:
+                            break
+
+                probed = await self._probe_image_urls(session, all_images, headers)
+                return probed[:max_images]
 
         except Exception as e:
             logger.debug(f"Wikipedia search error: {e}")
             return []
 
+    async def _fetch_media_items(
+        self,
+        session: aiohttp.ClientSession,
+        lang: str,
+        page_title: str,
+        headers: dict[str, str],
+    ) -> list[dict]:
+        """Fetch the REST media-list items of one Wikipedia page ([] if unavailable)."""
+        media_url = f"https://{lang}.wikipedia.org/api/rest_v1/page/media-list/{quote_title(page_title)}"
+        async with session.get(media_url, headers=headers, timeout=5) as response:
+            if response.status != 200:
+                return []
+            media_data = await response.json(loads=orjson.loads)
+        return media_data.get("items", [])
+
     async def get_wikipedia_image(self, search_keywords: str) -> str | None:
         """Get single image from Wikipedia (backward compatibility)."""
         images = await self.get_wikipedia_images(search_keywords, max_images=1)
@@ -1677,25 +1937,7 @@ Sources:
         )
 
         if cache_key:
-            lines = fact_response.split("\n")
-            place = "рядом с вами"
-            fact = fact_response
-
-            for i, line in enumerate(lines):
-                if line.startswith("Локация:") or line.startswith("Location:"):
-                    place = line.split(":", 1)[1].strip() if ":" in line else place
-                elif line.startswith("Интересный факт:") or line.startswith(
-                    "Interesting fact:"
-                ):
-                    fact_lines = [line.split(":", 1)[1].strip() if ":" in line else ""]
-                    for j in range(i + 1, len(lines)):
-                        if lines[j].strip() and not lines[j].startswith(
-                            ("Источники", "Sources", "-")
-                        ):
-                            fact_lines.append(lines[j].strip())
-                    fact = " ".join(fact_lines)
-                    break
-
+            place, fact = _parse_place_and_fact(fact_response)
             logger.info(f"Adding fact to history for {cache_key}: {place}")
             self.static_history.add_fact(cache_key, place, fact)
 
@@ -1741,16 +1983,11 @@ Sources:
         return r * c
 
 
-# Global client instance
-_claude_client: ClaudeClient | None = None
-
-
+# Global client instance - created lazily on first call and cached
+@functools.cache
 def get_claude_client() -> ClaudeClient:
     """Get or create the global Claude client instance."""
-    global _claude_client
-    if _claude_client is None:
-        _claude_client = ClaudeClient()
-    return _claude_client
+    return ClaudeClient()
 
 
 # Backward compatibility aliases
@@ -804,3 +804,12 @@ def get_donors_db() -> DonorsDatabase:
             # Use SQLite for local development
             _donors_db = DonorsDatabase()
     return _donors_db
+
+
+def close_donors_db() -> None:
+    """Release the global donors database if one was created (at shutdown)."""
+    global _donors_db
+    close = getattr(_donors_db, "close", None)
+    if close is not None:
+        close()
+    _donors_db = None
@@ -0,0 +1,209 @@
+"""Geocoding and Wikipedia lookup helpers shared by the fact clients."""
+
+import asyncio
+import functools
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from types import MappingProxyType
+from urllib.parse import quote
+
+import aiohttp
+
+# Wikipedia editions for the keyword image fallback, in order of preference;
+# Cyrillic keywords are far more likely to match a Russian article title
+_WIKI_FALLBACK_LANGUAGES = ("en", "ru", "fr")
+_WIKI_FALLBACK_LANGUAGES_CYRILLIC = ("ru", "en", "fr")
+_CYRILLIC_RE = re.compile("[а-яё]", re.IGNORECASE)
+
+# Search hits that are disambiguation/list pages (en/ru/fr); their media
+# lists are navigation icons at best, so they are not worth a request
+_WIKI_NON_ARTICLE_TITLE_RE = re.compile(
+    r"\((?:disambiguation|значения|homonymie)\)|^(?:list of|index of|список|liste d)",
+    re.IGNORECASE,
+)
+_WIKI_NON_ARTICLE_SNIPPET_RE = re.compile(
+    "may refer to|может означать|peut désigner", re.IGNORECASE
+)
+
+# Selected Commons URLs are HEAD-probed in parallel before being handed to
+# Telegram; a probe that errors or times out keeps its URL (fail open)
+_IMAGE_PROBE_TIMEOUT = aiohttp.ClientTimeout(total=2)
+
+# Successful Nominatim lookups are memoized per client (LRU, 24h TTL); user
+# coordinates only bias the search, so they are keyed at ~100m precision
+_NOMINATIM_CACHE_MAX_ENTRIES = 2000
+_NOMINATIM_CACHE_TTL_SECONDS = 24 * 3600
+# Score bonus per Nominatim result type when picking the best match
+NOMINATIM_TYPE_SCORES = MappingProxyType(
+    dict.fromkeys(("building", "house", "amenity", "historic"), 3)
+    | dict.fromkeys(("street", "road"), 2)
+    | dict.fromkeys(("suburb", "neighbourhood"), 1)
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def quote_title(title: str) -> str:
+    """Percent-encode a Wikipedia/Commons title; titles recur across searches."""
+    return quote(title)
+
+
+def wiki_fallback_languages(search_term: str) -> tuple[str, ...]:
+    """Pick the Wikipedia language order for a keyword image search."""
+    if _CYRILLIC_RE.search(search_term):
+        return _WIKI_FALLBACK_LANGUAGES_CYRILLIC
+    return _WIKI_FALLBACK_LANGUAGES
+
+
+def wiki_article_titles(search_results: list[dict]) -> list[str]:
+    """Titles of the first few search hits that can have useful photos."""
+    return [
+        result["title"]
+        for result in search_results[:5]
+        if result.get("title")
+        and not _WIKI_NON_ARTICLE_TITLE_RE.search(result["title"])
+        and not _WIKI_NON_ARTICLE_SNIPPET_RE.search(result.get("snippet", ""))
+    ]
+
+
+class SharedLookupsMixin:
+    """Nominatim caching, request coalescing and image probing for a client.
+
+    The client provides ``_fetch_nominatim_coordinates`` (one upstream lookup)
+    and passes its fact requests through ``_coalesce_fact_request``.
+    """
+
+    def __init__(self):
+        """Set up the per-client lookup caches and in-flight maps."""
+        # At most 2 upstream Nominatim lookups at a time (usage policy)
+        self._nominatim_semaphore = asyncio.Semaphore(2)
+        # (place, lat, lon) -> (monotonic ts, coords), in LRU order
+        self._nominatim_cache: OrderedDict[
+            tuple[str, float | None, float | None], tuple[float, tuple[float, float]]
+        ] = OrderedDict()
+        # Lookups in flight, so concurrent requests for a key share one call
+        self._nominatim_inflight: dict[
+            tuple[str, float | None, float | None],
+            asyncio.Task[tuple[float, float] | None],
+        ] = {}
+        # Fact requests in flight, so identical concurrent requests share one call
+        self._fact_inflight: dict[tuple, asyncio.Task[str]] = {}
+
+    async def _coalesce_fact_request(
+        self, key: tuple, generate: Callable[[], Awaitable[str]]
+    ) -> str:
+        """Await the fact request for key, starting it only if none is in flight."""
+        task = self._fact_inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(generate())
+            self._fact_inflight[key] = task
+            task.add_done_callback(lambda done: self._forget_fact_request(key, done))
+        # Shielded so a cancelled caller doesn't cancel the request for the others
+        return await asyncio.shield(task)
+
+    def _forget_fact_request(self, key: tuple, task: asyncio.Task[str]) -> None:
+        """Drop a finished fact request from the in-flight map."""
+        self._fact_inflight.pop(key, None)
+        if not task.cancelled():
+            # Mark the error as retrieved even if every caller was cancelled
+            task.exception()
+
+    async def get_coordinates_from_nominatim(
+        self, place_name: str, user_lat: float = None, user_lon: float = None
+    ) -> tuple[float, float] | None:
+        """Get coordinates using OpenStreetMap Nominatim service, with caching.
+
+        Hits are kept for ``_NOMINATIM_CACHE_TTL_SECONDS`` (at most
+        ``_NOMINATIM_CACHE_MAX_ENTRIES``, least recently used evicted first).
+        Concurrent lookups for the same key await a single upstream request.
+
+        Args:
+            place_name: Name of the place to search
+            user_lat: User's latitude to prioritize nearby results
+            user_lon: User's longitude to prioritize nearby results
+
+        Returns:
+            Tuple of (latitude, longitude) if found, None otherwise
+        """
+        key = (
+            place_name,
+            None if user_lat is None else round(user_lat, 3),
+            None if user_lon is None else round(user_lon, 3),
+        )
+        cached = self._nominatim_cache.get(key)
+        if cached:
+            ts, coords = cached
+            if time.monotonic() - ts <= _NOMINATIM_CACHE_TTL_SECONDS:
+                self._nominatim_cache.move_to_end(key)
+                return coords
+            del self._nominatim_cache[key]
+
+        task = self._nominatim_inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self._fetch_nominatim_limited(place_name, user_lat, user_lon)
+            )
+            self._nominatim_inflight[key] = task
+            task.add_done_callback(lambda done: self._store_nominatim_result(key, done))
+        # Shielded so a cancelled caller doesn't cancel the lookup for the others
+        return await asyncio.shield(task)
+
+    def _store_nominatim_result(
+        self,
+        key: tuple[str, float | None, float | None],
+        task: asyncio.Task[tuple[float, float] | None],
+    ) -> None:
+        """Cache a finished Nominatim lookup and drop it from the in-flight map."""
+        self._nominatim_inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        coords = task.result()
+        if coords:
+            self._nominatim_cache[key] = (time.monotonic(), coords)
+            self._nominatim_cache.move_to_end(key)
+            while len(self._nominatim_cache) > _NOMINATIM_CACHE_MAX_ENTRIES:
+                self._nominatim_cache.popitem(last=False)
+
+    async def _fetch_nominatim_limited(
+        self, place_name: str, user_lat: float | None, user_lon: float | None
+    ) -> tuple[float, float] | None:
+        """Run one upstream lookup while holding a Nominatim concurrency slot.
+
+        The slot is taken inside the shielded task rather than by its waiters,
+        so a lookup that outlives a cancelled caller still counts against it.
+        """
+        async with self._nominatim_semaphore:
+            return await self._fetch_nominatim_coordinates(
+                place_name, user_lat, user_lon
+            )
+
+    async def _probe_image_urls(
+        self,
+        session: aiohttp.ClientSession,
+        urls: list[str],
+        headers: dict[str, str],
+    ) -> list[str]:
+        """Drop image URLs that definitely do not resolve to an image.
+
+        Only a missing file (404/410) or a 200 that is not an image is dropped;
+        rate limits, server errors and failed probes keep the URL.
+        """
+
+        async def probe(url: str) -> bool:
+            async with session.head(
+                url,
+                headers=headers,
+                allow_redirects=True,
+                timeout=_IMAGE_PROBE_TIMEOUT,
+            ) as response:
+                if response.status in (404, 410):
+                    return False
+                if response.status == 200:
+                    return response.content_type.startswith("image/")
+                return True
+
+        results = await asyncio.gather(
+            *(probe(url) for url in urls), return_exceptions=True
+        )
+        return [url for url, ok in zip(urls, results, strict=True) if ok is not False]
@@ -1,20 +1,239 @@
 """OpenAI client for generating location-based facts."""
 
 import asyncio
+import functools
 import hashlib
+import heapq
+import itertools
 import logging
 import os
 import re
+import sys
 import time
-from urllib.parse import quote
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Iterable, Iterator
+from types import MappingProxyType
 
 import aiohttp
-from openai import AsyncOpenAI
+import httpx
+import orjson
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 
 from .donors_db import get_donors_db
+from .lookup_common import (
+    NOMINATIM_TYPE_SCORES,
+    SharedLookupsMixin,
+    quote_title,
+    wiki_article_titles,
+    wiki_fallback_languages,
+)
 
 logger = logging.getLogger(__name__)
 
+# Only the most recent facts are embedded into prompts to keep them bounded
+_MAX_PREVIOUS_FACTS = 5
+
+# Tool-use policy appended to every Responses API system prompt; adjacent
+# literals are joined at compile time, so the request path does one concat
+_RESPONSES_TOOLS_PROMPT = (
+    "\n\nTOOLS AVAILABLE:\n"
+    "- web_search: Built-in search tool. Use it immediately without asking for permission. Run at least two distinct queries (coordinates + facts). Do not print raw tool output; synthesize a verified answer with Sources.\n"
+    "\nPOLICY:\n- Do not ask the user for approval to use tools. If a tool is available and needed, call it.\n"
+    "- NEVER write about the coordinate itself being unnamed/empty - always find a real place/building/monument\n"
+    "- NEVER mention technical tools like Nominatim, Overpass, reverse geocoding in your response\n"
+    "- If the exact coordinates have no POI, immediately expand search to find the nearest interesting location\n"
+    "- NEVER apologize or explain difficulties. You are a fact writer, not a search assistant.\n"
+    "- FORBIDDEN: 'Извините', 'не удалось', 'временно недоступен', 'могу проверить', 'нужна проверка'\n"
+    "- If you cannot produce a fact, return ONLY '[[NO_POI_FOUND]]' - no explanations.\n"
+)
+
+# Per-user language lookups are reused for a few minutes, bounded in size
+_USER_PREFS_TTL_SECONDS = 300
+_USER_PREFS_MAX_ENTRIES = 1024
+
+# Output budget per fact (reasoning + ~100-120 words of answer); a fact is short,
+# so a tight cap stops runaway generations early
+_MAX_OUTPUT_TOKENS = 4000
+
+# Nominatim: fail fast on slow connects so fallback patterns are tried sooner,
+# and retry transient network errors once with a short exponential backoff
+_NOMINATIM_TIMEOUT = aiohttp.ClientTimeout(total=3, connect=1)
+_NOMINATIM_ATTEMPTS = 2
+_NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+_NOMINATIM_HEADERS = MappingProxyType(
+    {"User-Agent": "BotVoyage/1.0 (Educational Project)"}
+)
+# Shared by every search strategy; get 5 results to choose the best match from
+_NOMINATIM_BASE_PARAMS = MappingProxyType({"format": "json", "limit": 5})
+# Fallback queries are fired this many at a time, first accepted hit wins
+_FALLBACK_BATCH_SIZE = 4
+
+# Explicit "lat, lon" pair with at least 3 decimals (e.g. "48.835615, 2.345458")
+_LATLON_RE = re.compile(r"(-?\d{1,2}\.\d{3,})[,\s]+(-?\d{1,3}\.\d{3,})")
+
+# Patterns for the <answer> block and the fields inside it (plus legacy fields)
+_ANSWER_RE = re.compile(r"<answer>(.*?)</answer>", re.DOTALL)
+_SEARCH_RE = re.compile(r"Search:\s*(.+?)(?:\n|$)")
+_LOCATION_RE = re.compile(r"Location:\s*(.+?)(?:\n|$)")
+_SEARCH_LEGACY_RE = re.compile(r"Поиск:\s*(.+?)(?:\n|$)")
+_LOCATION_LEGACY_RE = re.compile(r"Локация:\s*(.+?)(?:\n|$)")
+
+# Legacy "Локация:" / "Интересный факт:" lines of a fact (at the start of a line)
+_PLACE_LINE_RE = re.compile(r"^Локация:(.*)$", re.MULTILINE)
+_FACT_LINE_RE = re.compile(r"^Интересный факт:(.*)$", re.MULTILINE)
+
+# Quote characters dropped from search keywords (one translate pass)
+_STRIP_QUOTES = str.maketrans("", "", "\"'")
+
+# Metro/station words stripped from keywords in one pass (substring match, like
+# the str.replace chain it replaced)
+_METRO_WORDS_RE = re.compile("Metro|metro|метро|станция")
+
+# Common default/placeholder coordinates, keyed to 2 decimal places so that
+# _coordinates_look_imprecise can use a set lookup instead of a linear scan
+_SUSPICIOUS_COORDS = frozenset(
+    (round(lat, 2), round(lon, 2))
+    for lat, lon in (
+        (0.0, 0.0),  # Null Island
+        (55.7558, 37.6173),  # Generic Moscow center
+        (55.75, 37.62),  # Rounded Moscow
+        (59.9311, 30.3609),  # Generic SPb center
+    )
+)
+
+
+# Wikipedia image searches are memoized per client, bounded in size (LRU)
+_WIKI_SEARCH_CACHE_MAX_ENTRIES = 2048
+
+# Wikipedia media-list titles that are icons/decorations rather than photos;
+# one alternation scans a title once instead of once per pattern
+_WIKI_SKIP_RE = re.compile(
+    "commons-logo|edit-icon|wikimedia|stub|ambox|crystal|nuvola|dialog|system"
+    "|red_x|green_check|question_mark|infobox|arrow|symbol|disambiguation|flag"
+)
+# Photo formats are preferred over PNG/WebP when scoring candidate images
+_WIKI_JPEG_RE = re.compile(r"\.jpe?g")
+_WIKI_RASTER_RE = re.compile(r"\.(?:png|webp)")
+# Generic Commons files (emblems, flags) that recur across unrelated places
+_COMMONS_GENERIC_FILE_RE = re.compile("logo|emblem|coat_of_arms|flag")
+
+
+def _hit_output_cap(response) -> bool:
+    """Whether a Responses API answer was cut off by max_output_tokens."""
+    incomplete = getattr(response, "incomplete_details", None)
+    return getattr(incomplete, "reason", None) == "max_output_tokens"
+
+
+def _decimal_places(value: float) -> int:
+    """Count the decimal places in the shortest repr of a coordinate."""
+    _, dot, fraction = repr(value).partition(".")
+    return len(fraction) if dot else 0
+
+
+def _parse_place_and_fact(fact_response: str) -> tuple[str, str]:
+    """Split a legacy "Локация:/Интересный факт:" response for the fact history.
+
+    The place is the last location line before the fact; the fact is its first
+    line plus every following non-empty line, joined with spaces. Falls back to
+    a generic place and the whole response when the markers are missing.
+    """
+    fact_match = _FACT_LINE_RE.search(fact_response)
+    head = fact_response[: fact_match.start()] if fact_match else fact_response
+    places = _PLACE_LINE_RE.findall(head)
+    place = places[-1].strip() if places else "рядом с вами"
+    if not fact_match:
+        return place, fact_response
+
+    # Join all lines after the marker as the fact might be multiline
+    tail = fact_response[fact_match.end() :].split("\n")
+    fact = " ".join(
+        [fact_match.group(1).strip(), *(line.strip() for line in tail if line.strip())]
+    )
+    return place, fact
+
+
+@functools.lru_cache(maxsize=32)
+def _location_fact_system_prompt(user_language: str, language_instructions: str) -> str:
+    """Build the location-fact system prompt, cached per language."""
+    core_rules = f"""YOU ARE A FACT WRITER, NOT A SEARCH ASSISTANT. Never apologize, never ask permission, never explain difficulties. Either write a complete fact or return [[NO_POI_FOUND]].
+
+Atlas Obscura–style facts in {user_language}. Goal: the most surprising, specific, verifiable detail about a REAL PLACE near this spot.
+
+Verification:
+- Use web_search at least twice (coordinates + facts); cross‑check dates/names/numbers; prefer reliable sources.
+
+Method:
+1) Location: Find a real building/monument/place (not empty point). Exact address with house number. Distance: prefer within 400m, good up to 800m, max 1200m if needed.
+2) Research: A) specific building/place at exact spot B) immediate vicinity (<200m) C) nearby area (200-800m).
+3) Visible today: concrete details a visitor can see (no imaginary plaques/signatures/marks).
+
+Writing:
+- Start with the most surprising detail immediately - no generic introductions.
+- Include at least one specific name and exact date/year.
+- Each sentence must add NEW concrete information (no repetition in different words).
+- Focus on interesting, unusual, or historical details about the place.
+- QUALITY BAR: Would this fact make someone stop walking and look closer? If not, dig deeper.
+
+STRICTLY FORBIDDEN:
+- Meta-facts about coordinates being "unnamed"/"empty"/"безымянный"/"нет имени"
+- Mentioning technical tools (Nominatim, Overpass, reverse geocoding, панорамы, API, геопоиск)
+- Facts about the search process itself or coordinate analysis
+- Wrong dates, false attributions, invented details, rounded numbers, over‑drama, made‑up features.
+- ANY form of apologies, permissions, or meta-commentary ("Извините", "могу проверить", "нужна проверка")
+- Temporary placeholders like "рядом с вами" without specific address
+- Mentioning unavailable services or failed searches
+
+FORBIDDEN PHRASES (NEVER USE):
+- "Извините — не удалось..."
+- "Временно недоступен..."
+- "Могу повторить проверку..."
+- "Нужна быстрая проверка..."
+- "чтобы дать точный..."
+- "мне нужно проверить..."
+- "вернусь с проверенной информацией"
+- "служба геопоиска недоступна"
+
+IF YOU CANNOT FIND A FACT: Return ONLY "[[NO_POI_FOUND]]" - nothing else. Do NOT apologize or explain.
+
+Output:
+- No URLs in main text. End with ONE 'Источники'/'Sources' section: 2–4 bullets "Title — URL" (clickable, real links). Do not add any extra link lists (no second "🔗 Источники").
+- Do NOT write exact numeric distance phrases like "в 220 метрах от вас" or similar; describe proximity qualitatively if needed.
+
+Search field:
+- "Address, City" format for Nominatim.
+
+Strict formatting and verification:
+- Output ONLY the <answer> block and nothing else (no prolog/epilog outside tags).
+- Keep 'Location/Coordinates/Search' only in their own lines; do not repeat them inside the fact paragraph.
+- Always verify facts with multiple sources. If any detail is uncertain, either omit it or generalize without inventing specifics. Only include information you can support with your Sources.
+- NO META / NO PERMISSION-ASKING: never ask the user to allow searches; never write requests like "нужна проверка", "можно/разрешите проверить", "могу ли я". If web search is needed, just do it and output the final result.
+- LOCATION MUST BE CONCRETE: 'Location:' must be a specific address/place/intersection, never a question or a meta sentence. Forbidden in 'Location:': "Нужна проверка", "Можно...", "?", "рядом с вами", "Временно не могу вернуть адрес".
+- If you truly cannot find any POI or verifiable fact within 600m, return ONLY the token "[[NO_POI_FOUND]]" on a single line. Do NOT write apologies, explanations, or meta-text.
+- SOURCES QUALITY: do not cite generic API/documentation homepages (e.g., GeoNames docs, API Adresse docs). Cite pages directly about the POI or authoritative coverage (official site page, museum/municipal archives, reputable media, Wikipedia article of the POI). Links must be clickable.
+"""
+
+    language_block = f"""
+LANGUAGE REQUIREMENTS:
+Write your response in {user_language}.
+{language_instructions}"""
+
+    return f"{core_rules}\n\n{language_block}".strip()
+
+
+@functools.lru_cache(maxsize=32)
+def _responses_system_message(system_prompt: str) -> dict:
+    """Build the Responses API system input item, cached per system prompt.
+
+    The SDK only reads request inputs, so the same item is shared by all calls
+    with the same (already cached) system prompt.
+    """
+    return {
+        "role": "system",
+        "content": [
+            {"type": "input_text", "text": system_prompt + _RESPONSES_TOOLS_PROMPT}
+        ],
+    }
+
 
 class StaticLocationHistory:
     """Simple in-memory cache for static location facts to avoid repetition."""
@@ -26,9 +245,15 @@ class StaticLocationHistory:
             max_entries: Maximum number of entries to keep in cache
             ttl_hours: Time to live for entries in hours
         """
-        self._cache = {}  # {search_keywords: {"facts": [facts], "timestamp": time}}
+        # {search_keywords: {"facts": [facts], "timestamp": monotonic}}, in LRU order
+        self._cache: OrderedDict[str, dict] = OrderedDict()
         self._max_entries = max_entries
         self._ttl_seconds = ttl_hours * 3600
+        # Expired entries are swept at most once per interval
+        self._cleanup_interval = 60.0
+        self._last_cleanup = float("-inf")
+        # Min-heap of (expiry_ts, search_keywords); refreshed keys leave stale items
+        self._expiry_heap: list[tuple[float, str]] = []
 
     def get_previous_facts(self, search_keywords: str) -> list[str]:
         """Get previous facts for a location.
@@ -42,8 +267,11 @@ class StaticLocationHistory:
         self._cleanup_expired()
 
         entry = self._cache.get(search_keywords)
-        if entry and (time.time() - entry["timestamp"]) < self._ttl_seconds:
-            return entry["facts"][-5:]  # Return last 5 facts like live location
+        if entry and (time.monotonic() - entry["timestamp"]) < self._ttl_seconds:
+            self._cache.move_to_end(search_keywords)
+            facts = entry["facts"]
+            # Return last 5 facts like live location
+            return list(itertools.islice(facts, max(len(facts) - 5, 0), None))
         return []
 
     def add_fact(self, search_keywords: str, place: str, fact: str):
@@ -56,43 +284,58 @@ class StaticLocationHistory:
         """
         self._cleanup_expired()
 
+        # The key is held by both the cache and the expiry heap; share one copy
+        search_keywords = sys.intern(search_keywords)
+
         if search_keywords not in self._cache:
-            self._cache[search_keywords] = {"facts": [], "timestamp": time.time()}
+            if len(self._cache) >= self._max_entries:
+                # Make room from expired entries before evicting live ones
+                self._cleanup_expired(force=True)
+            # Keep only last 10 facts per location to prevent memory bloat
+            self._cache[search_keywords] = {
+                "facts": deque(maxlen=10),
+                "timestamp": time.monotonic(),
+            }
 
         # Add fact in same format as live location
         fact_entry = f"{place}: {fact}"
+        now = time.monotonic()
         self._cache[search_keywords]["facts"].append(fact_entry)
-        self._cache[search_keywords]["timestamp"] = time.time()
-
-        # Keep only last 10 facts per location to prevent memory bloat
-        if len(self._cache[search_keywords]["facts"]) > 10:
-            self._cache[search_keywords]["facts"] = self._cache[search_keywords][
-                "facts"
-            ][-10:]
+        self._cache[search_keywords]["timestamp"] = now
+        heapq.heappush(self._expiry_heap, (now + self._ttl_seconds, search_keywords))
+
+        # Mark as most recently used and evict least recently used locations
+        self._cache.move_to_end(search_keywords)
+        while len(self._cache) > self._max_entries:
+            self._cache.popitem(last=False)
+
+        # Refreshed and evicted keys leave stale heap items behind; rebuild the
+        # heap from live entries once they clearly outnumber the cache
+        if len(self._expiry_heap) > 2 * len(self._cache) + 64:
+            self._expiry_heap = [
+                (entry["timestamp"] + self._ttl_seconds, key)
+                for key, entry in self._cache.items()
+            ]
+            heapq.heapify(self._expiry_heap)
 
         logger.debug(f"Added fact to static location history: {place}")
 
-    def _cleanup_expired(self):
-        """Remove expired entries and limit cache size."""
-        current_time = time.time()
+    def _cleanup_expired(self, force: bool = False):
+        """Remove expired entries (size is bounded by LRU eviction in add_fact).
 
-        # Remove expired entries
-        expired_keys = [
-            key
-            for key, entry in self._cache.items()
-            if (current_time - entry["timestamp"]) >= self._ttl_seconds
-        ]
-        for key in expired_keys:
-            del self._cache[key]
-
-        # Limit cache size
-        if len(self._cache) > self._max_entries:
-            # Remove oldest entries
-            sorted_items = sorted(self._cache.items(), key=lambda x: x[1]["timestamp"])
-            keys_to_remove = [
-                item[0] for item in sorted_items[: len(self._cache) - self._max_entries]
-            ]
-            for key in keys_to_remove:
+        Args:
+            force: Sweep even if the last sweep was less than an interval ago
+        """
+        current_time = time.monotonic()
+        if not force and current_time - self._last_cleanup < self._cleanup_interval:
+            return
+        self._last_cleanup = current_time
+
+        # Pop due expiries; skip keys refreshed or evicted since they were pushed
+        while self._expiry_heap and self._expiry_heap[0][0] <= current_time:
+            _, key = heapq.heappop(self._expiry_heap)
+            entry = self._cache.get(key)
+            if entry and (current_time - entry["timestamp"]) >= self._ttl_seconds:
                 del self._cache[key]
 
     def get_cache_stats(self) -> dict:
@@ -108,16 +351,34 @@ class StaticLocationHistory:
         }
 
 
-class OpenAIClient:
+class OpenAIClient(SharedLookupsMixin):
     """Client for interacting with OpenAI API to generate location facts."""
 
-    def __init__(self, api_key: str | None = None):
+    def __init__(self, api_key: str | None = None, hedge_requests: bool | None = None):
         """Initialize OpenAI client.
 
         Args:
             api_key: OpenAI API key. If None, will use OPENAI_API_KEY env var.
+            hedge_requests: Race the user's model against gpt-5.1 for live
+                locations and keep whichever answers first. Doubles API spend
+                on hedged calls. If None, read OPENAI_HEDGE_REQUESTS env var.
         """
-        self.client = AsyncOpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
+        super().__init__()
+        # HTTP/2 multiplexes concurrent fact requests over a few connections
+        self.client = AsyncOpenAI(
+            api_key=api_key or os.getenv("OPENAI_API_KEY"),
+            http_client=DefaultAsyncHttpxClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+            ),
+        )
+        if hedge_requests is None:
+            hedge_requests = os.getenv("OPENAI_HEDGE_REQUESTS", "").lower() in (
+                "1",
+                "true",
+                "yes",
+            )
+        self._hedge_requests = hedge_requests
         self.static_history = StaticLocationHistory()
         # Lightweight caches for Wikimedia pipeline
         self._qid_cache: dict[str, tuple[str, float]] = {}  # key -> (qid, ts)
@@ -125,9 +386,32 @@ class OpenAIClient:
         self._fileinfo_cache: dict[str, tuple[dict, float]] = (
             {}
         )  # filename -> (info, ts)
+        # (lang, search term, max_images) -> (image urls, ts), in LRU order
+        self._wiki_search_cache: OrderedDict[
+            tuple[str, str, int], tuple[list[str], float]
+        ] = OrderedDict()
         self._image_cache_ttl_seconds = 24 * 3600
         # Семафор для ограничения одновременных запросов к OpenAI API
         self._api_semaphore = asyncio.Semaphore(3)  # Максимум 3 параллельных запроса
+        # Shared HTTP session for geocoding and Wikimedia, created lazily
+        self._http_session: aiohttp.ClientSession | None = None
+        # user_id -> (monotonic ts, language), in LRU order
+        self._user_prefs_cache: OrderedDict[int, tuple[float, str]] = OrderedDict()
+
+    async def _get_http_session(self) -> aiohttp.ClientSession:
+        """Return the shared aiohttp session, creating it on first use."""
+        if self._http_session is None or self._http_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=100, ttl_dns_cache=300, keepalive_timeout=60
+            )
+            self._http_session = aiohttp.ClientSession(connector=connector)
+        return self._http_session
+
+    async def close(self):
+        """Close the shared HTTP session."""
+        if self._http_session and not self._http_session.closed:
+            await self._http_session.close()
+        self._http_session = None
 
     def _build_location_fact_prompt(
         self,
@@ -135,95 +419,33 @@ class OpenAIClient:
         lon: float,
         is_live_location: bool,
         user_language: str,
-        previous_facts: list | None,
+        previous_facts: Iterable[str] | None,
         language_instructions: str,
     ) -> tuple[str, str]:
         """Build structured system/user prompts (de-duplicated, with Sources section).
 
         Keeps rich guidance, removes repetition, and enforces link formatting.
         """
-        core_rules = f"""YOU ARE A FACT WRITER, NOT A SEARCH ASSISTANT. Never apologize, never ask permission, never explain difficulties. Either write a complete fact or return [[NO_POI_FOUND]].
-
-Atlas Obscura–style facts in {user_language}. Goal: the most surprising, specific, verifiable detail about a REAL PLACE near this spot.
-
-Verification:
-- Use web_search at least twice (coordinates + facts); cross‑check dates/names/numbers; prefer reliable sources.
-
-Method:
-1) Location: Find a real building/monument/place (not empty point). Exact address with house number. Distance: prefer within 400m, good up to 800m, max 1200m if needed.
-2) Research: A) specific building/place at exact spot B) immediate vicinity (<200m) C) nearby area (200-800m).
-3) Visible today: concrete details a visitor can see (no imaginary plaques/signatures/marks).
-
-Writing:
-- Start with the most surprising detail immediately - no generic introductions.
-- Include at least one specific name and exact date/year.
-- Each sentence must add NEW concrete information (no repetition in different words).
-- Focus on interesting, unusual, or historical details about the place.
-- QUALITY BAR: Would this fact make someone stop walking and look closer? If not, dig deeper.
-
-STRICTLY FORBIDDEN:
-- Meta-facts about coordinates being "unnamed"/"empty"/"безымянный"/"нет имени"
-- Mentioning technical tools (Nominatim, Overpass, reverse geocoding, панорамы, API, геопоиск)
-- Facts about the search process itself or coordinate analysis
-- Wrong dates, false attributions, invented details, rounded numbers, over‑drama, made‑up features.
-- ANY form of apologies, permissions, or meta-commentary ("Извините", "могу проверить", "нужна проверка")
-- Temporary placeholders like "рядом с вами" without specific address
-- Mentioning unavailable services or failed searches
-
-FORBIDDEN PHRASES (NEVER USE):
-- "Извините — не удалось..."
-- "Временно недоступен..."
-- "Могу повторить проверку..."
-- "Нужна быстрая проверка..."
-- "чтобы дать точный..."
-- "мне нужно проверить..."
-- "вернусь с проверенной информацией"
-- "служба геопоиска недоступна"
-
-IF YOU CANNOT FIND A FACT: Return ONLY "[[NO_POI_FOUND]]" - nothing else. Do NOT apologize or explain.
-
-Output:
-- No URLs in main text. End with ONE 'Источники'/'Sources' section: 2–4 bullets "Title — URL" (clickable, real links). Do not add any extra link lists (no second "🔗 Источники").
-- Do NOT write exact numeric distance phrases like "в 220 метрах от вас" or similar; describe proximity qualitatively if needed.
-
-Search field:
-- "Address, City" format for Nominatim.
-
-Strict formatting and verification:
-- Output ONLY the <answer> block and nothing else (no prolog/epilog outside tags).
-- Keep 'Location/Coordinates/Search' only in their own lines; do not repeat them inside the fact paragraph.
-- Always verify facts with multiple sources. If any detail is uncertain, either omit it or generalize without inventing specifics. Only include information you can support with your Sources.
-- NO META / NO PERMISSION-ASKING: never ask the user to allow searches; never write requests like "нужна проверка", "можно/разрешите проверить", "могу ли я". If web search is needed, just do it and output the final result.
-- LOCATION MUST BE CONCRETE: 'Location:' must be a specific address/place/intersection, never a question or a meta sentence. Forbidden in 'Location:': "Нужна проверка", "Можно...", "?", "рядом с вами", "Временно не могу вернуть адрес".
-- If you truly cannot find any POI or verifiable fact within 600m, return ONLY the token "[[NO_POI_FOUND]]" on a single line. Do NOT write apologies, explanations, or meta-text.
-- SOURCES QUALITY: do not cite generic API/documentation homepages (e.g., GeoNames docs, API Adresse docs). Cite pages directly about the POI or authoritative coverage (official site page, museum/municipal archives, reputable media, Wikipedia article of the POI). Links must be clickable.
-"""
-
-        language_block = f"""
-LANGUAGE REQUIREMENTS:
-Write your response in {user_language}.
-{language_instructions}"""
-
-        system_prompt = f"{core_rules}\n\n{language_block}".strip()
+        system_prompt = _location_fact_system_prompt(
+            user_language, language_instructions
+        )
 
         prev_block = ""
         if previous_facts:
             # Extract place names from history for explicit no-repeat list
             place_names = []
-            fact_entries = []
-            for entry in previous_facts[-5:]:
+            for entry in previous_facts:
                 # Handle both "Place: Fact" format and plain entries
                 if ": " in entry:
                     place_name = entry.split(": ", 1)[0].strip()
                     if place_name:
                         place_names.append(place_name)
-                fact_entries.append(f"- {entry}")
 
-            prev_text = "\n".join(fact_entries)
+            prev_text = "\n".join(f"- {entry}" for entry in previous_facts)
 
             # Build explicit forbidden places list
             if place_names:
-                places_list = ", ".join([f'"{p}"' for p in place_names])
+                places_list = ", ".join(f'"{p}"' for p in place_names)
                 prev_block = f"""
 PREVIOUS FACTS ALREADY MENTIONED:
 {prev_text}
@@ -303,64 +525,48 @@ Sources/Источники:
 
         return system_prompt, user_prompt
 
-    async def get_nearby_fact(
-        self,
-        lat: float,
-        lon: float,
-        is_live_location: bool = False,
-        previous_facts: list = None,
-        user_id: int = None,
-        force_reasoning_none: bool = False,
-    ) -> str:
-        """Get an interesting fact about a location.
+    async def _get_user_language(self, user_id: int | None) -> str:
+        """Resolve the user's preferred language, defaulting to Russian.
 
-        Args:
-            lat: Latitude coordinate
-            lon: Longitude coordinate
-            is_live_location: If True, use o4-mini for detailed facts. If False, use GPT-5.1 Responses.
-            previous_facts: List of previously sent facts to avoid repetition (for live location)
-            user_id: User ID to check premium status
-            force_reasoning_none: If True, force reasoning=none for fast first fact
-
-        Returns:
-            A location name and an interesting fact about it
-
-        Raises:
-            Exception: If OpenAI API call fails
+        Successful lookups are memoized for _USER_PREFS_TTL_SECONDS so rapid
+        live-location updates don't hit donors_db on every fact.
         """
-        try:
-            # Note: force_reasoning_none parameter is available in this scope
-            # Check if user has premium access for o3 model and get language preference
-            user_language = (
-                "ru"  # Default to Russian as most users are Russian-speaking
-            )
-            if user_id:
+        user_language = "ru"  # Default to Russian as most users are Russian-speaking
+        if user_id:
+            cached = self._user_prefs_cache.get(user_id)
+            if cached and time.monotonic() - cached[0] < _USER_PREFS_TTL_SECONDS:
+                self._user_prefs_cache.move_to_end(user_id)
+                return cached[1]
+            try:
+                # Check if we're in async context (telegram handlers)
                 try:
-                    # Check if we're in async context (telegram handlers)
-                    import asyncio
-
-                    try:
-                        asyncio.get_running_loop()
-                        # We're in async context, use async wrapper
-                        from .async_donors_wrapper import get_async_donors_db
-
-                        donors_db = await get_async_donors_db()
-                        await donors_db.is_premium_user(user_id)
-                        user_language = await donors_db.get_user_language(user_id)
-                    except RuntimeError:
-                        # Not in async context, use sync wrapper
-                        donors_db = get_donors_db()
-                        donors_db.is_premium_user(user_id)
-                        user_language = donors_db.get_user_language(user_id)
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to check user preferences for user {user_id}: {e}"
-                    )
+                    asyncio.get_running_loop()
+                    # We're in async context, use async wrapper
+                    from .async_donors_wrapper import get_async_donors_db
 
-            # Special instructions for Russian language quality
-            language_instructions = ""
-            if user_language == "ru":
-                language_instructions = """
+                    donors_db = await get_async_donors_db()
+                    user_language = await donors_db.get_user_language(user_id)
+                except RuntimeError:
+                    # Not in async context, use sync wrapper
+                    donors_db = get_donors_db()
+                    user_language = donors_db.get_user_language(user_id)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to check user preferences for user {user_id}: {e}"
+                )
+            else:
+                self._user_prefs_cache[user_id] = (time.monotonic(), user_language)
+                self._user_prefs_cache.move_to_end(user_id)
+                while len(self._user_prefs_cache) > _USER_PREFS_MAX_ENTRIES:
+                    self._user_prefs_cache.popitem(last=False)
+        return user_language
+
+    def _get_language_instructions(self, user_language: str) -> str:
+        """Get extra style instructions for the user's language (Russian only)."""
+        if user_language != "ru":
+            return ""
+        return (
+            """
 SPECIAL REQUIREMENTS FOR RUSSIAN (Atlas Obscura style):
 
 СТИЛЬ ИЗЛОЖЕНИЯ:
@@ -388,8 +594,8 @@ SPECIAL REQUIREMENTS FOR RUSSIAN (Atlas Obscura style):
 ✗ "В данном месте находился известный ресторан."
 
 ЗОЛОТОЕ ПРАВИЛО: Каждое предложение должно добавлять новую конкретную информацию, а не повторять уже сказанное другими словами."""
-                # Дополнительно закрепим краткие правила качества, как раньше:
-                language_instructions += """
+            # Дополнительно закрепим краткие правила качества, как раньше:
+            + """
  - Каждое предложение добавляет новую конкретную информацию; избегайте воды
  - Точность важнее драматизма; явно отличайте документированные факты от легенд
 
@@ -399,362 +605,80 @@ SPECIAL REQUIREMENTS FOR RUSSIAN (Atlas Obscura style):
 - Имена собственные пишите в принятой русской транскрипции, если она существует (например, «Жорж-Эжен Осман», «Пьер Кюри»).
 - Не переключайтесь на французский/английский внутри русского текста без необходимости; держите единый русский язык всего ответа.
 """
+        )
 
-            # Choose appropriate system prompt based on location type
-            if is_live_location:
-                # Atlas Obscura-style system prompt for live locations (o4-mini/o3)
-                system_prompt = f"""You are writing location facts for Atlas Obscura. Your mission: find the most surprising, specific detail about places that would make even locals say "I never knew that!"
-
-IMPORTANT: You must respond entirely in {user_language}. All your analysis, reasoning, and final answer must be in {user_language}.
-
-MANDATORY ONLINE VERIFICATION (WITH web_search WHEN AVAILABLE):
-- You MUST verify the exact coordinates, names, dates and other factual details using reliable web sources.
-- When the web_search tool is available, you MUST call web_search (at least two distinct queries) to gather sources for coordinates and facts, then synthesize a verified answer.
-- Cross-check at least two independent sources before stating specific names/dates/numbers.
-- If sources disagree, prefer institutionally reliable sources and indicate uncertainty by using ranges or roles instead of invented specifics.
-
-THE ATLAS OBSCURA METHOD - Follow these steps precisely:
-
-Step 1: PRECISE LOCATION ANALYSIS
-- Identify exact coordinates: what building, street corner, or specific spot is here?
-- CRITICAL: Verify you're in the correct city based on coordinates:
-  * ~48.8°N, 2.3°E = Paris
-  * ~55.7°N, 37.6°E = Moscow
-  * ~59.9°N, 30.3°E = St. Petersburg
-  * ~51.5°N, -0.1°E = London
-  * ~40.7°N, -74.0°E = New York
-- Note the immediate surroundings: what's visible within 50-100 meters?
-- Identify the neighborhood and its historical character
-- NEVER mention places from a different city than where the coordinates are
-- FACT-CHECK: Verify this location exists at these coordinates before proceeding
-
-Step 2: DEEP RESEARCH FOR THE UNEXPECTED (WITH FACT VERIFICATION)
-Search for facts in this priority order:
-   A) The specific building/location at these coordinates:
-      - Former unexpected uses (morgue→nightclub, palace→parking lot)
-      - Hidden architectural features (secret rooms, disguised elements)
-      - Specific incidents that happened here (crimes, meetings, discoveries)
-      - Famous residents/visitors and what they did here specifically
-
-   B) If nothing at exact spot, expand to immediate vicinity:
-      - Underground features (tunnels, rivers, old foundations)
-      - Lost buildings that once stood here and why they matter
-      - Street name origins that reveal forgotten history
-      - Architectural details visible from this spot with stories
-
-   C) If still nothing specific, the broader area's secrets:
-      - Neighborhood transformation stories
-      - Local legends tied to specific features
-      - Hidden infrastructure or urban planning secrets
-
-CRITICAL VERIFICATION FOR EACH FACT (WITH ONLINE SOURCES / web_search WHEN AVAILABLE):
-□ Is the DATE correct? (Buildings from 1878 expo ≠ 1889, Soviet era ≠ 1917)
-□ Is the ATTRIBUTION correct? (Not every metal structure = Eiffel)
-□ Are NUMBERS exact? (29 not "about 30", verify counts from sources)
-□ Is this DOCUMENTED or LEGEND? (Distinguish real events from urban myths)
-□ Am I INVENTING details? (No imaginary plaques, marks, or features)
-□ Did I confirm these claims using reliable online sources (via web_search when available)?
-
-Step 3: FIND THE HUMAN ELEMENT (WITH VERIFIED FACTS)
-Every great Atlas Obscura story connects to people:
-   - WHO made this decision and WHY (architect's obsession, owner's fear, city planner's vision)
-     → Use documented names or roles ("the monastery's abbot" not "Abbot Fyodor")
-   - WHAT specific event happened here (the meeting, the accident, the discovery)
-     → Only mention events with historical documentation
-   - HOW this place affected specific people's lives
-     → Use verified accounts, not imagined scenarios
-   - WHEN exactly did the transformation/event occur
-     → Use exact dates only when certain; otherwise "in the 1920s" or "during the Soviet period"
-
-FACT-CHECKING RULE: If you can't verify a specific detail (name, date, event) via online sources, describe the general truth instead. Better to say "a local merchant" than invent "merchant Johnson"
-
-Step 4: IDENTIFY WHAT'S STILL VISIBLE (ONLY REAL FEATURES)
-Atlas Obscura readers want to know what they can see:
-   - Specific architectural details (the carved face, the blocked window, the odd cornerstone)
-     → But NOT invented details (imaginary plaques, marks that don't exist)
-   - Traces of former use (rail tracks in pavement, anchor points on walls)
-     → Verify these actually exist, don't assume or invent
-   - Deliberate markers (plaques, memorials, architectural choices)
-     → Only mention real, documented markers
-   - Accidental remnants (worn steps, patched walls, tree growth patterns)
-     → Describe only what's genuinely visible
-
-DESCRIBING COMPLEX HISTORICAL PROCESSES:
-- Government decisions: "after lengthy negotiations" not "the mayor decided"
-- Multi-year campaigns: "1972-1974 campaign" not "one day in 1973"
-- Multiple actors: "activists, press and politicians" not just "artists"
-- Legal complexity: "series of decisions at different levels" not one simple act
-- Avoid Hollywood dramatization of real events
-
-WRITING YOUR FACT (100-120 words):
-
-Structure: [Hook with surprising detail] → [Human story behind it] → [Why it matters] → [What to look for today]
-
-Example approach (showing fact-checking notes):
-"The elegant apartment building at [verify exact address] hides metal rings embedded in its basement walls - remnants from its decade as the city's exotic animal quarantine station [verify this historical use]. In [verify exact year, or use 'early 1920s'], smuggler [use documented name or 'a local smuggler'] was arrested here when his 'crate of textiles' turned out to contain three tiger cubs destined for private collections. The building's unusually thick walls and ventilation system [verify these features exist], designed for containing animal sounds and smells, now provide its residents with excellent sound insulation. Look for [describe only verifiable physical features] - [ensure visitors can actually see this]."
-
-Note: This is a template showing where to verify facts. Your actual response should contain only confirmed information.
-
-GOOD vs BAD EXAMPLES:
-❌ BAD: "G. Eiffel 1889 stamp visible on rivets" (inventing marks)
-✅ GOOD: "Iron structures from the 1878 Exhibition" (verified period)
-
-❌ BAD: "The mayor declared it an architectural phenomenon" (oversimplification)
-✅ GOOD: "After the 1972-74 campaign and decisions by multiple authorities" (accurate)
-
-❌ BAD: "30 pavilions" (rounded number)
-✅ GOOD: "29 workshops" (exact documented count)
-
-❌ BAD: "Artists barricaded the gates with easels" (dramatization)
-✅ GOOD: "Residents and activists organized protests" (documented fact)
-
-❌ BAD: "Lion mask on regard #22" (invented feature)
-✅ GOOD: "17th century aqueduct inspection chamber" (real purpose)
-
-CRITICAL WRITING RULES:
-• Start with the most surprising specific detail - never with general context
-• Include at least one proper name (person, business, or specific event) - BUT ONLY IF VERIFIED
-• Specify at least one exact date or time period - USE RANGES IF UNCERTAIN ("1920s" not "1923")
-• Describe one thing visitors can physically see or find - MUST BE ACTUALLY VISIBLE
-• Connect the past to the present - show transformation or continuity
-• Write conversationally but precisely - like telling a friend an amazing secret
-• Every sentence must add new information - no filler
-
-ACCURACY OVER DRAMA: A true but less dramatic fact is always better than an exciting but uncertain detail
-
-AVOIDING REPETITION:
-- If provided with previous facts, you MUST choose a completely different location or aspect
-- Never repeat the same building, street, or historical event mentioned before
-- When previous facts exist, expand your search radius or dig deeper for more obscure details
-- Each fact should feel like a completely new discovery
-
-COMMON FACT ERRORS TO AVOID:
-1. DATE CONFUSION: 1878 Expo ≠ 1889 Expo ≠ 1900 Expo. Each had different buildings
-2. FALSE ATTRIBUTION: Not every iron structure = Eiffel. Check actual architects/engineers
-3. INVENTED DETAILS: No imaginary plaques, marks, inscriptions, or "hidden signatures"
-4. NUMBER PRECISION: "29 workshops" not "about 30". Use exact documented numbers
-5. PROCESS OVERSIMPLIFICATION: Government decisions ≠ "mayor decided". Complex processes happened
-6. DRAMATIZATION: Real events don't need embellishment. "Protests" not "barricades of easels"
-7. FEATURE INVENTION: Don't create architectural details (lion heads, special marks) that don't exist
-
-SPECIAL RULES FOR TECHNICAL/ENGINEERING STRUCTURES:
-- Aqueduct "regards" are INSPECTION chambers, not fountains
-- Not every iron structure is by Eiffel - check actual engineers
-- Verify technical purposes: inspection ≠ water distribution
-- Don't invent decorative elements on utilitarian structures
-- Technical terms must be accurate: "regard" ≠ "fontaine" ≠ "borne"
-
-ABSOLUTE REQUIREMENTS:
-- Never invent facts - use only verifiable historical information
-- Never use generic descriptions like "this area" or "nearby" - be specific
-- Never start with obvious facts - lead with the surprise
-- Always explain WHY something is surprising or significant
-- Focus on the specific over the general
-- Include what can be seen/experienced today
-
-CRITICAL FACT-CHECKING REQUIREMENTS (WITH WEB SEARCH):
-- VERIFY DATES: Every date must be historically accurate. If uncertain about exact year, use "early 20th century" rather than guessing "1923"
-  → Common errors: Confusing World Expo years (1878≠1889≠1900), Revolution dates (February≠October 1917)
-- VERIFY NAMES: Use real historical figures and businesses. If unsure of a specific name, describe the role instead ("a local architect" not "architect Smith")
-  → NEVER attribute famous names without proof (not everything metal = Eiffel)
-- VERIFY DETAILS: Building features, historical events, and transformations must be documented facts
-  → NO invented plaques, inscriptions, marks, or hidden signatures
-  → NO imaginary architectural features (lion heads, secret symbols)
-- CROSS-CHECK GEOGRAPHY: Ensure the location you're describing is actually at these coordinates
-  → Buildings can't be from two places at once
-- NO EMBELLISHMENT: If a detail sounds too perfect or dramatic, verify it exists
-  → Real protests ≠ "barricades of easels", real events ≠ "24 hours on roofs"
-- UNCERTAIN = OMIT: When in doubt about a specific detail, focus on what you know is true
-- DISTINGUISH LEGEND FROM FACT: Urban myths can be mentioned but must be labeled as such
-
-FACT VERIFICATION CHECKLIST:
-□ Is this building/location really at these exact coordinates?
-□ Did this event actually happen on this date? (Not confusing years/expos/eras?)
-□ Is this person's name and role correct? (Not falsely attributing to famous figures?)
-□ Are the architectural/physical details accurate? (Not inventing marks/plaques/features?)
-□ Can visitors really see what I'm describing today? (Is it actually visible, not imagined?)
-□ Are my numbers precise? (Exact count, not rounded?)
-□ Is this documented history or urban legend? (Label legends as such)
-
-CRITICAL FOR SEARCH FIELD:
-The Search field is used for GEOCODING (finding coordinates) via Nominatim/OpenStreetMap.
-You MUST format it for optimal geocoding results:
-- Use commas to separate components: "Place Name, Street, City"
-- Include the full city name at the end
-- Avoid descriptive adjectives ("former", "old", "historical")
-- Use official place names, not colloquial ones
-- For buildings: "Building Name, Street Number Street Name, City"
-- For areas: "Landmark Name, District, City"
-- NEVER truncate - always provide full location context
-
-Remember: Atlas Obscura readers already know the obvious history. They want the specific detail that changes how they see a place forever.
-Verify online before finalizing.
-
-LANGUAGE REQUIREMENTS:
-Write your response in {user_language}.
-{language_instructions}"""
-            else:
-                # Atlas Obscura-style prompt for static locations (GPT-4.1)
-                system_prompt = f"""You are writing a quick location fact for Atlas Obscura. Find the single most surprising detail about this exact location.
-
-IMPORTANT: You must respond entirely in {user_language}. All your analysis and final answer must be in {user_language}.
-
-MANDATORY ONLINE VERIFICATION:
-- You MUST verify exact coordinates and factual details (names, dates, numbers) using reliable web sources.
-- Cross-check at least two sources. If uncertain, generalize instead of inventing specifics.
-
-RAPID ATLAS OBSCURA SEARCH (for quick facts):
-
-1. IMMEDIATE SCAN - What's here?
-   - Exact building or location at coordinates
-   - Most unexpected historical use or transformation
-   - Specific incident that would surprise people
-   - Hidden feature still visible today
-
-2. FIND THE SURPRISE - Priority order:
-   A) Unexpected transformation (church→factory→nightclub)
-   B) Specific historical incident (the duel, the escape, the discovery)
-   C) Hidden architectural feature (the sealed door, the false window)
-   D) Connection to unexpected person/event
-   E) Local legend with factual basis
-
-3. ESSENTIAL ELEMENTS for Atlas Obscura:
-   - One specific surprising detail (not general history) - MUST BE VERIFIED
-   - At least one date or person's name - EXACT IF CERTAIN, APPROXIMATE IF NOT
-   - The "I never knew that!" factor - BASED ON TRUE FACTS
-   - Something visitors can see or find today - PHYSICALLY VERIFIABLE
-
-WRITING FORMAT (60-80 words):
-
-Structure: [Surprising fact] → [Quick context] → [What remains visible]
-
-Example (with fact-checking approach):
-"The ornate bank building here conceals [city]'s last remaining piece of the medieval city wall in its vault - discovered [in the late 20th century / in 1987 if verified] when [renovation work / a specific incident if documented] revealed unexpectedly old stonework. The [medieval / 14th-century if verified] fortification was incorporated into the bank's [current structure / security system if true]. Look for [only describe what visitors can actually see] near the entrance."
-
-Remember: Include only details you can verify using online sources. General truths are better than specific falsehoods.
-
-QUALITY SELECTION:
-- Internally generate 2–3 candidate facts and pick the most surprising, specific, and verifiable one.
-- Do NOT mention discarded options; output only the final chosen fact.
-
-OUTPUT FORMAT (use user's language for labels):
-- Main fact text MUST NOT include URLs or raw domains in parentheses.
-- At the end add a new section titled 'Источники' if writing in Russian, or 'Sources' otherwise.
-- List 2–3 bullet points in the form “Concise title — URL”. Prefer canonical, clean links (remove tracking params).
-
-QUICK WRITING RULES:
-• Lead with the surprise - never with "This building is..."
-• Include one specific name, date, or measurement
-• Explain what can be seen/found today
-• Make every word count - no filler phrases
-• Focus on the unexpected, not the obvious
-
-AVOIDING REPETITION:
-- If given previous facts, find a completely different location or building nearby
-- Never repeat the same place, person, or event from previous facts
-- When previous facts exist, look for more obscure or hidden details
-
-REQUIREMENTS:
-- Only verified facts - no speculation
-- Be specific about location - not "this area"
-- Always include the "what to look for" element
-- Never start with boring context
-
-QUICK FACT VERIFICATION:
-- Double-check: Is this place really at these coordinates?
-- Verify: Are names, dates, and details documented?
-- Confirm: Can visitors actually see what you describe?
-- If uncertain about a detail, describe what you're sure of instead
-
-Write in {user_language} - crisp, factual, surprising. Verify online before finalizing.
-{language_instructions}"""
-
-            # Handle previous facts for both live and static locations
-            previous_facts_text = ""
-            previous_facts_instruction = ""
-            if previous_facts:
-                previous_facts_text = "\n".join(
-                    [f"- {fact}" for fact in previous_facts[-5:]]
-                )
-                previous_facts_instruction = "CRITICAL: Find a DIFFERENT place near these coordinates. Do NOT repeat any of the already mentioned locations or facts above."
-
-            if is_live_location:
-                # Detailed prompt for live location (o4-mini/o3)
-                user_prompt = f"""Analyze these coordinates: {lat}, {lon}
-
-CRITICAL: These coordinates are the USER'S CURRENT LOCATION. Only mention places that are actually at or very near (within 500m) these exact coordinates. Do NOT mention famous landmarks from other parts of the city unless they are genuinely visible or directly relevant to this specific spot.
-
-{f'''PREVIOUS FACTS ALREADY MENTIONED:
-{previous_facts_text}
-
-{previous_facts_instruction}''' if previous_facts else ''}
-
-Follow the Atlas Obscura method above to find the most surprising fact about this exact location. If you have previous facts to avoid, dig deeper to find more obscure or specific information about different nearby places.
-
-Present your final answer in this format:
-<answer>
-Location: [Specific name of the place - street address, building name, or precise intersection]
-Search: [OPTIMIZED FOR NOMINATIM GEOCODING - Follow these rules:
-  - For specific buildings: "[Building Name], [Street Number] [Street Name], [City]"
-    Example: "Cité Fleurie, 65 Boulevard Arago, Paris"
-  - For landmarks: "[Landmark Name], [District/Area], [City]"
-    Example: "Prison de la Santé, 14th arrondissement, Paris"
-  - For metro stations: "[Station Name] metro station, [City]"
-    Example: "Denfert-Rochereau metro station, Paris"
-  - ALWAYS include the city name at the end
-  - Use commas to separate location components
-  - Avoid descriptive words like "former", "old", "historical" that Nominatim ignores
-  - For addresses, use format: "[Number] [Street Name], [City]"
-  - Never truncate to just 2-3 words - include full location context]
-Interesting fact: [Your Atlas Obscura-style fact about THIS EXACT LOCATION. Follow the structure: Surprising opening → Human story → Why it matters → What to see today. Must be 100-120 words, include specific names and dates, and focus on the unexpected.]
-</answer>
-
-Remember: Start with the surprise, not the context. Include specific details. Tell visitors what they can find. Write only the content within <answer> tags.
-
-FINAL FACT-CHECK BEFORE SUBMITTING:
-□ Have I verified this location exists at these coordinates?
-□ Are all dates either exact (if certain) or approximate (if uncertain)?
-□ Are all names real people/places or described by role if uncertain?
-□ Can visitors actually see/find what I describe?
-□ Have I avoided inventing dramatic details for effect?
-□ Is every fact in my response verifiable?
-
-If any answer is "no", revise to include only verified information."""
-            else:
-                # Concise prompt for static location (gpt-4.1)
-                user_prompt = f"""Here are the coordinates to analyze:
-<coordinates>
-Latitude: {lat}
-Longitude: {lon}
-</coordinates>
+    async def get_nearby_fact(
+        self,
+        lat: float,
+        lon: float,
+        is_live_location: bool = False,
+        previous_facts: Iterable[str] | None = None,
+        user_id: int = None,
+        force_reasoning_none: bool = False,
+    ) -> str:
+        """Get an interesting fact about a location.
 
-{f'''PREVIOUS FACTS ALREADY MENTIONED:
-{previous_facts_text}
+        Waits for the complete answer; use stream_nearby_fact to receive text
+        deltas as they are generated (e.g. to show progress in Telegram).
 
-{previous_facts_instruction}''' if previous_facts else ''}
+        Identical concurrent requests (same rounded coordinates, mode, user and
+        history) share one API call instead of each starting their own.
 
-Apply the rapid Atlas Obscura search method above to find a surprising fact. If you have previous facts to avoid, choose a completely different nearby location or dig deeper for more obscure details.
+        Args:
+            lat: Latitude coordinate
+            lon: Longitude coordinate
+            is_live_location: If True, ask for a detailed live-location fact (and
+                allow request hedging). Both modes use GPT-5.1 Responses.
+            previous_facts: Previously sent facts to avoid repetition; only the last
+                _MAX_PREVIOUS_FACTS are used, so long sessions can pass a
+                deque(maxlen=_MAX_PREVIOUS_FACTS) to keep their history bounded
+            user_id: User ID to check premium status
+            force_reasoning_none: If True, force reasoning=none for fast first fact
 
-Format your answer:
-<answer>
-Location: [Exact place name - specific building or location, not "area near" or "district of"]
-Search: [NOMINATIM-OPTIMIZED: Use format "[Place Name], [Street/District], [City]" with commas. Examples: "Tour Eiffel, Champ de Mars, Paris" or "Эрмитаж, Дворцовая площадь, Санкт-Петербург". Avoid adjectives, use official names, always include city]
-Interesting fact: [Your 60-80 word Atlas Obscura fact with this structure: Surprising detail → Quick context with specific date/name → What visitors can see today. Must surprise locals.]
-</answer>
+        Returns:
+            A location name and an interesting fact about it
 
-Critical: Lead with the surprise. Include one specific date or name. Tell what's visible today. Only content within <answer> tags.
+        Raises:
+            Exception: If OpenAI API call fails
+        """
+        previous_facts = deque(previous_facts or (), maxlen=_MAX_PREVIOUS_FACTS)
+        key = (
+            round(lat, 4),
+            round(lon, 4),
+            is_live_location,
+            user_id,
+            force_reasoning_none,
+            tuple(previous_facts),
+        )
+        return await self._coalesce_fact_request(
+            key,
+            lambda: self._generate_nearby_fact(
+                lat,
+                lon,
+                is_live_location,
+                previous_facts,
+                user_id,
+                force_reasoning_none,
+            ),
+        )
 
-QUICK FACT-CHECK:
-□ Is this location verified at these coordinates?
-□ Are dates/names real or appropriately generalized? (Not confusing expos/eras?)
-□ Can visitors see what I describe? (Not inventing marks/features?)
-□ Have I avoided fictional embellishments? (No dramatic barricades/rooftop vigils?)
-□ Are my numbers exact from sources? (Not rounded?)
-□ Have I distinguished documented facts from legends?
+    async def _generate_nearby_fact(
+        self,
+        lat: float,
+        lon: float,
+        is_live_location: bool,
+        previous_facts: deque[str],
+        user_id: int | None,
+        force_reasoning_none: bool,
+    ) -> str:
+        """Generate a fact for get_nearby_fact (see there for the arguments)."""
+        try:
+            user_language = await self._get_user_language(user_id)
 
-Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel attributions, invented plaques/marks, dramatized protests, oversimplified decisions."""
+            # Special instructions for Russian language quality
+            language_instructions = self._get_language_instructions(user_language)
 
-            # Override with structured, de-duplicated prompts (keeps rich guidance and Sources section)
+            # Structured, de-duplicated prompts (keeps rich guidance and Sources section)
             system_prompt, user_prompt = self._build_location_fact_prompt(
                 lat=lat,
                 lon=lon,
@@ -810,139 +734,229 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
             logger.error(f"Failed to generate fact for {lat},{lon}: {e}")
             raise
 
-    async def _get_with_gpt5_responses(
+    async def stream_nearby_fact(
         self,
-        system_prompt: str,
-        user_prompt: str,
-        is_live: bool,
+        lat: float,
+        lon: float,
+        is_live_location: bool = False,
+        previous_facts: Iterable[str] | None = None,
         user_id: int | None = None,
         force_reasoning_none: bool = False,
-    ) -> str | None:
-        """Attempt to use GPT-5.1 Responses API with built-in web_search tool.
+    ) -> AsyncIterator[str]:
+        """Stream an interesting fact about a location as it is generated.
+
+        Uses the same prompts and model selection as get_nearby_fact, but yields
+        text deltas so the caller can show partial output (e.g. by editing a
+        Telegram message). Unlike get_nearby_fact, no NO_POI_FOUND retry is made.
 
         Args:
-            force_reasoning_none: If True, force reasoning=none regardless of user settings
+            lat: Latitude coordinate
+            lon: Longitude coordinate
+            is_live_location: Whether the prompt is for a live location
+            previous_facts: Previously sent facts to avoid repetition (last
+                _MAX_PREVIOUS_FACTS are used)
+            user_id: User ID to resolve language, model and reasoning level
+            force_reasoning_none: If True, force reasoning=none for fast first fact
 
-        Returns text content or None on failure.
+        Yields:
+            Chunks of the answer text
         """
-        try:
-            # Build inputs in Responses API format
-            gpt5_system_prompt = (
-                system_prompt
-                + "\n\nTOOLS AVAILABLE:\n"
-                + "- web_search: Built-in search tool. Use it immediately without asking for permission. Run at least two distinct queries (coordinates + facts). Do not print raw tool output; synthesize a verified answer with Sources.\n"
-                + "\nPOLICY:\n- Do not ask the user for approval to use tools. If a tool is available and needed, call it.\n"
-                + "- NEVER write about the coordinate itself being unnamed/empty - always find a real place/building/monument\n"
-                + "- NEVER mention technical tools like Nominatim, Overpass, reverse geocoding in your response\n"
-                + "- If the exact coordinates have no POI, immediately expand search to find the nearest interesting location\n"
-                + "- NEVER apologize or explain difficulties. You are a fact writer, not a search assistant.\n"
-                + "- FORBIDDEN: 'Извините', 'не удалось', 'временно недоступен', 'могу проверить', 'нужна проверка'\n"
-                + "- If you cannot produce a fact, return ONLY '[[NO_POI_FOUND]]' - no explanations.\n"
-            )
-            messages = [
-                {
-                    "role": "system",
-                    "content": [{"type": "input_text", "text": gpt5_system_prompt}],
-                },
-                {
-                    "role": "user",
-                    "content": [{"type": "input_text", "text": user_prompt}],
-                },
-            ]
-            tools = [{"type": "web_search"}]
-
-            # Resolve per-user reasoning (default none for speed)
-            # SPECIAL: First fact always uses reasoning=none for instant response
-            if force_reasoning_none:
-                reasoning_level = "none"
-                logger.info("First fact: forcing reasoning=none for speed")
-            else:
-                reasoning_level = "none"
-                try:
-                    if user_id:
-                        from .async_donors_wrapper import get_async_donors_db
+        user_language = await self._get_user_language(user_id)
+        system_prompt, user_prompt = self._build_location_fact_prompt(
+            lat=lat,
+            lon=lon,
+            is_live_location=is_live_location,
+            user_language=user_language,
+            previous_facts=deque(previous_facts or (), maxlen=_MAX_PREVIOUS_FACTS),
+            language_instructions=self._get_language_instructions(user_language),
+        )
+        request_kwargs = await self._build_responses_request(
+            system_prompt, user_prompt, user_id, force_reasoning_none
+        )
 
-                        db = await get_async_donors_db()
-                        reasoning_level = (
-                            await db.get_user_reasoning(user_id)
-                        ) or "none"
-                except Exception:
-                    reasoning_level = "none"
-
-            # Map our levels to API levels
-            # GPT-5.1 supports: none, low, medium, high
-            level_map = {
-                "none": "none",  # No reasoning (fast, low-latency)
-                "minimal": "low",  # Legacy: minimal → low for compatibility
-                "low": "low",
-                "medium": "medium",
-                "high": "high",
-            }
-            api_effort = level_map.get(reasoning_level or "medium", "medium")
+        logger.info(
+            f"GPT-5.1 Responses: streaming request (model={request_kwargs['model']})"
+        )
+        # The semaphore bounds opening the stream only, so a slow consumer does
+        # not hold a slot; the stream is closed even if the consumer stops early
+        async with self._api_semaphore:
+            stream = await self.client.responses.create(**request_kwargs, stream=True)
+        async with stream:
+            async for event in stream:
+                if event.type == "response.output_text.delta":
+                    yield event.delta
+                elif event.type == "response.completed":
+                    usage = getattr(event.response, "usage", None)
+                    if usage:
+                        logger.info(
+                            f"GPT-5.1 Responses: stream completed (input_tokens={usage.input_tokens}, output_tokens={usage.output_tokens})"
+                        )
 
-            # For "none" reasoning, don't pass reasoning parameter at all (per API docs)
-            if api_effort == "none":
-                reasoning = None
-                logger.info(
-                    "GPT-5.1 Responses: using reasoning=none (no reasoning parameter)"
-                )
-            else:
-                reasoning = {"effort": api_effort}
+    async def _build_responses_request(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        user_id: int | None = None,
+        force_reasoning_none: bool = False,
+    ) -> dict:
+        """Build Responses API kwargs (web_search tool, per-user model/reasoning)."""
+        # Build inputs in Responses API format
+        messages = [
+            _responses_system_message(system_prompt),
+            {
+                "role": "user",
+                "content": [{"type": "input_text", "text": user_prompt}],
+            },
+        ]
+        tools = [{"type": "web_search"}]
 
-            # Fetch per-user model if available (default: gpt-5.1)
-            user_model = "gpt-5.1"
+        # Resolve per-user reasoning (default none for speed)
+        # SPECIAL: First fact always uses reasoning=none for instant response
+        if force_reasoning_none:
+            reasoning_level = "none"
+            logger.info("First fact: forcing reasoning=none for speed")
+        else:
+            reasoning_level = "none"
             try:
                 if user_id:
                     from .async_donors_wrapper import get_async_donors_db
 
                     db = await get_async_donors_db()
-                    user_model = (await db.get_user_model(user_id)) or "gpt-5.1"
+                    reasoning_level = (await db.get_user_reasoning(user_id)) or "none"
             except Exception:
-                user_model = "gpt-5.1"
+                reasoning_level = "none"
 
-            # Hosted web_search should use tool_choice="auto" per API guidance
-            forced_tool_choice = "auto"
+        # Map our levels to API levels
+        # GPT-5.1 supports: none, low, medium, high
+        level_map = {
+            "none": "none",  # No reasoning (fast, low-latency)
+            "minimal": "low",  # Legacy: minimal → low for compatibility
+            "low": "low",
+            "medium": "medium",
+            "high": "high",
+        }
+        api_effort = level_map.get(reasoning_level or "medium", "medium")
 
+        # For "none" reasoning, don't pass reasoning parameter at all (per API docs)
+        if api_effort == "none":
+            reasoning = None
             logger.info(
-                f"GPT-5.1 Responses: sending request (model={user_model}, reasoning={api_effort if reasoning else 'none'}, tool_choice=auto)"
+                "GPT-5.1 Responses: using reasoning=none (no reasoning parameter)"
             )
+        else:
+            reasoning = {"effort": api_effort}
 
-            # Build request kwargs
-            request_kwargs = {
-                "model": user_model,
-                "input": messages,
-                "tools": tools,
-                "tool_choice": forced_tool_choice,
-            }
+        # Fetch per-user model if available (default: gpt-5.1)
+        user_model = "gpt-5.1"
+        try:
+            if user_id:
+                from .async_donors_wrapper import get_async_donors_db
+
+                db = await get_async_donors_db()
+                user_model = (await db.get_user_model(user_id)) or "gpt-5.1"
+        except Exception:
+            user_model = "gpt-5.1"
+
+        # Hosted web_search should use tool_choice="auto" per API guidance
+        forced_tool_choice = "auto"
+
+        # Build request kwargs
+        request_kwargs = {
+            "model": user_model,
+            "input": messages,
+            "tools": tools,
+            "tool_choice": forced_tool_choice,
+            "max_output_tokens": _MAX_OUTPUT_TOKENS,
+        }
 
-            # Only add reasoning parameter if not None
-            if reasoning is not None:
-                request_kwargs["reasoning"] = reasoning
+        # Only add reasoning parameter if not None
+        if reasoning is not None:
+            request_kwargs["reasoning"] = reasoning
 
-            async with self._api_semaphore:
-                response = await self.client.responses.create(**request_kwargs)
+        return request_kwargs
+
+    async def _get_with_gpt5_responses(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        is_live: bool,
+        user_id: int | None = None,
+        force_reasoning_none: bool = False,
+    ) -> str | None:
+        """Attempt to use GPT-5.1 Responses API with built-in web_search tool.
+
+        Args:
+            force_reasoning_none: If True, force reasoning=none regardless of user settings
+
+        Returns text content or None on failure.
+        """
+        try:
+            request_kwargs = await self._build_responses_request(
+                system_prompt, user_prompt, user_id, force_reasoning_none
+            )
+            messages = request_kwargs["input"]
+            tools = request_kwargs["tools"]
+            reasoning = request_kwargs.get("reasoning")
+            user_model = request_kwargs["model"]
 
-            # Debug: log response structure to understand format
             logger.info(
-                f"GPT-5.1 Responses: received response type={type(response).__name__}"
+                f"GPT-5.1 Responses: sending request (model={user_model}, reasoning={reasoning['effort'] if reasoning else 'none'}, tool_choice=auto)"
             )
 
-            # Log all available attributes (non-private)
-            attrs = [attr for attr in dir(response) if not attr.startswith("_")]
-            logger.info(f"GPT-5.1 Responses: available attributes={attrs}")
+            if self._hedge_requests and is_live and user_model != "gpt-5.1":
+                # Speculatively fire the gpt-5.1 fallback alongside the user's model
+                response = await self._race_responses(
+                    request_kwargs, {**request_kwargs, "model": "gpt-5.1"}
+                )
+            else:
+                response = await self._create_response(request_kwargs)
 
-            # Try to log response as dict if possible
-            try:
-                if hasattr(response, "model_dump"):
-                    dump = response.model_dump()
-                    logger.info(
-                        f"GPT-5.1 Responses: model_dump keys={list(dump.keys())}"
+            if _hit_output_cap(response):
+                # Reasoning tokens count against the cap; retry once without
+                # them, and never hand a half-written fact to the user
+                if "reasoning" not in request_kwargs:
+                    logger.warning(
+                        f"GPT-5.1 Responses: output truncated at {_MAX_OUTPUT_TOKENS} tokens"
                     )
-                elif hasattr(response, "dict"):
-                    dump = response.dict()
-                    logger.info(f"GPT-5.1 Responses: dict keys={list(dump.keys())}")
-            except Exception as e:
-                logger.debug(f"Could not dump response: {e}")
+                    return None
+                logger.warning(
+                    f"GPT-5.1 Responses: output truncated at {_MAX_OUTPUT_TOKENS} tokens, retrying without reasoning"
+                )
+                request_kwargs = {
+                    k: v for k, v in request_kwargs.items() if k != "reasoning"
+                }
+                reasoning = None
+                response = await self._create_response(request_kwargs)
+                if _hit_output_cap(response):
+                    logger.warning(
+                        "GPT-5.1 Responses: output still truncated without reasoning"
+                    )
+                    return None
+
+            # Debug: log response structure to understand format. Walking dir() and
+            # model_dump() is costly, so only do it when DEBUG is actually enabled.
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "GPT-5.1 Responses: received response type=%s",
+                    type(response).__name__,
+                )
+                attrs = [attr for attr in dir(response) if not attr.startswith("_")]
+                logger.debug("GPT-5.1 Responses: available attributes=%s", attrs)
+
+                # Try to log response as dict if possible
+                try:
+                    if hasattr(response, "model_dump"):
+                        dump = response.model_dump()
+                        logger.debug(
+                            "GPT-5.1 Responses: model_dump keys=%s", list(dump.keys())
+                        )
+                    elif hasattr(response, "dict"):
+                        dump = response.dict()
+                        logger.debug(
+                            "GPT-5.1 Responses: dict keys=%s", list(dump.keys())
+                        )
+                except Exception as e:
+                    logger.debug(f"Could not dump response: {e}")
 
             # Try multiple ways to extract content from new SDK format
             content = None
@@ -1150,6 +1164,51 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
             # Surface upstream for caller to decide on fallback
             raise
 
+    async def _create_response(self, request_kwargs: dict):
+        """Send a single Responses API request under the API semaphore."""
+        async with self._api_semaphore:
+            return await self.client.responses.create(**request_kwargs)
+
+    async def _race_responses(self, primary_kwargs: dict, backup_kwargs: dict):
+        """Run two Responses API requests concurrently, keep the first usable one.
+
+        A response is usable when it has non-empty output_text; the other request
+        is cancelled as soon as one is found. If neither qualifies, the primary
+        response (or its exception) is surfaced so the regular parsing and retry
+        logic still applies.
+
+        Args:
+            primary_kwargs: Request for the preferred (user-selected) model
+            backup_kwargs: Request for the fallback model
+
+        Returns:
+            Responses API response object
+        """
+        primary = asyncio.create_task(self._create_response(primary_kwargs))
+        backup = asyncio.create_task(self._create_response(backup_kwargs))
+        pending = {primary, backup}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None and getattr(
+                        task.result(), "output_text", None
+                    ):
+                        chosen = primary_kwargs if task is primary else backup_kwargs
+                        logger.info(
+                            f"GPT-5.1 Responses: hedged race won by {chosen['model']}"
+                        )
+                        return task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if primary.exception() is None:
+            return primary.result()
+        return backup.result()
+
     async def get_precise_coordinates(
         self, place_name: str, area_description: str
     ) -> tuple[float, float] | None:
@@ -1172,7 +1231,38 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
             logger.error(f"Failed to get precise coordinates for {place_name}: {e}")
             return None
 
-    async def get_coordinates_from_nominatim(
+    async def _fetch_nominatim(
+        self, session: aiohttp.ClientSession, params: dict
+    ) -> list[dict] | None:
+        """Run one Nominatim search, retrying transient network errors.
+
+        Args:
+            session: Shared aiohttp session
+            params: Nominatim query parameters
+
+        Returns:
+            Parsed JSON results on HTTP 200, None otherwise
+        """
+        for attempt in range(_NOMINATIM_ATTEMPTS):
+            try:
+                async with session.get(
+                    _NOMINATIM_URL,
+                    params=params,
+                    headers=_NOMINATIM_HEADERS,
+                    timeout=_NOMINATIM_TIMEOUT,
+                ) as response:
+                    if response.status != 200:
+                        return None
+                    return await response.json()
+            except (TimeoutError, aiohttp.ClientError) as e:
+                if attempt == _NOMINATIM_ATTEMPTS - 1:
+                    raise
+                delay = min(0.25 * 2**attempt, 1.0)
+                logger.debug(f"Nominatim request failed ({e}), retrying in {delay}s")
+                await asyncio.sleep(delay)
+        return None
+
+    async def _fetch_nominatim_coordinates(
         self, place_name: str, user_lat: float = None, user_lon: float = None
     ) -> tuple[float, float] | None:
         """Get coordinates using OpenStreetMap Nominatim service.
@@ -1189,12 +1279,7 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
         search_strategies = []
 
         # Base parameters for all strategies
-        base_params = {
-            "format": "json",
-            "limit": 5,  # Get more results to choose from
-            "addressdetails": 1,
-            "namedetails": 1,
-        }
+        base_params = dict(_NOMINATIM_BASE_PARAMS)
 
         # Add viewbox if user coordinates are provided to prioritize nearby results
         if user_lat is not None and user_lon is not None:
@@ -1211,7 +1296,6 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
             {
                 **base_params,
                 "q": place_name,
-                "extratags": 1,
                 "accept-language": "fr,en,ru",  # Multi-language support
             }
         )
@@ -1221,12 +1305,7 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
             parts = [p.strip() for p in place_name.split(",")]
             if len(parts) >= 2:
                 # For "Place, Street, City" format
-                structured_params = {
-                    "format": "json",
-                    "limit": 5,
-                    "addressdetails": 1,
-                    "namedetails": 1,
-                }
+                structured_params = dict(_NOMINATIM_BASE_PARAMS)
 
                 # Detect what each part might be
                 if len(parts) == 3:  # Place, Street, City
@@ -1256,9 +1335,7 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
                 street_parts = rest.split(",")
                 search_strategies.append(
                     {
-                        "format": "json",
-                        "limit": 5,
-                        "addressdetails": 1,
+                        **_NOMINATIM_BASE_PARAMS,
                         "street": f"{number} {street_parts[0].strip()}",
                         "city": (
                             street_parts[-1].strip()
@@ -1268,85 +1345,61 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
                     }
                 )
 
-        url = "https://nominatim.openstreetmap.org/search"
-        headers = {"User-Agent": "BotVoyage/1.0 (Educational Project)"}
+        # City hints used to score results, computed once for all strategies
+        place_lower = place_name.lower()
+        expects_paris = "paris" in place_lower
+        expects_moscow = "москва" in place_lower
 
-        # Try each strategy
-        async with aiohttp.ClientSession() as session:
-            for i, params in enumerate(search_strategies):
-                try:
-                    logger.debug(
-                        f"Trying Nominatim strategy {i+1}/{len(search_strategies)} for: {place_name}"
-                    )
-                    logger.debug(f"Parameters: {params}")
-
-                    async with session.get(
-                        url, params=params, headers=headers, timeout=5
-                    ) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            if data:
-                                # Try to find best match from results
-                                best_result = None
-                                best_score = -1
-
-                                for result in data:
-                                    score = 0
-                                    result_type = result.get("type", "")
-                                    result.get("class", "")
-
-                                    # Prefer certain types
-                                    if result_type in [
-                                        "building",
-                                        "house",
-                                        "amenity",
-                                        "historic",
-                                    ]:
-                                        score += 3
-                                    elif result_type in ["street", "road"]:
-                                        score += 2
-                                    elif result_type in ["suburb", "neighbourhood"]:
-                                        score += 1
-
-                                    # Check if result is in expected city
-                                    display_name = result.get(
-                                        "display_name", ""
-                                    ).lower()
-                                    if (
-                                        "paris" in place_name.lower()
-                                        and "paris" in display_name
-                                    ):
-                                        score += 5
-                                    elif (
-                                        "москва" in place_name.lower()
-                                        and "москва" in display_name
-                                    ):
-                                        score += 5
-
-                                    # Prefer results with better importance score
-                                    importance = result.get("importance", 0)
-                                    score += importance
-
-                                    if score > best_score:
-                                        best_score = score
-                                        best_result = result
-
-                                if best_result:
-                                    lat = float(best_result["lat"])
-                                    lon = float(best_result["lon"])
-
-                                    if -90 <= lat <= 90 and -180 <= lon <= 180:
-                                        logger.info(
-                                            f"Found Nominatim coordinates for '{place_name}': {lat}, {lon}"
-                                        )
-                                        logger.debug(
-                                            f"Best result: {best_result.get('display_name')}"
-                                        )
-                                        return lat, lon
+        # Try each strategy over the shared keep-alive session
+        session = await self._get_http_session()
+        for i, params in enumerate(search_strategies):
+            try:
+                logger.debug(
+                    f"Trying Nominatim strategy {i+1}/{len(search_strategies)} for: {place_name}"
+                )
+                logger.debug(f"Parameters: {params}")
+
+                data = await self._fetch_nominatim(session, params)
+                if data:
+                    # Try to find best match from results
+                    best_result = None
+                    best_score = -1
+
+                    for result in data:
+                        # Prefer certain types
+                        score = NOMINATIM_TYPE_SCORES.get(result.get("type", ""), 0)
+
+                        # Check if result is in expected city
+                        display_name = result.get("display_name", "").lower()
+                        if (expects_paris and "paris" in display_name) or (
+                            expects_moscow and "москва" in display_name
+                        ):
+                            score += 5
+
+                        # Prefer results with better importance score
+                        importance = result.get("importance", 0)
+                        score += importance
+
+                        if score > best_score:
+                            best_score = score
+                            best_result = result
+
+                    if best_result:
+                        lat = float(best_result["lat"])
+                        lon = float(best_result["lon"])
+
+                        if -90 <= lat <= 90 and -180 <= lon <= 180:
+                            logger.info(
+                                f"Found Nominatim coordinates for '{place_name}': {lat}, {lon}"
+                            )
+                            logger.debug(
+                                f"Best result: {best_result.get('display_name')}"
+                            )
+                            return lat, lon
 
-                except Exception as e:
-                    logger.debug(f"Strategy {i+1} failed: {e}")
-                    continue
+            except Exception as e:
+                logger.debug(f"Strategy {i+1} failed: {e}")
+                continue
 
         logger.debug(f"No coordinates found in Nominatim for: {place_name}")
         return None
@@ -1380,37 +1433,18 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
         Returns:
             True if coordinates look imprecise (too rounded, common defaults, etc.)
         """
-        # Convert to strings to check decimal places
-        lat_str = str(lat)
-        lon_str = str(lon)
-
-        # Check for overly rounded coordinates (less than 2 decimal places)
-        lat_decimals = len(lat_str.split(".")[-1]) if "." in lat_str else 0
-        lon_decimals = len(lon_str.split(".")[-1]) if "." in lon_str else 0
-
-        if lat_decimals < 2 or lon_decimals < 2:
-            logger.debug(
-                f"Coordinates have too few decimal places: {lat} ({lat_decimals}), {lon} ({lon_decimals})"
-            )
-            return True
-
-        # Check for suspicious round numbers (often means city center, not specific landmark)
-        if lat == round(lat, 1) and lon == round(lon, 1):
-            logger.debug(f"Coordinates are suspiciously round: {lat}, {lon}")
+        # Check for overly rounded coordinates (less than 2 decimal places).
+        # A float equals round(x, 1) exactly when its repr has at most 1 decimal,
+        # so no string conversion is needed. This also covers the "suspiciously
+        # round" case (both values with 1 decimal, often a city center).
+        if lat == round(lat, 1) or lon == round(lon, 1):
+            logger.debug(f"Coordinates have too few decimal places: {lat}, {lon}")
             return True
 
         # Check for common default/placeholder coordinates
-        suspicious_patterns = [
-            (0.0, 0.0),  # Null Island
-            (55.7558, 37.6173),  # Generic Moscow center
-            (55.75, 37.62),  # Rounded Moscow
-            (59.9311, 30.3609),  # Generic SPb center
-        ]
-
-        for sus_lat, sus_lon in suspicious_patterns:
-            if abs(lat - sus_lat) < 0.01 and abs(lon - sus_lon) < 0.01:
-                logger.debug(f"Coordinates match suspicious pattern: {lat}, {lon}")
-                return True
+        if (round(lat, 2), round(lon, 2)) in _SUSPICIOUS_COORDS:
+            logger.debug(f"Coordinates match suspicious pattern: {lat}, {lon}")
+            return True
 
         return False
 
@@ -1430,73 +1464,39 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
         lat2, lon2 = coords2
 
         # Compare decimal places (more decimal places = more precise)
-        lat1_decimals = len(str(lat1).split(".")[-1]) if "." in str(lat1) else 0
-        lon1_decimals = len(str(lon1).split(".")[-1]) if "." in str(lon1) else 0
-        lat2_decimals = len(str(lat2).split(".")[-1]) if "." in str(lat2) else 0
-        lon2_decimals = len(str(lon2).split(".")[-1]) if "." in str(lon2) else 0
-
-        coords1_precision = lat1_decimals + lon1_decimals
-        coords2_precision = lat2_decimals + lon2_decimals
+        coords1_precision = _decimal_places(lat1) + _decimal_places(lon1)
+        coords2_precision = _decimal_places(lat2) + _decimal_places(lon2)
 
         return coords1_precision > coords2_precision
 
-    async def get_coordinates_from_search_keywords(
-        self, search_keywords: str, user_lat: float = None, user_lon: float = None
-    ) -> tuple[float, float] | None:
-        """Get coordinates using search keywords via Nominatim.
-
-        Args:
-            search_keywords: Search keywords from GPT response
-            user_lat: User's current latitude for validation
-            user_lon: User's current longitude for validation
-
-        Returns:
-            Tuple of (latitude, longitude) if found, None otherwise
-        """
-        logger.info(f"Searching coordinates for keywords: {search_keywords}")
-
-        # Clean search keywords for better results
-        # Remove quotes and extra spaces
-        clean_keywords = search_keywords.replace('"', "").replace("'", "").strip()
-
-        # Extract city name from keywords for validation
-        city_name = None
-        common_cities = {
-            "Paris": (48.8566, 2.3522, 15),  # lat, lon, radius_km
-            "Москва": (55.7558, 37.6173, 30),
-            "Moscow": (55.7558, 37.6173, 30),
-            "London": (51.5074, -0.1278, 20),
-            "New York": (40.7128, -74.0060, 25),
-            "Санкт-Петербург": (59.9311, 30.3609, 20),
-            "Saint Petersburg": (59.9311, 30.3609, 20),
-            "St Petersburg": (59.9311, 30.3609, 20),
-        }
-
-        for city, (_city_lat, _city_lon, _radius) in common_cities.items():
-            if city in clean_keywords:
-                city_name = city
-                break
+    def _iter_fallback_patterns(
+        self, search_keywords: str, city_name: str | None
+    ) -> Iterator[str]:
+        """Lazily yield alternative Nominatim queries for keywords that failed.
 
-        # Try original keywords first
-        nominatim_coords = await self.get_coordinates_from_nominatim(
-            clean_keywords, user_lat, user_lon
-        )
-        if nominatim_coords:
-            # Validate coordinates are in the expected city
-            if city_name and not self._validate_city_coordinates(
-                nominatim_coords[0], nominatim_coords[1], city_name
-            ):
-                logger.warning(
-                    f"Coordinates {nominatim_coords} are not in {city_name}, rejecting"
-                )
-            else:
-                logger.info(f"Found Nominatim coordinates: {nominatim_coords}")
-                return nominatim_coords
+        Patterns are generated on demand, so the caller only pays for the
+        strategies it actually reaches before a query succeeds.
 
-        logger.info(f"Nominatim failed for original keywords: {search_keywords}")
+        Args:
+            search_keywords: Search keywords from GPT response
+            city_name: Known city detected in the keywords, if any
 
-        # Try multiple fallback patterns for better search coverage
-        fallback_patterns = []
+        Yields:
+            Non-empty, de-duplicated fallback queries in priority order
+        """
+        seen: set[str] = set()
+        for pattern in self._generate_fallback_candidates(search_keywords, city_name):
+            pattern = pattern.strip()
+            if pattern and pattern not in seen:
+                seen.add(pattern)
+                yield pattern
+
+    def _generate_fallback_candidates(
+        self, search_keywords: str, city_name: str | None
+    ) -> Iterator[str]:
+        """Yield raw fallback queries, possibly empty or repeated."""
+        sk_lower = search_keywords.lower()
+        words = search_keywords.split()
 
         # SMART FALLBACK STRATEGY 1: If we have a street address, try just the street
         # Example: "Couvent des Capucins, Rue Boissonade, Paris" -> "Rue Boissonade, Paris"
@@ -1504,7 +1504,7 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
             parts = [p.strip() for p in search_keywords.split(",")]
             if len(parts) >= 2:
                 # Look for street indicators
-                street_indicators = [
+                street_indicators = (
                     "rue",
                     "avenue",
                     "boulevard",
@@ -1512,25 +1512,23 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
                     "road",
                     "place",
                     "square",
-                ]
+                )
                 for i, part in enumerate(parts):
-                    if any(
-                        indicator in part.lower() for indicator in street_indicators
-                    ):
+                    part_lower = part.lower()
+                    if any(indicator in part_lower for indicator in street_indicators):
                         # Found a street, try street + city
                         if i < len(parts) - 1:
-                            street_with_city = f"{part}, {parts[-1]}"
-                            fallback_patterns.append(street_with_city)
+                            yield f"{part}, {parts[-1]}"
                         # Also try just the street name with number if present
                         if re.search(r"\d+", part):
-                            fallback_patterns.append(part)
+                            yield part
                         break
 
         # SMART FALLBACK STRATEGY 2: For specific places, try without the descriptor
         # Example: "Couvent des Capucins" -> "Capucins" + city
         if city_name:
             # Remove common descriptors
-            descriptors = [
+            descriptors = (
                 "couvent",
                 "église",
                 "temple",
@@ -1544,142 +1542,190 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
                 "school",
                 "musée",
                 "museum",
-            ]
-            first_part = (
-                search_keywords.split(",")[0]
-                if "," in search_keywords
-                else search_keywords
             )
+            first_lower = sk_lower.split(",", 1)[0]
             for descriptor in descriptors:
-                if descriptor in first_part.lower():
+                if descriptor in first_lower:
                     # Try without descriptor
-                    simplified = first_part.lower().replace(descriptor, "").strip()
+                    simplified = first_lower.replace(descriptor, "").strip()
                     simplified = re.sub(
                         r"\b(de|des|du|la|le|les|the|of)\b", "", simplified
                     ).strip()
                     if simplified and len(simplified) > 2:
-                        fallback_patterns.append(f"{simplified}, {city_name}")
+                        yield f"{simplified}, {city_name}"
                     break
 
         # For metro/subway stations, try different formats
-        if "metro" in search_keywords.lower() or "метро" in search_keywords.lower():
+        if city_name and ("metro" in sk_lower or "метро" in sk_lower):
             # Extract station name and try different combinations
-            station_name = (
-                search_keywords.replace("Metro", "")
-                .replace("metro", "")
-                .replace("метро", "")
-                .replace("станция", "")
-                .strip()
-            )
-            if city_name:
-                fallback_patterns.extend(
-                    [
-                        f"{station_name} station {city_name}",
-                        f"{station_name} {city_name} metro",
-                        f"{station_name} {city_name}",
-                    ]
-                )
+            station_name = _METRO_WORDS_RE.sub("", search_keywords).strip()
+            yield f"{station_name} station {city_name}"
+            yield f"{station_name} {city_name} metro"
+            yield f"{station_name} {city_name}"
 
         # For places with + or complex formatting
-        if " + " in search_keywords or "+" in search_keywords:
+        if "+" in search_keywords:
             parts = search_keywords.replace("+", " ").split()
-            fallback_patterns.extend(
-                [
-                    (
-                        " ".join(parts[:2]) if len(parts) >= 2 else parts[0]
-                    ),  # First two words
-                    parts[0] if parts else "",  # First word only
-                ]
-            )
+            if parts:
+                yield " ".join(parts[:2])  # First two words
+                yield parts[0]  # First word
 
         # For addresses with city names, preserve city context
-        words = search_keywords.split()
         if city_name and len(words) > 3:
             # Try removing middle descriptive words but keeping location identifiers
             # Keep first main identifier and city
             main_place = words[0]
-            if words[1] and words[1].lower() not in [
-                "de",
-                "la",
-                "du",
-                "le",
-                "des",
-                "of",
-                "the",
-            ]:
+            if words[1].lower() not in ("de", "la", "du", "le", "des", "of", "the"):
                 main_place = f"{words[0]} {words[1]}"
 
-            fallback_patterns.extend(
-                [
-                    f"{main_place} {city_name}",  # Main place + city
-                    (
-                        f"{' '.join(words[-3:])}" if len(words) > 3 else ""
-                    ),  # Last 3 words (usually street + city)
-                ]
-            )
+            yield f"{main_place} {city_name}"  # Main place + city
+            yield " ".join(words[-3:])  # Last 3 words (usually street + city)
 
         # For addresses, try street + city
-        street_indicators = [
-            "rue",
-            "boulevard",
-            "avenue",
-            "street",
-            "road",
-            "улица",
-            "проспект",
-            "переулок",
-        ]
-        for i, word in enumerate(words):
-            if word.lower() in street_indicators and i < len(words) - 1:
-                street_part = f"{word} {words[i+1]}"
-                if city_name:
-                    fallback_patterns.append(f"{street_part} {city_name}")
+        if city_name:
+            street_words = (
+                "rue",
+                "boulevard",
+                "avenue",
+                "street",
+                "road",
+                "улица",
+                "проспект",
+                "переулок",
+            )
+            for i, word in enumerate(words[:-1]):
+                if word.lower() in street_words:
+                    yield f"{word} {words[i+1]} {city_name}"
+                    break
+
+    async def _try_fallback_pattern(
+        self,
+        pattern: str,
+        city_name: str | None,
+        user_lat: float | None,
+        user_lon: float | None,
+    ) -> tuple[float, float] | None:
+        """Geocode one fallback pattern and apply the fallback acceptance rules.
+
+        Args:
+            pattern: Fallback search query
+            city_name: Known city detected in the original keywords, if any
+            user_lat: User's current latitude for validation
+            user_lon: User's current longitude for validation
+
+        Returns:
+            Tuple of (latitude, longitude) if accepted, None otherwise
+        """
+        logger.info(f"Trying fallback search: {pattern}")
+        coords = await self.get_coordinates_from_nominatim(pattern, user_lat, user_lon)
+        if not coords:
+            return None
+
+        # Validate coordinates if we have city context, but relax for generic fallback patterns
+        if city_name:
+            try:
+                if not self._validate_city_coordinates(coords[0], coords[1], city_name):
+                    logger.warning(
+                        f"Fallback coordinates {coords} for '{pattern}' are not in {city_name}, allowing due to relaxed validation for fallbacks"
+                    )
+            except Exception:
+                pass
+
+        # If we have user coordinates, check distance (should be within reasonable range)
+        if user_lat and user_lon:
+            distance = self._calculate_distance(
+                user_lat, user_lon, coords[0], coords[1]
+            )
+            if distance > 50:  # More than 50km away
+                logger.warning(
+                    f"Fallback coordinates {coords} are {distance:.1f}km from user, skipping"
+                )
+                return None
+
+        logger.info(f"Found coordinates with fallback search '{pattern}': {coords}")
+        return coords
+
+    async def get_coordinates_from_search_keywords(
+        self, search_keywords: str, user_lat: float = None, user_lon: float = None
+    ) -> tuple[float, float] | None:
+        """Get coordinates using search keywords via Nominatim.
+
+        Args:
+            search_keywords: Search keywords from GPT response
+            user_lat: User's current latitude for validation
+            user_lon: User's current longitude for validation
+
+        Returns:
+            Tuple of (latitude, longitude) if found, None otherwise
+        """
+        logger.info(f"Searching coordinates for keywords: {search_keywords}")
+
+        # Clean search keywords for better results
+        # Remove quotes and extra spaces
+        clean_keywords = search_keywords.translate(_STRIP_QUOTES).strip()
+
+        # Extract city name from keywords for validation
+        city_name = None
+        common_cities = {
+            "Paris": (48.8566, 2.3522, 15),  # lat, lon, radius_km
+            "Москва": (55.7558, 37.6173, 30),
+            "Moscow": (55.7558, 37.6173, 30),
+            "London": (51.5074, -0.1278, 20),
+            "New York": (40.7128, -74.0060, 25),
+            "Санкт-Петербург": (59.9311, 30.3609, 20),
+            "Saint Petersburg": (59.9311, 30.3609, 20),
+            "St Petersburg": (59.9311, 30.3609, 20),
+        }
+
+        for city, (_city_lat, _city_lon, _radius) in common_cities.items():
+            if city in clean_keywords:
+                city_name = city
                 break
 
-        # Remove empty patterns and duplicates
-        fallback_patterns = [p.strip() for p in fallback_patterns if p and p.strip()]
-        fallback_patterns = list(
-            dict.fromkeys(fallback_patterns)
-        )  # Remove duplicates while preserving order
+        # Try original keywords first
+        nominatim_coords = await self.get_coordinates_from_nominatim(
+            clean_keywords, user_lat, user_lon
+        )
+        if nominatim_coords:
+            # Validate coordinates are in the expected city
+            if city_name and not self._validate_city_coordinates(
+                nominatim_coords[0], nominatim_coords[1], city_name
+            ):
+                logger.warning(
+                    f"Coordinates {nominatim_coords} are not in {city_name}, rejecting"
+                )
+            else:
+                logger.info(f"Found Nominatim coordinates: {nominatim_coords}")
+                return nominatim_coords
+
+        logger.info(f"Nominatim failed for original keywords: {search_keywords}")
 
+        # Try multiple fallback patterns for better search coverage
         # Note: We intentionally don't add city center as fallback
         # Better to not send coordinates than to send wrong ones
 
-        # Try each fallback pattern
-        for pattern in fallback_patterns:
-            if pattern and pattern != search_keywords:  # Don't retry the original
-                logger.info(f"Trying fallback search: {pattern}")
-                coords = await self.get_coordinates_from_nominatim(
-                    pattern, user_lat, user_lon
+        # Query fallbacks in small concurrent batches (the semaphore keeps us
+        # polite to Nominatim); the next batch is only generated if needed
+        patterns = (
+            p
+            for p in self._iter_fallback_patterns(search_keywords, city_name)
+            if p != search_keywords  # Don't retry the original
+        )
+        while batch := list(itertools.islice(patterns, _FALLBACK_BATCH_SIZE)):
+            tasks = [
+                asyncio.create_task(
+                    self._try_fallback_pattern(pattern, city_name, user_lat, user_lon)
                 )
-                if coords:
-                    # Validate coordinates if we have city context, but relax for generic fallback patterns
-                    if city_name:
-                        try:
-                            if not self._validate_city_coordinates(
-                                coords[0], coords[1], city_name
-                            ):
-                                logger.warning(
-                                    f"Fallback coordinates {coords} for '{pattern}' are not in {city_name}, allowing due to relaxed validation for fallbacks"
-                                )
-                        except Exception:
-                            pass
-
-                    # If we have user coordinates, check distance (should be within reasonable range)
-                    if user_lat and user_lon:
-                        distance = self._calculate_distance(
-                            user_lat, user_lon, coords[0], coords[1]
-                        )
-                        if distance > 50:  # More than 50km away
-                            logger.warning(
-                                f"Fallback coordinates {coords} are {distance:.1f}km from user, skipping"
-                            )
-                            continue
-
-                    logger.info(
-                        f"Found coordinates with fallback search '{pattern}': {coords}"
-                    )
-                    return coords
+                for pattern in batch
+            ]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    coords = await next_done
+                    if coords:
+                        return coords
+            finally:
+                for task in tasks:
+                    task.cancel()
 
         logger.warning(f"No coordinates found for keywords: {search_keywords}")
         return None
@@ -1687,7 +1733,10 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
     async def parse_coordinates_from_response(
         self, response: str, user_lat: float = None, user_lon: float = None
     ) -> tuple[float, float] | None:
-        """Parse coordinates from OpenAI response using search keywords.
+        """Parse coordinates from OpenAI response.
+
+        Explicit precise "lat, lon" pairs are used directly; otherwise the
+        Search/Location fields are geocoded via Nominatim.
 
         Args:
             response: OpenAI response text
@@ -1699,12 +1748,29 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
         """
         try:
             # Extract content from <answer> tags first
-            answer_match = re.search(r"<answer>(.*?)</answer>", response, re.DOTALL)
+            answer_match = _ANSWER_RE.search(response)
+
+            # Fast path: the model gave explicit coordinates, no geocoding needed
+            latlon_match = _LATLON_RE.search(
+                answer_match.group(1) if answer_match else response
+            )
+            if latlon_match:
+                lat, lon = float(latlon_match.group(1)), float(latlon_match.group(2))
+                if (
+                    -90 <= lat <= 90
+                    and -180 <= lon <= 180
+                    and not self._coordinates_look_imprecise(lat, lon)
+                ):
+                    logger.info(
+                        f"Using explicit coordinates from response: {lat}, {lon}"
+                    )
+                    return lat, lon
+
             if answer_match:
                 answer_content = answer_match.group(1).strip()
 
                 # Extract search keywords from answer content
-                search_match = re.search(r"Search:\s*(.+?)(?:\n|$)", answer_content)
+                search_match = _SEARCH_RE.search(answer_content)
                 if search_match:
                     search_keywords = search_match.group(1).strip()
                     logger.info(
@@ -1719,7 +1785,7 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
                         return coords
 
                 # Fallback: extract location name from answer content
-                location_match = re.search(r"Location:\s*(.+?)(?:\n|$)", answer_content)
+                location_match = _LOCATION_RE.search(answer_content)
                 if location_match:
                     place_name = location_match.group(1).strip()
                     logger.info(
@@ -1736,7 +1802,7 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
             # Legacy fallback for old format responses (will be removed eventually)
             else:
                 # First, try to extract search keywords from old format
-                search_match = re.search(r"Поиск:\s*(.+?)(?:\n|$)", response)
+                search_match = _SEARCH_LEGACY_RE.search(response)
                 if search_match:
                     search_keywords = search_match.group(1).strip()
                     logger.info(
@@ -1751,7 +1817,7 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
                         return coords
 
                 # Fallback: try to extract location name if no search keywords
-                place_match = re.search(r"Локация:\s*(.+?)(?:\n|$)", response)
+                place_match = _LOCATION_LEGACY_RE.search(response)
                 if place_match:
                     place_name = place_match.group(1).strip()
                     logger.info(
@@ -1818,13 +1884,15 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
                     region = _YIS.detect_region(lat, lon)
                     # Try variants sequentially until enough images collected
                     collected: list[str] = []
+                    seen: set[str] = set()
                     for q in variants:
                         images = await yandex.search_images(
                             query=q, max_images=max(2, max_images), region=region
                         )
                         if images:
                             for u in images:
-                                if u not in collected:
+                                if u not in seen:
+                                    seen.add(u)
                                     collected.append(u)
                         if len(collected) >= max_images:
                             break
@@ -1894,7 +1962,7 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
                 ) as resp:
                     if resp.status != 200:
                         raise RuntimeError(f"{url} HTTP {resp.status}")
-                    return await resp.json()
+                    return await resp.json(loads=orjson.loads)
             except Exception as e:
                 logger.debug(f"Request failed {url}: {e}")
                 return None
@@ -1925,12 +1993,11 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
                 # Try exact title path via keywords
                 for lang in languages:
                     titles_to_try.append((lang, keywords))
-            # Try direct titles → pageprops → QID
-            for lang, title in titles_to_try:
+
+            # Try direct titles → pageprops → QID. Lookups run concurrently, but
+            # the result is still the highest-priority (lang, title) that resolves.
+            async def _title_qid(lang: str, title: str) -> str | None:
                 try:
-                    cached_qid = _cache_get(self._qid_cache, f"title:{lang}:{title}")
-                    if cached_qid:
-                        return cached_qid
                     page = await _fetch_json(
                         session,
                         f"https://{lang}.wikipedia.org/w/api.php",
@@ -1946,48 +2013,66 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
                     qid = next(iter(page["query"]["pages"].values()))["pageprops"][
                         "wikibase_item"
                     ]
-                    if qid:
-                        _cache_set(self._qid_cache, f"title:{lang}:{title}", qid)
-                        return qid
                 except Exception:
-                    continue
-            # Then try keyword search → pageprops
-            if keywords:
-                for lang in languages:
-                    res = await _fetch_json(
+                    return None
+                if qid:
+                    _cache_set(self._qid_cache, f"title:{lang}:{title}", qid)
+                return qid or None
+
+            # A cached title ends the search; only higher-priority misses are fetched
+            cached_qid = None
+            to_fetch: list[tuple[str, str]] = []
+            for lang, title in titles_to_try:
+                cached_qid = _cache_get(self._qid_cache, f"title:{lang}:{title}")
+                if cached_qid:
+                    break
+                to_fetch.append((lang, title))
+            fetched = await asyncio.gather(*(_title_qid(*pair) for pair in to_fetch))
+            qid = next((q for q in fetched if q), None) or cached_qid
+            if qid:
+                return qid
+
+            # Then try keyword search → pageprops, all languages at once
+            async def _search_qid(lang: str) -> str | None:
+                res = await _fetch_json(
+                    session,
+                    f"https://{lang}.wikipedia.org/w/api.php",
+                    {
+                        "action": "query",
+                        "list": "search",
+                        "srsearch": keywords,
+                        "srlimit": 1,
+                        "format": "json",
+                    },
+                )
+                try:
+                    search_res = res["query"]["search"]
+                    if not search_res:
+                        return None
+                    title = search_res[0]["title"]
+                    page = await _fetch_json(
                         session,
                         f"https://{lang}.wikipedia.org/w/api.php",
                         {
                             "action": "query",
-                            "list": "search",
-                            "srsearch": keywords,
-                            "srlimit": 1,
+                            "prop": "pageprops",
+                            "ppprop": "wikibase_item",
+                            "titles": title,
                             "format": "json",
                         },
                     )
-                    try:
-                        search_res = res["query"]["search"]
-                        if not search_res:
-                            continue
-                        title = search_res[0]["title"]
-                        page = await _fetch_json(
-                            session,
-                            f"https://{lang}.wikipedia.org/w/api.php",
-                            {
-                                "action": "query",
-                                "prop": "pageprops",
-                                "ppprop": "wikibase_item",
-                                "titles": title,
-                                "format": "json",
-                            },
-                        )
-                        qid = next(iter(page["query"]["pages"].values()))["pageprops"][
-                            "wikibase_item"
-                        ]
-                        if qid:
-                            return qid
-                    except Exception:
-                        continue
+                    qid = next(iter(page["query"]["pages"].values()))["pageprops"][
+                        "wikibase_item"
+                    ]
+                    return qid or None
+                except Exception:
+                    return None
+
+            if keywords:
+                found = await asyncio.gather(*(_search_qid(lang) for lang in languages))
+                qid = next((q for q in found if q), None)
+                if qid:
+                    return qid
             # Finally, fallback to geosearch near provided coords (if available)
             if lat_val is not None and lon_val is not None:
                 for lang in languages:
@@ -2147,10 +2232,7 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
 
                     # Skip generic file names that tend to be repeated
                     lower_filename = filename.lower()
-                    if any(
-                        skip in lower_filename
-                        for skip in ["logo", "emblem", "coat_of_arms", "flag"]
-                    ):
+                    if _COMMONS_GENERIC_FILE_RE.search(lower_filename):
                         continue
 
                     ii = await _imageinfo_for_filename(session, filename)
@@ -2245,9 +2327,11 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
 
             # Take URLs from filtered list
             urls: list[str] = []
+            seen_urls: set[str] = set()
             for ii in filtered_infos:
                 url = ii.get("thumburl") or ii.get("url")
-                if url and url not in urls:
+                if url and url not in seen_urls:
+                    seen_urls.add(url)
                     urls.append(url)
                 if len(urls) >= need:
                     break
@@ -2256,7 +2340,8 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
             if len(urls) < need and len(filtered_infos) > len(urls):
                 for ii in filtered_infos[len(urls) :]:
                     url = ii.get("thumburl") or ii.get("url")
-                    if url and url not in urls:
+                    if url and url not in seen_urls:
+                        seen_urls.add(url)
                         urls.append(url)
                     if len(urls) >= need:
                         break
@@ -2265,123 +2350,112 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
 
         results: list[str] = []
         try:
-            async with aiohttp.ClientSession() as session:
-                # 1) Try to identify QID strictly by place_hint/keywords
-                qid = await _qid_from_coords_or_search(
-                    session, lat, lon, clean_keywords, place_hint
-                )
+            session = await self._get_http_session()
+            # 1) Try to identify QID strictly by place_hint/keywords
+            qid = await _qid_from_coords_or_search(
+                session, lat, lon, clean_keywords, place_hint
+            )
 
-                infos: list[dict] = []
-                # Prepare concurrent tasks for POI image sources
-                import asyncio as _asyncio
+            infos: list[dict] = []
+            # Prepare concurrent tasks for POI image sources
+            import asyncio as _asyncio
 
-                tasks: list = []
-                if qid:
+            tasks: list = []
+            if qid:
 
-                    async def _p18_info():
-                        try:
-                            filename = await _p18_for_qid(session, qid)
-                            if filename:
-                                return await _imageinfo_for_filename(session, filename)
-                        except Exception:
-                            return None
+                async def _p18_info():
+                    try:
+                        filename = await _p18_for_qid(session, qid)
+                        if filename:
+                            return await _imageinfo_for_filename(session, filename)
+                    except Exception:
                         return None
+                    return None
 
-                    tasks.append(_p18_info())
-                    tasks.append(
-                        _commons_depicts_for_qid(session, qid, limit=max(3, max_images))
-                    )
-                # 2) If still no images and we have sources in the fact, try to parse QIDs/File:* from sources
-                if not infos and sources_hint:
-                    try:
-                        for _title, url in (sources_hint or [])[:4]:
-                            if not url:
-                                continue
-                            # Try to detect a Wikidata QID in the URL
-                            import re as _re
-
-                            m = _re.search(r"/(Q\d+)(?:[#/?]|$)", url)
-                            if m:
-                                q = m.group(1)
-                                fn = await _p18_for_qid(session, q)
-                                if fn:
-                                    ii = await _imageinfo_for_filename(session, fn)
-                                    if ii:
-                                        infos.append(ii)
-                                        if len(infos) >= max_images:
-                                            break
-                            # Or a Commons File: link
-                            if "File:" in url or "Special:FilePath" in url:
-                                # Try to extract filename segment
-                                from urllib.parse import unquote
-
-                                part = url.split("File:")[-1]
-                                part = part.split("?")[0]
-                                filename = unquote(part)
-                                ii = await _imageinfo_for_filename(session, filename)
+                tasks.append(_p18_info())
+                tasks.append(
+                    _commons_depicts_for_qid(session, qid, limit=max(3, max_images))
+                )
+            # 2) If still no images and we have sources in the fact, try to parse QIDs/File:* from sources
+            if not infos and sources_hint:
+                try:
+                    for _title, url in (sources_hint or [])[:4]:
+                        if not url:
+                            continue
+                        # Try to detect a Wikidata QID in the URL
+                        import re as _re
+
+                        m = _re.search(r"/(Q\d+)(?:[#/?]|$)", url)
+                        if m:
+                            q = m.group(1)
+                            fn = await _p18_for_qid(session, q)
+                            if fn:
+                                ii = await _imageinfo_for_filename(session, fn)
                                 if ii:
                                     infos.append(ii)
                                     if len(infos) >= max_images:
                                         break
-                    except Exception:
-                        pass
-                # Try Commons geosearch around POI coordinates
-                # First try: use provided POI coordinates (from Coordinates field in answer)
-                if lat is not None and lon is not None:
-                    tasks.append(
-                        _commons_geosearch(session, lat, lon, limit=max(6, max_images))
+                        # Or a Commons File: link
+                        if "File:" in url or "Special:FilePath" in url:
+                            # Try to extract filename segment
+                            from urllib.parse import unquote
+
+                            part = url.split("File:")[-1]
+                            part = part.split("?")[0]
+                            filename = unquote(part)
+                            ii = await _imageinfo_for_filename(session, filename)
+                            if ii:
+                                infos.append(ii)
+                                if len(infos) >= max_images:
+                                    break
+                except Exception:
+                    pass
+            # Try Commons geosearch around POI coordinates
+            # First try: use provided POI coordinates (from Coordinates field in answer)
+            if lat is not None and lon is not None:
+                tasks.append(
+                    _commons_geosearch(session, lat, lon, limit=max(6, max_images))
+                )
+            # Second try: derive POI coordinates from Search keywords
+            elif len(infos) < max_images and clean_keywords:
+                try:
+                    poi_coords = await self.get_coordinates_from_search_keywords(
+                        clean_keywords
                     )
-                # Second try: derive POI coordinates from Search keywords
-                elif len(infos) < max_images and clean_keywords:
-                    try:
-                        poi_coords = await self.get_coordinates_from_search_keywords(
-                            clean_keywords
-                        )
-                        if poi_coords:
-                            tasks.append(
-                                _commons_geosearch(
-                                    session,
-                                    poi_coords[0],
-                                    poi_coords[1],
-                                    limit=max(6, max_images),
-                                )
+                    if poi_coords:
+                        tasks.append(
+                            _commons_geosearch(
+                                session,
+                                poi_coords[0],
+                                poi_coords[1],
+                                limit=max(6, max_images),
                             )
-                    except Exception:
-                        pass
-
-                # Execute all prepared tasks concurrently and merge results
-                if tasks:
-                    results_lists = await _asyncio.gather(
-                        *tasks, return_exceptions=True
-                    )
-                    for res in results_lists:
-                        if isinstance(res, list):
-                            for ii in res:
-                                if ii:
-                                    infos.append(ii)
-                        elif isinstance(res, dict):
-                            infos.append(res)
+                        )
+                except Exception:
+                    pass
 
-                if infos:
-                    results = _pick_urls_from_infos(
-                        infos, max_images, place_hint, sources_hint
-                    )
-                # Final fallback to legacy page media search if still empty
-                if not results and clean_keywords:
-                    results = await self._search_wikipedia_images(
-                        clean_keywords, "en", max_images
-                    )
-                    if not results:
-                        # try a few more langs quickly
-                        for lg in ["ru", "fr"]:
-                            if results:
-                                break
-                            try:
-                                results = await self._search_wikipedia_images(
-                                    clean_keywords, lg, max_images
-                                )
-                            except Exception:
-                                pass
+            # Execute all prepared tasks concurrently and merge results
+            if tasks:
+                results_lists = await _asyncio.gather(*tasks, return_exceptions=True)
+                for res in results_lists:
+                    if isinstance(res, list):
+                        for ii in res:
+                            if ii:
+                                infos.append(ii)
+                    elif isinstance(res, dict):
+                        infos.append(res)
+
+            if infos:
+                results = _pick_urls_from_infos(
+                    infos, max_images, place_hint, sources_hint
+                )
+            # Final fallback to legacy page media search if still empty
+            if not results and clean_keywords:
+                results = await self._search_wikipedia_images_by_priority(
+                    clean_keywords,
+                    wiki_fallback_languages(clean_keywords),
+                    max_images,
+                )
         except Exception as e:
             logger.debug(f"Commons pipeline failed: {e}")
 
@@ -2391,8 +2465,76 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
             )
         return results
 
+    async def _search_wikipedia_images_by_priority(
+        self, search_term: str, languages: Iterable[str], max_images: int = 5
+    ) -> list[str]:
+        """Search several Wikipedia languages concurrently.
+
+        Args:
+            search_term: Term to search for
+            languages: Language codes in order of preference
+            max_images: Maximum number of images to return
+
+        Returns:
+            Images of the first language (in the given order) that has any.
+            Lookups that can no longer win are cancelled.
+        """
+        tasks = [
+            asyncio.create_task(
+                self._search_wikipedia_images(search_term, lang, max_images)
+            )
+            for lang in languages
+        ]
+        try:
+            for task in tasks:
+                try:
+                    results = await task
+                except Exception:
+                    continue
+                if results:
+                    return results
+            return []
+        finally:
+            for task in tasks:
+                task.cancel()
+
     async def _search_wikipedia_images(
         self, search_term: str, lang: str, max_images: int = 5
+    ) -> list[str]:
+        """Search for images on specific Wikipedia language, with caching.
+
+        Non-empty results are kept for ``_image_cache_ttl_seconds`` (at most
+        ``_WIKI_SEARCH_CACHE_MAX_ENTRIES``, least recently used evicted first),
+        so repeat lookups for the same keywords skip the search and media-list
+        requests.
+
+        Args:
+            search_term: Term to search for
+            lang: Language code (en, ru, fr, etc.)
+            max_images: Maximum number of images to return
+
+        Returns:
+            List of image URLs (up to max_images)
+        """
+        key = (lang, search_term, max_images)
+        cached = self._wiki_search_cache.get(key)
+        if cached:
+            images, ts = cached
+            if (time.time() - ts) <= self._image_cache_ttl_seconds:
+                self._wiki_search_cache.move_to_end(key)
+                return list(images)
+            del self._wiki_search_cache[key]
+
+        images = await self._fetch_wikipedia_images(search_term, lang, max_images)
+        if images:
+            self._wiki_search_cache[key] = (list(images), time.time())
+            self._wiki_search_cache.move_to_end(key)
+            while len(self._wiki_search_cache) > _WIKI_SEARCH_CACHE_MAX_ENTRIES:
+                self._wiki_search_cache.popitem(last=False)
+        return images
+
+    async def _fetch_wikipedia_images(
+        self, search_term: str, lang: str, max_images: int = 5
     ) -> list[str]:
         """Search for images on specific Wikipedia language.
 
@@ -2406,153 +2548,148 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
         """
         try:
             # Use legacy API for search (REST API often returns 404)
-            search_url = f"https://{lang}.wikipedia.org/w/api.php?action=query&list=search&srsearch={quote(search_term)}&format=json"
+            search_url = f"https://{lang}.wikipedia.org/w/api.php?action=query&list=search&srsearch={quote_title(search_term)}&format=json"
             headers = {"User-Agent": "BotVoyage/1.0 (Educational Project)"}
 
-            async with aiohttp.ClientSession() as session:
-                # Search for pages using legacy API
-                async with session.get(
-                    search_url, headers=headers, timeout=5
-                ) as response:
-                    if response.status != 200:
-                        logger.debug(
-                            f"Search failed for '{search_term}' in {lang}: status {response.status}"
-                        )
-                        return None
+            session = await self._get_http_session()
+            # Search for pages using legacy API
+            async with session.get(search_url, headers=headers, timeout=5) as response:
+                if response.status != 200:
+                    logger.debug(
+                        f"Search failed for '{search_term}' in {lang}: status {response.status}"
+                    )
+                    return None
 
-                    search_data = await response.json()
-                    search_results = search_data.get("query", {}).get("search", [])
+                search_data = await response.json(loads=orjson.loads)
+                search_results = search_data.get("query", {}).get("search", [])
 
-                    if not search_results:
-                        logger.debug(
-                            f"No search results found for '{search_term}' in {lang}"
-                        )
-                        return []
+                if not search_results:
+                    logger.debug(
+                        f"No search results found for '{search_term}' in {lang}"
+                    )
+                    return []
+
+                logger.debug(
+                    f"Found {len(search_results)} search results for '{search_term}' in {lang}"
+                )
+
+                # Best candidates so far as a bounded min-heap of
+                # (score, -arrival, title); try twice as many images as needed
+                # to account for failures
+                keep = max_images * 2
+                candidates: list[tuple[int, int, str]] = []
+                arrival = itertools.count()
+                # Related pages often share photos; score each file once
+                seen_files: set[str] = set()
+
+                # Keywords worth matching in image titles (skip short words)
+                search_words = [w for w in search_term.lower().split() if len(w) > 2]
+
+                # Fetch media lists for the first few pages concurrently
+                page_titles = wiki_article_titles(search_results)
+                pages_items = await asyncio.gather(
+                    *(
+                        self._fetch_media_items(session, lang, page_title, headers)
+                        for page_title in page_titles
+                    ),
+                    return_exceptions=True,
+                )
+
+                for page_title, items in zip(page_titles, pages_items, strict=True):
+                    if isinstance(items, BaseException):
+                        continue
 
                     logger.debug(
-                        f"Found {len(search_results)} search results for '{search_term}' in {lang}"
+                        f"Found {len(items)} media items for page '{page_title}'"
                     )
 
-                    # Collect all potential images from multiple pages
-                    all_potential_images = []
+                    # Look for good images
+                    for item in items:
+                        if item.get("type") != "image":
+                            continue
+
+                        title = item.get("title", "").lower()
 
-                    # Try first few pages
-                    for result in search_results[:5]:  # Try more pages
-                        page_title = result.get("title")
-                        if not page_title:
+                        # Skip common non-relevant images
+                        if _WIKI_SKIP_RE.search(title):
+                            continue
+                        if item["title"] in seen_files:
+                            continue
+                        seen_files.add(item["title"])
+
+                        # Prefer images with good extensions and score them
+                        score = 0
+                        if _WIKI_JPEG_RE.search(title):
+                            score += 3
+                        elif _WIKI_RASTER_RE.search(title):
+                            score += 2
+
+                        # Once the heap is full only a strictly higher score gets in
+                        # (ties keep the earlier image), so skip the keyword scan
+                        # when even matching every word could not beat the floor
+                        full = len(candidates) >= keep
+                        if full and (
+                            not candidates
+                            or score + len(search_words) <= candidates[0][0]
+                        ):
                             continue
 
-                        logger.debug(f"Trying page: {page_title}")
+                        # Prefer images that contain keywords from search term
+                        score += sum(word in title for word in search_words)
 
-                        # Get media list for this page using REST API (this part still works)
-                        media_url = f"https://{lang}.wikipedia.org/api/rest_v1/page/media-list/{quote(page_title)}"
+                        entry = (score, -next(arrival), item["title"])
+                        if not full:
+                            heapq.heappush(candidates, entry)
+                        elif score > candidates[0][0]:
+                            heapq.heapreplace(candidates, entry)
 
-                        async with session.get(
-                            media_url, headers=headers, timeout=5
-                        ) as media_response:
-                            if media_response.status != 200:
-                                continue
+                # Highest score first, ties in the order the images were seen
+                best_images = [
+                    (score, image_title)
+                    for score, _, image_title in sorted(candidates, reverse=True)
+                ]
 
-                            media_data = await media_response.json()
-                            items = media_data.get("items", [])
+                if best_images:
+                    # Build URLs for every candidate; spares replace any that
+                    # fail the probe below
+                    selected_images = []
+                    for score, image_title in best_images:
+                        # Clean image title - remove File: prefix if present
+                        clean_title = (
+                            image_title[5:]
+                            if image_title.startswith("File:")
+                            else image_title
+                        )
 
+                        # Try multiple URL formats for better reliability
+                        # Skip images with potentially problematic filenames
+                        if any(
+                            char in clean_title
+                            for char in ["|", ":", ";", "<", ">", '"']
+                        ):
                             logger.debug(
-                                f"Found {len(items)} media items for page '{page_title}'"
+                                f"Skipping image with problematic filename: {clean_title}"
                             )
+                            continue
 
-                            # Look for good images
-                            for item in items:
-                                if item.get("type") != "image":
-                                    continue
-
-                                title = item.get("title", "").lower()
-
-                                # Skip common non-relevant images
-                                skip_patterns = [
-                                    "commons-logo",
-                                    "edit-icon",
-                                    "wikimedia",
-                                    "stub",
-                                    "ambox",
-                                    "crystal",
-                                    "nuvola",
-                                    "dialog",
-                                    "system",
-                                    "red_x",
-                                    "green_check",
-                                    "question_mark",
-                                    "infobox",
-                                    "arrow",
-                                    "symbol",
-                                    "disambiguation",
-                                    "flag",
-                                ]
-
-                                if any(pattern in title for pattern in skip_patterns):
-                                    continue
-
-                                # Prefer images with good extensions and score them
-                                score = 0
-                                if any(ext in title for ext in [".jpg", ".jpeg"]):
-                                    score += 3
-                                elif any(ext in title for ext in [".png", ".webp"]):
-                                    score += 2
-
-                                # Prefer images that contain keywords from search term
-                                search_words = search_term.lower().split()
-                                for word in search_words:
-                                    if (
-                                        word in title and len(word) > 2
-                                    ):  # Avoid short words
-                                        score += 1
-
-                                all_potential_images.append((score, item["title"]))
-
-                    # Sort by score and return best images
-                    all_potential_images.sort(reverse=True, key=lambda x: x[0])
-
-                    if all_potential_images:
-                        # Return up to max_images best images with multiple URL formats
-                        selected_images = []
-                        for score, image_title in all_potential_images[
-                            : max_images * 2
-                        ]:  # Try more images to account for failures
-                            if len(selected_images) >= max_images:
-                                break
-
-                            # Clean image title - remove File: prefix if present
-                            clean_title = (
-                                image_title[5:]
-                                if image_title.startswith("File:")
-                                else image_title
+                        # Try to get actual image URL using Wikimedia API
+                        actual_image_url = await self._get_actual_image_url(
+                            clean_title, session, lang
+                        )
+                        if actual_image_url:
+                            selected_images.append(actual_image_url)
+                            logger.debug(
+                                f"Selected image: {image_title} (score: {score}) -> {actual_image_url}"
                             )
-
-                            # Try multiple URL formats for better reliability
-                            # Skip images with potentially problematic filenames
-                            if any(
-                                char in clean_title
-                                for char in ["|", ":", ";", "<", ">", '"']
-                            ):
-                                logger.debug(
-                                    f"Skipping image with problematic filename: {clean_title}"
-                                )
-                                continue
-
-                            # Try to get actual image URL using Wikimedia API
-                            actual_image_url = await self._get_actual_image_url(
-                                clean_title, session, lang
+                        else:
+                            logger.debug(
+                                f"Failed to get actual URL for image: {clean_title}"
                             )
-                            if actual_image_url:
-                                selected_images.append(actual_image_url)
-                                logger.debug(
-                                    f"Selected image: {image_title} (score: {score}) -> {actual_image_url}"
-                                )
-                            else:
-                                logger.debug(
-                                    f"Failed to get actual URL for image: {clean_title}"
-                                )
 
-                        return selected_images
+                    probed = await self._probe_image_urls(
+                        session, selected_images, headers
+                    )
+                    return probed[:max_images]
 
         except Exception as e:
             logger.debug(f"Error searching Wikipedia {lang} for '{search_term}': {e}")
@@ -2560,6 +2697,21 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
 
         return []
 
+    async def _fetch_media_items(
+        self,
+        session: aiohttp.ClientSession,
+        lang: str,
+        page_title: str,
+        headers: dict[str, str],
+    ) -> list[dict]:
+        """Fetch the REST media-list items of one Wikipedia page ([] if unavailable)."""
+        media_url = f"https://{lang}.wikipedia.org/api/rest_v1/page/media-list/{quote_title(page_title)}"
+        async with session.get(media_url, headers=headers, timeout=5) as response:
+            if response.status != 200:
+                return []
+            media_data = await response.json(loads=orjson.loads)
+        return media_data.get("items", [])
+
     def _get_md5_hash(self, filename: str) -> str | None:
         """Get MD5 hash of filename for direct Wikipedia Commons URL.
 
@@ -2594,9 +2746,7 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
         """
         try:
             # Encode the filename and prepend File:
-            from urllib.parse import quote
-
-            encoded = quote(f"File:{filename}")
+            encoded = quote_title(f"File:{filename}")
             url = f"https://commons.wikimedia.org/wiki/Special:FilePath/{encoded}?width=800"
             return url
         except Exception as e:
@@ -2665,23 +2815,7 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
 
         # Parse the response to extract place and fact for history
         if cache_key:
-            lines = fact_response.split("\n")
-            place = "рядом с вами"
-            fact = fact_response
-
-            # Try to parse structured response
-            for i, line in enumerate(lines):
-                if line.startswith("Локация:"):
-                    place = line.replace("Локация:", "").strip()
-                elif line.startswith("Интересный факт:"):
-                    # Join all lines after Интересный факт: as the fact might be multiline
-                    fact_lines = []
-                    fact_lines.append(line.replace("Интересный факт:", "").strip())
-                    for j in range(i + 1, len(lines)):
-                        if lines[j].strip():
-                            fact_lines.append(lines[j].strip())
-                    fact = " ".join(fact_lines)
-                    break
+            place, fact = _parse_place_and_fact(fact_response)
 
             # Add to history
             logger.info(f"Adding fact to history for {cache_key}: {place}")
@@ -2754,13 +2888,8 @@ Accuracy matters more than drama. Common errors: wrong expo years, false Eiffel
         return r * c
 
 
-# Global client instance - will be initialized lazily
-_openai_client: OpenAIClient | None = None
-
-
+# Global client instance - created lazily on first call and cached
+@functools.cache
 def get_openai_client() -> OpenAIClient:
     """Get or create the global OpenAI client instance."""
-    global _openai_client
-    if _openai_client is None:
-        _openai_client = OpenAIClient()
-    return _openai_client
+    return OpenAIClient()
@@ -1,8 +1,11 @@
 """PostgreSQL database for production deployment."""
 
+import asyncio
 import logging
 import os
+import threading
 import time
+from collections import OrderedDict
 from typing import Any
 
 import asyncpg
@@ -10,6 +13,42 @@ from asyncpg.pool import Pool
 
 logger = logging.getLogger(__name__)
 
+# Premium status and language are read on almost every update but rarely
+# change. The caches are process-wide, shared by every PostgresDatabase (the
+# bot's and the sync wrapper's, which runs on its own thread), so a write
+# through either instance invalidates the entry for both immediately
+_USER_CACHE_TTL_SECONDS = 60.0
+_USER_CACHE_MAX_ENTRIES = 10_000
+# user_id -> (monotonic ts, value), in LRU order
+_premium_cache: OrderedDict[int, tuple[float, bool]] = OrderedDict()
+_language_cache: OrderedDict[int, tuple[float, str]] = OrderedDict()
+_user_cache_lock = threading.Lock()
+
+
+def _cache_get(cache: OrderedDict, user_id: int):
+    """Return a fresh cached value for a user, or None."""
+    with _user_cache_lock:
+        cached = cache.get(user_id)
+        if cached and time.monotonic() - cached[0] < _USER_CACHE_TTL_SECONDS:
+            cache.move_to_end(user_id)
+            return cached[1]
+    return None
+
+
+def _cache_put(cache: OrderedDict, user_id: int, value) -> None:
+    """Store a value for a user, evicting the least recently used users."""
+    with _user_cache_lock:
+        cache[user_id] = (time.monotonic(), value)
+        cache.move_to_end(user_id)
+        while len(cache) > _USER_CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+
+
+def _cache_forget(cache: OrderedDict, user_id: int) -> None:
+    """Drop a user's cached value."""
+    with _user_cache_lock:
+        cache.pop(user_id, None)
+
 
 class PostgresDatabase:
     """PostgreSQL database for managing donors."""
@@ -78,19 +117,26 @@ class PostgresDatabase:
                     )
                 """
                 )
-                # Ensure reasoning column exists
-                try:
+                # Add columns missing from older deployments; ALTER TABLE takes
+                # an exclusive lock, so only issue it when something is missing
+                existing_columns = {
+                    row["column_name"]
+                    for row in await conn.fetch(
+                        """
+                        SELECT column_name FROM information_schema.columns
+                        WHERE table_schema = current_schema()
+                          AND table_name = 'user_preferences'
+                        """
+                    )
+                }
+                if "reasoning" not in existing_columns:
                     await conn.execute(
                         "ALTER TABLE user_preferences ADD COLUMN IF NOT EXISTS reasoning TEXT DEFAULT 'medium'"
                     )
-                except Exception:
-                    pass
-                try:
+                if "model" not in existing_columns:
                     await conn.execute(
                         "ALTER TABLE user_preferences ADD COLUMN IF NOT EXISTS model TEXT DEFAULT 'claude-haiku-4-5-20251001'"
                     )
-                except Exception:
-                    pass
 
                 # Create indexes
                 await conn.execute(
@@ -99,11 +145,19 @@ class PostgresDatabase:
                 await conn.execute(
                     "CREATE INDEX IF NOT EXISTS idx_donations_payment_id ON donations(payment_id)"
                 )
+                # Covering index so the premium check is an index-only scan
+                await conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_donors_premium ON donors(user_id) INCLUDE (premium_expires)"
+                )
 
             logger.info("PostgreSQL database initialized successfully")
 
         except Exception as e:
             logger.error(f"Failed to initialize PostgreSQL database: {e}")
+            # Don't leak the pool: a failed init is retried with a fresh one
+            if self.pool is not None:
+                await self.pool.close()
+                self.pool = None
             raise
 
     async def close(self):
@@ -125,77 +179,45 @@ class PostgresDatabase:
             current_time = int(time.time())
 
             async with self.pool.acquire() as conn:
-                # Start transaction
-                async with conn.transaction():
-                    # Check if payment already exists
-                    existing = await conn.fetchval(
-                        "SELECT id FROM donations WHERE payment_id = $1", payment_id
-                    )
-
-                    if existing:
-                        logger.warning(f"Payment {payment_id} already exists")
-                        return False
-
-                    # First ensure donor exists
-                    donor = await conn.fetchrow(
-                        "SELECT total_stars FROM donors WHERE user_id = $1", user_id
-                    )
-
-                    if donor:
-                        # Update existing donor
-                        new_total = donor["total_stars"] + stars_amount
-                        await conn.execute(
-                            """
-                            UPDATE donors
-                            SET total_stars = $2,
-                                last_donation_date = $3,
-                                telegram_username = $4,
-                                first_name = $5,
-                                premium_expires = $6
-                            WHERE user_id = $1
-                        """,
-                            user_id,
-                            new_total,
-                            current_time,
-                            telegram_username,
-                            first_name,
-                            current_time + (25 * 365 * 24 * 60 * 60),
-                        )
-                    else:
-                        # Create new donor first (before adding donation due to foreign key)
-                        await conn.execute(
-                            """
-                            INSERT INTO donors
-                            (user_id, telegram_username, first_name, total_stars,
-                             first_donation_date, last_donation_date, premium_expires)
-                            VALUES ($1, $2, $3, $4, $5, $6, $7)
-                        """,
-                            user_id,
-                            telegram_username,
-                            first_name,
-                            stars_amount,
-                            current_time,
-                            current_time,
-                            current_time + (25 * 365 * 24 * 60 * 60),
-                        )
-
-                    # Now add donation (after donor exists)
-                    await conn.execute(
-                        """
+                # One statement, one round-trip: the donor is only upserted if
+                # the payment was new (foreign keys are checked at statement end)
+                donor_id = await conn.fetchval(
+                    """
+                    WITH new_donation AS (
                         INSERT INTO donations (user_id, payment_id, stars_amount, payment_date, invoice_payload)
                         VALUES ($1, $2, $3, $4, $5)
-                    """,
-                        user_id,
-                        payment_id,
-                        stars_amount,
-                        current_time,
-                        invoice_payload,
+                        ON CONFLICT (payment_id) DO NOTHING
+                        RETURNING user_id
                     )
+                    INSERT INTO donors
+                    (user_id, telegram_username, first_name, total_stars,
+                     first_donation_date, last_donation_date, premium_expires)
+                    SELECT user_id, $6, $7, $3, $4, $4, $8 FROM new_donation
+                    ON CONFLICT (user_id) DO UPDATE
+                    SET total_stars = donors.total_stars + EXCLUDED.total_stars,
+                        last_donation_date = EXCLUDED.last_donation_date,
+                        telegram_username = EXCLUDED.telegram_username,
+                        first_name = EXCLUDED.first_name,
+                        premium_expires = EXCLUDED.premium_expires
+                    RETURNING user_id
+                """,
+                    user_id,
+                    payment_id,
+                    stars_amount,
+                    current_time,
+                    invoice_payload,
+                    telegram_username,
+                    first_name,
+                    current_time + (25 * 365 * 24 * 60 * 60),
+                )
 
-                    logger.info(
-                        f"Added donation: user_id={user_id}, stars={stars_amount}"
-                    )
-                    return True
+                if donor_id is None:
+                    logger.warning(f"Payment {payment_id} already exists")
+                    return False
+
+                _cache_forget(_premium_cache, user_id)
+                logger.info(f"Added donation: user_id={user_id}, stars={stars_amount}")
+                return True
 
         except Exception as e:
             logger.error(f"Failed to add donation: {e}")
@@ -203,6 +225,9 @@ class PostgresDatabase:
 
     async def is_premium_user(self, user_id: int) -> bool:
         """Check if user has active premium status."""
+        cached = _cache_get(_premium_cache, user_id)
+        if cached is not None:
+            return cached
         try:
             current_time = int(time.time())
 
@@ -216,7 +241,9 @@ class PostgresDatabase:
                     current_time,
                 )
 
-                return result is not None
+            is_premium = result is not None
+            _cache_put(_premium_cache, user_id, is_premium)
+            return is_premium
 
         except Exception as e:
             logger.error(f"Failed to check premium status: {e}")
@@ -269,15 +296,25 @@ class PostgresDatabase:
             current_time = int(time.time())
 
             async with self.pool.acquire() as conn:
-                # Use single query for efficiency
+                # Single query, one scan per table
                 stats = await conn.fetchrow(
                     """
+                    WITH d AS (
+                        SELECT COUNT(*) AS total_donors,
+                               COUNT(*) FILTER (WHERE premium_expires > $1) AS active_premium
+                        FROM donors
+                    ), s AS (
+                        SELECT COUNT(*) AS total_donations,
+                               COALESCE(SUM(stars_amount), 0) AS total_stars
+                        FROM donations
+                    )
                     SELECT
-                        (SELECT COUNT(*) FROM donors) as total_donors,
-                        (SELECT COUNT(*) FROM donations) as total_donations,
-                        (SELECT COALESCE(SUM(stars_amount), 0) FROM donations) as total_stars,
-                        (SELECT COUNT(*) FROM donors WHERE premium_expires > $1) as active_premium,
+                        d.total_donors,
+                        s.total_donations,
+                        s.total_stars,
+                        d.active_premium,
                         (SELECT COUNT(*) FROM user_preferences) as users_with_language
+                    FROM d, s
                 """,
                     current_time,
                 )
@@ -290,12 +327,17 @@ class PostgresDatabase:
 
     async def get_user_language(self, user_id: int) -> str:
         """Get user's preferred language."""
+        cached = _cache_get(_language_cache, user_id)
+        if cached is not None:
+            return cached
         try:
             async with self.pool.acquire() as conn:
                 language = await conn.fetchval(
                     "SELECT language FROM user_preferences WHERE user_id = $1", user_id
                 )
-                return language or "ru"
+            language = language or "ru"
+            _cache_put(_language_cache, user_id, language)
+            return language
 
         except Exception as e:
             logger.error(f"Failed to get user language: {e}")
@@ -316,6 +358,7 @@ class PostgresDatabase:
                     language,
                 )
 
+                _cache_put(_language_cache, user_id, language)
                 logger.info(f"Set language {language} for user {user_id}")
                 return True
 
@@ -344,6 +387,7 @@ class PostgresDatabase:
                     "DELETE FROM user_preferences WHERE user_id = $1",
                     user_id,
                 )
+                _cache_forget(_language_cache, user_id)
                 logger.info(f"Reset language preference for user {user_id}")
                 return True
         except Exception as e:
@@ -385,14 +429,19 @@ class PostgresDatabase:
             return False
 
 
-# Global instance
+# Global instance; the lock keeps concurrent first callers from each opening
+# a connection pool while init() is awaiting
 _postgres_db: PostgresDatabase | None = None
+_postgres_db_lock = asyncio.Lock()
 
 
 async def get_postgres_db() -> PostgresDatabase:
     """Get or create PostgreSQL database instance."""
     global _postgres_db
     if _postgres_db is None:
-        _postgres_db = PostgresDatabase()
-        await _postgres_db.init()
+        async with _postgres_db_lock:
+            if _postgres_db is None:
+                db = PostgresDatabase()
+                await db.init()
+                _postgres_db = db
     return _postgres_db
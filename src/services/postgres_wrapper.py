@@ -2,13 +2,18 @@
 
 import asyncio
 import logging
-from concurrent.futures import ThreadPoolExecutor
+import threading
 from typing import Any
 
-from .postgres_db import PostgresDatabase, get_postgres_db
+from .postgres_db import PostgresDatabase
 
 logger = logging.getLogger(__name__)
 
+# Upper bound for one blocking call (matches the pool's command_timeout)
+_SYNC_CALL_TIMEOUT_SECONDS = 60
+# Shutdown waits at most this long for the pool and the loop thread
+_CLOSE_TIMEOUT_SECONDS = 5
+
 
 class PostgresSyncWrapper:
     """Synchronous wrapper for PostgreSQL database."""
@@ -16,73 +21,42 @@ class PostgresSyncWrapper:
     def __init__(self):
         """Initialize the wrapper."""
         self.db_path = "postgresql://railway"
-        self._loop = None
-        self._executor = ThreadPoolExecutor(max_workers=5)
+        # Every call runs on one private event loop, so the asyncpg pool (bound
+        # to the loop that created it) is opened once and reused across calls
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="postgres-sync-loop", daemon=True
+        )
+        self._thread.start()
         self._db: PostgresDatabase | None = None
-        self._initialized = False
 
         # Initialize database on first use
         self._ensure_initialized()
 
     def _ensure_initialized(self):
         """Ensure database is initialized."""
-        if not self._initialized:
+        if self._db is None:
             try:
-                # Check if we're in async context (telegram bot handlers)
-                try:
-                    asyncio.get_running_loop()
-                    # We're in async context, can't use run_until_complete
-                    # Mark as initialized and let first operation handle DB init
-                    self._initialized = True
-                    logger.info(
-                        "PostgreSQL wrapper deferred initialization (async context)"
-                    )
-                    return
-                except RuntimeError:
-                    # No running loop, we can initialize normally
-                    self._loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(self._loop)
-
-                    # Initialize database
-                    self._db = self._loop.run_until_complete(get_postgres_db())
-                    self._initialized = True
-                    logger.info("PostgreSQL sync wrapper initialized")
+                # Own instance rather than the global one: that pool belongs to
+                # the bot's event loop and cannot be used from this thread
+                db = PostgresDatabase()
+                self._run_async(db.init())
+                self._db = db
+                logger.info("PostgreSQL sync wrapper initialized")
             except Exception as e:
                 logger.error(f"Failed to initialize PostgreSQL wrapper: {e}")
                 raise
 
     def _run_async(self, coro):
-        """Run async coroutine in sync context."""
+        """Run async coroutine on the wrapper's loop and wait for the result."""
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
         try:
-            # Ensure database is initialized
-            if self._db is None:
-                # Get database asynchronously if needed
-                import inspect
-
-                if inspect.iscoroutine(coro):
-                    # Create a wrapper to initialize DB first
-                    async def wrapper():
-                        if self._db is None:
-                            self._db = await get_postgres_db()
-                        return await coro
-
-                    coro = wrapper()
-
-            # Try to get current event loop
-            try:
-                loop = asyncio.get_running_loop()
-                # We're in async context, use create_task
-                loop.create_task(coro)
-                # Use run_in_executor to avoid blocking
-                import concurrent.futures
-
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(asyncio.run, coro)
-                    return future.result()
-            except RuntimeError:
-                # No running loop, create one
-                return asyncio.run(coro)
-
+            return future.result(timeout=_SYNC_CALL_TIMEOUT_SECONDS)
+        except TimeoutError:
+            # Stop the query on the loop too, so it releases its connection
+            future.cancel()
+            logger.error("Async operation timed out")
+            raise
         except Exception as e:
             logger.error(f"Error running async operation: {e}")
             raise
@@ -149,14 +123,19 @@ class PostgresSyncWrapper:
         """Set user reasoning level (sync)."""
         return self._run_async(self._db.set_user_reasoning(user_id, level))
 
-    def __del__(self):
-        """Cleanup on deletion."""
+    def close(self) -> None:
+        """Close the connection pool and stop the background loop."""
+        if self._loop.is_closed():
+            return
         try:
-            if self._db and self._loop and not self._loop.is_closed():
-                self._loop.run_until_complete(self._db.close())
-            if self._executor:
-                self._executor.shutdown(wait=False)
-            if self._loop and not self._loop.is_closed():
-                self._loop.close()
+            if self._db is not None:
+                future = asyncio.run_coroutine_threadsafe(self._db.close(), self._loop)
+                future.result(timeout=_CLOSE_TIMEOUT_SECONDS)
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
+        finally:
+            self._db = None
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=_CLOSE_TIMEOUT_SECONDS)
+            if not self._loop.is_running():
+                self._loop.close()
@@ -0,0 +1,49 @@
+"""Shared fixtures for the test suite."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+
+def _build_mock_response(status=200, json_data=None, content_type="application/json"):
+    """Build a canned aiohttp response."""
+    response = MagicMock(status=status, content_type=content_type)
+    response.json = AsyncMock(return_value=json_data)
+    return response
+
+
+def _build_mock_session(responses_by_url):
+    """Build an aiohttp session stub whose get/head yield canned outcomes.
+
+    Each value is a response, an exception raised when the request is entered,
+    or a list of those consumed one call at a time; "*" matches any other URL.
+    """
+
+    def request(url, **kwargs):
+        outcome = responses_by_url.get(url, responses_by_url.get("*"))
+        if isinstance(outcome, list):
+            outcome = outcome.pop(0)
+        context = MagicMock()
+        if isinstance(outcome, BaseException):
+            context.__aenter__ = AsyncMock(side_effect=outcome)
+        else:
+            context.__aenter__ = AsyncMock(return_value=outcome)
+        context.__aexit__ = AsyncMock(return_value=False)
+        return context
+
+    session = MagicMock()
+    session.get.side_effect = request
+    session.head.side_effect = request
+    return session
+
+
+@pytest.fixture
+def mock_response():
+    """Factory for canned aiohttp responses."""
+    return _build_mock_response
+
+
+@pytest.fixture
+def mock_session():
+    """Factory for aiohttp session stubs (see _build_mock_session)."""
+    return _build_mock_session
@@ -1,16 +1,25 @@
 """Tests for Claude client."""
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import anyio
 import pytest
-from src.services.claude_client import ClaudeClient
+from src.services.claude_client import (
+    ClaudeClient,
+    _fallback_search_patterns,
+    _parse_place_and_fact,
+    get_claude_client,
+)
+from src.services.lookup_common import wiki_fallback_languages
 
 
 @pytest.fixture
 def claude_client():
     """Create Claude client for testing."""
-    return ClaudeClient(api_key="test-key")
+    client = ClaudeClient(api_key="test-key")
+    yield client
+    anyio.run(client.close)
 
 
 def test_get_nearby_fact_success(claude_client):
@@ -494,3 +503,230 @@ def test_backward_compatibility_aliases():
 
     client = get_openai_client()
     assert isinstance(client, ClaudeClient)
+
+
+def test_wikipedia_language_fallback_prefers_first_language(claude_client):
+    """Test that concurrent language lookups still honour the preference order."""
+
+    async def _test():
+        async def fake_search(search_term, lang, max_images=5):
+            if lang == "en":
+                await asyncio.sleep(0.05)
+                return []
+            if lang == "ru":
+                await asyncio.sleep(0.02)
+                return ["ru.jpg"]
+            return ["fr.jpg"]
+
+        with patch.object(
+            claude_client, "_search_wikipedia_images", side_effect=fake_search
+        ):
+            images = await claude_client._search_wikipedia_images_by_priority(
+                "Louvre", ["en", "ru", "fr"]
+            )
+
+        assert images == ["ru.jpg"]
+
+    anyio.run(_test)
+
+
+def test_wikipedia_fallback_tries_russian_first_for_cyrillic_keywords():
+    """Test the language order picked for keyword image searches."""
+    assert wiki_fallback_languages("Louvre, Paris") == ("en", "ru", "fr")
+    assert wiki_fallback_languages("Дом Пашкова, Москва")[0] == "ru"
+
+
+def test_http_session_is_shared_until_closed(claude_client):
+    """Test that Wikimedia and geocoding calls reuse one aiohttp session."""
+
+    async def _test():
+        session = await claude_client._get_http_session()
+        assert await claude_client._get_http_session() is session
+
+        await claude_client.close()
+        assert session.closed
+        assert await claude_client._get_http_session() is not session
+        await claude_client.close()
+
+    anyio.run(_test)
+
+
+def test_wikipedia_media_lists_fetched_concurrently_in_page_order(
+    claude_client, mock_session, mock_response
+):
+    """Test that per-page media lists overlap but keep search-result order."""
+
+    async def _test():
+        search = {"query": {"search": [{"title": "A"}, {"title": "B"}]}}
+        session = mock_session({"*": mock_response(json_data=search)})
+        claude_client._get_http_session = AsyncMock(return_value=session)
+        claude_client._probe_image_urls = AsyncMock(
+            side_effect=lambda session, urls, headers: urls
+        )
+
+        entered = {"A": asyncio.Event(), "B": asyncio.Event()}
+
+        async def fake_media(session, lang, page_title, headers):
+            # Each page only returns once both fetches are in flight; B also
+            # finishes first, so the result order must come from the pages
+            entered[page_title].set()
+            await entered["B" if page_title == "A" else "A"].wait()
+            if page_title == "A":
+                await asyncio.sleep(0)
+            return [{"type": "image", "title": f"File:{page_title}.jpg"}]
+
+        claude_client._fetch_media_items = fake_media
+        async with asyncio.timeout(5):  # guards against a hang, not a benchmark
+            images = await claude_client._fetch_wikipedia_images("Louvre", "en")
+
+        assert [url.split("File%3A")[1][0] for url in images] == ["A", "B"]
+
+    anyio.run(_test)
+
+
+def test_probe_image_urls_drops_only_definite_failures(
+    claude_client, mock_session, mock_response
+):
+    """Test that broken URLs are dropped and unreachable ones are kept."""
+
+    async def _test():
+        session = mock_session(
+            {
+                "ok": mock_response(content_type="image/jpeg"),
+                "missing": mock_response(404, content_type="text/html"),
+                "page": mock_response(content_type="text/html"),
+                "gone": mock_response(410, content_type="text/html"),
+                "limited": mock_response(429, content_type="text/html"),
+                "down": mock_response(503, content_type="text/html"),
+                "slow": TimeoutError(),
+                "weird": ValueError("bad header"),
+            }
+        )
+
+        kept = await claude_client._probe_image_urls(
+            session,
+            ["missing", "ok", "page", "gone", "limited", "down", "slow", "weird"],
+            {},
+        )
+
+        assert kept == ["ok", "limited", "down", "slow", "weird"]
+
+    anyio.run(_test)
+
+
+def test_fallback_search_patterns_are_cached_and_deduplicated():
+    """Test the street fallback queries built for failed search keywords."""
+    _fallback_search_patterns.cache_clear()
+
+    patterns = _fallback_search_patterns("Musée, 5 Rue de Rivoli, Paris")
+
+    assert patterns == ("5 Rue de Rivoli, Paris", "5 Rue de Rivoli")
+    assert _fallback_search_patterns("Musée, 5 Rue de Rivoli, Paris") is patterns
+    assert _fallback_search_patterns("Rue de Rivoli") == ()
+
+
+def test_search_keywords_takes_first_fallback_that_resolves(claude_client):
+    """Test that fallback queries run concurrently and the first hit wins."""
+
+    async def _test():
+        slow_started = asyncio.Event()
+
+        async def fake_nominatim(query, user_lat=None, user_lon=None):
+            if query == "5 Rue de Rivoli, Paris":
+                slow_started.set()
+                await asyncio.Event().wait()  # never resolves unless cancelled
+            if query == "5 Rue de Rivoli":
+                # Only resolves while the first fallback is still in flight
+                await slow_started.wait()
+                return 48.8551, 2.3601
+            return None
+
+        claude_client.get_coordinates_from_nominatim = fake_nominatim
+        async with asyncio.timeout(5):  # guards against a hang, not a benchmark
+            coords = await claude_client.get_coordinates_from_search_keywords(
+                "Musée, 5 Rue de Rivoli, Paris"
+            )
+
+        assert coords == (48.8551, 2.3601)
+
+    anyio.run(_test)
+
+
+def test_parse_place_and_fact_joins_multiline_fact_without_sources():
+    """Test the place/fact split stored in the static location history."""
+    response = (
+        "Location: Louvre\n"
+        "Interesting fact: It was a fortress\n"
+        "\n"
+        "before it became a museum.\n"
+        "Sources:\n"
+        "- [Louvre](https://example.org)"
+    )
+
+    assert _parse_place_and_fact(response) == (
+        "Louvre",
+        "It was a fortress before it became a museum.",
+    )
+    assert _parse_place_and_fact("Just text") == ("рядом с вами", "Just text")
+
+
+def test_wikipedia_images_skip_files_shared_between_pages(
+    claude_client, mock_session, mock_response
+):
+    """Test that a photo used on several result pages is returned once."""
+
+    async def _test():
+        search = {"query": {"search": [{"title": "A"}, {"title": "B"}]}}
+        session = mock_session({"*": mock_response(json_data=search)})
+        claude_client._get_http_session = AsyncMock(return_value=session)
+        claude_client._probe_image_urls = AsyncMock(
+            side_effect=lambda session, urls, headers: urls
+        )
+        claude_client._fetch_media_items = AsyncMock(
+            side_effect=[
+                [{"type": "image", "title": "File:Shared.jpg"}],
+                [
+                    {"type": "image", "title": "File:Shared.jpg"},
+                    {"type": "image", "title": "File:Other.jpg"},
+                ],
+            ]
+        )
+
+        images = await claude_client._fetch_wikipedia_images("Louvre", "en")
+
+        assert len(images) == 2
+        assert "Shared.jpg" in images[0] and "Other.jpg" in images[1]
+
+    anyio.run(_test)
+
+
+def test_get_claude_client_returns_shared_instance(monkeypatch):
+    """Test that handlers share one client (HTTP session and static history)."""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    get_claude_client.cache_clear()
+    try:
+        assert get_claude_client() is get_claude_client()
+    finally:
+        get_claude_client.cache_clear()
+
+
+def test_stalled_request_is_retried_without_thinking(claude_client, monkeypatch):
+    """Test that a request exceeding the time budget is retried once, faster."""
+    monkeypatch.setattr(
+        "src.services.claude_client._CLAUDE_REQUEST_TIMEOUT_SECONDS", 0.05
+    )
+
+    async def _test():
+        async def fake_create(**kwargs):
+            if kwargs["thinking"]["type"] == "enabled":
+                await asyncio.sleep(1)
+            return "response"
+
+        with patch.object(claude_client.client.messages, "create", fake_create):
+            response = await claude_client._create_message_with_thinking_fallback(
+                {"model": "m", "thinking": {"type": "enabled", "budget_tokens": 1024}}
+            )
+
+        assert response == "response"
+
+    anyio.run(_test)
@@ -0,0 +1,657 @@
+"""Tests for OpenAI client helpers."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import aiohttp
+import anyio
+import pytest
+from src.services.openai_client import (
+    _USER_PREFS_TTL_SECONDS,
+    OpenAIClient,
+    StaticLocationHistory,
+    get_openai_client,
+)
+
+
+@pytest.fixture
+def openai_client():
+    """Create OpenAI client for testing."""
+    return OpenAIClient(api_key="test-key", hedge_requests=True)
+
+
+def test_race_responses_returns_first_usable_and_cancels_loser(openai_client):
+    """Test that the hedged race keeps the fastest non-empty response."""
+
+    async def _test():
+        cancelled = []
+
+        async def fake_create(**kwargs):
+            if kwargs["model"] == "gpt-5.1-mini":
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(kwargs["model"])
+                    raise
+            return MagicMock(output_text=f"answer from {kwargs['model']}")
+
+        openai_client.client.responses.create = fake_create
+
+        response = await openai_client._race_responses(
+            {"model": "gpt-5.1-mini"}, {"model": "gpt-5.1"}
+        )
+        await asyncio.sleep(0)
+
+        assert response.output_text == "answer from gpt-5.1"
+        assert cancelled == ["gpt-5.1-mini"]
+
+    anyio.run(_test)
+
+
+def _text_response(text, truncated=False):
+    """Build a Responses API answer, optionally cut off at max_output_tokens."""
+    return MagicMock(
+        output=[MagicMock(type="output_text", text=text)],
+        incomplete_details=MagicMock(reason="max_output_tokens") if truncated else None,
+    )
+
+
+def test_truncated_response_is_retried_without_reasoning(openai_client):
+    """Test that a fact cut off by the output cap is regenerated, not returned."""
+
+    async def _test():
+        create = AsyncMock(
+            side_effect=[
+                _text_response("Half a fa", truncated=True),
+                _text_response("A whole fact"),
+            ]
+        )
+        openai_client.client.responses.create = create
+        openai_client._build_responses_request = AsyncMock(
+            return_value={
+                "model": "gpt-5.1",
+                "input": [],
+                "tools": [],
+                "reasoning": {"effort": "high"},
+            }
+        )
+
+        content = await openai_client._get_with_gpt5_responses("sys", "user", False)
+
+        assert content == "A whole fact"
+        assert "reasoning" not in create.call_args.kwargs
+
+    anyio.run(_test)
+
+
+def test_truncated_response_without_reasoning_is_discarded(openai_client):
+    """Test that a truncated answer is never surfaced as the fact."""
+
+    async def _test():
+        create = AsyncMock(return_value=_text_response("Half a fa", truncated=True))
+        openai_client.client.responses.create = create
+        openai_client._build_responses_request = AsyncMock(
+            return_value={"model": "gpt-5.1", "input": [], "tools": []}
+        )
+
+        content = await openai_client._get_with_gpt5_responses("sys", "user", False)
+
+        assert content is None
+        create.assert_awaited_once()
+
+    anyio.run(_test)
+
+
+def test_race_responses_waits_for_other_on_empty_output(openai_client):
+    """Test that an empty winner does not short-circuit the race."""
+
+    async def _test():
+        async def fake_create(**kwargs):
+            if kwargs["model"] == "gpt-5.1":
+                return MagicMock(output_text="")
+            await asyncio.sleep(0.01)
+            return MagicMock(output_text="slow but useful")
+
+        openai_client.client.responses.create = fake_create
+
+        response = await openai_client._race_responses(
+            {"model": "gpt-5.1-mini"}, {"model": "gpt-5.1"}
+        )
+
+        assert response.output_text == "slow but useful"
+
+    anyio.run(_test)
+
+
+class _FakeResponseStream:
+    """Minimal stand-in for openai.AsyncStream (async iterable context manager)."""
+
+    def __init__(self, events):
+        self._events = events
+        self.close = AsyncMock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def __aiter__(self):
+        for event in self._events:
+            yield event
+
+
+def test_stream_nearby_fact_yields_text_deltas():
+    """Test that streaming forwards output_text deltas in order."""
+
+    async def _test():
+        client = OpenAIClient(api_key="test-key")
+        stream = _FakeResponseStream(
+            [
+                MagicMock(type="response.output_text.delta", delta="<answer>"),
+                MagicMock(type="response.web_search_call.completed"),
+                MagicMock(type="response.output_text.delta", delta="Fact"),
+                MagicMock(type="response.completed"),
+            ]
+        )
+        create = AsyncMock(return_value=stream)
+        client.client.responses.create = create
+
+        chunks = [chunk async for chunk in client.stream_nearby_fact(55.7558, 37.6173)]
+
+        assert chunks == ["<answer>", "Fact"]
+        assert create.call_args.kwargs["stream"] is True
+        assert create.call_args.kwargs["tools"] == [{"type": "web_search"}]
+        stream.close.assert_awaited_once()
+
+    anyio.run(_test)
+
+
+def test_stream_nearby_fact_closes_stream_when_consumer_stops_early():
+    """Test that the HTTP stream is closed and no API slot is held while yielding."""
+
+    async def _test():
+        client = OpenAIClient(api_key="test-key")
+        stream = _FakeResponseStream(
+            [
+                MagicMock(type="response.output_text.delta", delta="First"),
+                MagicMock(type="response.output_text.delta", delta="Second"),
+            ]
+        )
+        client.client.responses.create = AsyncMock(return_value=stream)
+        client._api_semaphore = asyncio.Semaphore(1)
+
+        facts = client.stream_nearby_fact(55.7558, 37.6173)
+        async for chunk in facts:
+            assert chunk == "First"
+            assert not client._api_semaphore.locked()
+            break
+        await facts.aclose()
+
+        stream.close.assert_awaited_once()
+
+    anyio.run(_test)
+
+
+def test_parse_coordinates_uses_explicit_latlon_without_geocoding(openai_client):
+    """Test that precise coordinates in the answer skip Nominatim entirely."""
+
+    async def _test():
+        response = (
+            "<answer>\n"
+            "Location: Cité Fleurie, 65 Boulevard Arago\n"
+            "Coordinates: 48.835615, 2.345458\n"
+            "Search: Cité Fleurie, 65 Boulevard Arago, Paris\n"
+            "</answer>"
+        )
+        lookup = AsyncMock()
+        openai_client.get_coordinates_from_search_keywords = lookup
+
+        coords = await openai_client.parse_coordinates_from_response(response)
+
+        assert coords == (48.835615, 2.345458)
+        lookup.assert_not_called()
+
+    anyio.run(_test)
+
+
+def test_parse_coordinates_geocodes_when_latlon_is_imprecise(openai_client):
+    """Test that city-centre style coordinates still go through geocoding."""
+
+    async def _test():
+        response = (
+            "<answer>\n"
+            "Coordinates: 55.7558, 37.6173\n"
+            "Search: Дом Пашкова, Москва\n"
+            "</answer>"
+        )
+        lookup = AsyncMock(return_value=(55.749444, 37.608889))
+        openai_client.get_coordinates_from_search_keywords = lookup
+
+        coords = await openai_client.parse_coordinates_from_response(response)
+
+        assert coords == (55.749444, 37.608889)
+        lookup.assert_awaited_once_with("Дом Пашкова, Москва", None, None)
+
+    anyio.run(_test)
+
+
+def test_build_fallback_patterns_street_and_descriptor(openai_client):
+    """Test fallback geocoding queries for a descriptor + street address."""
+    patterns = list(
+        openai_client._iter_fallback_patterns(
+            "Couvent des Capucins, Rue Boissonade, Paris", "Paris"
+        )
+    )
+
+    assert patterns[0] == "Rue Boissonade, Paris"
+    assert "capucins, Paris" in patterns
+    assert len(patterns) == len(set(patterns))
+
+
+def test_get_nearby_fact_embeds_only_recent_previous_facts():
+    """Test that a long fact history is trimmed before building prompts."""
+
+    async def _test():
+        client = OpenAIClient(api_key="test-key")
+        response = MagicMock(spec=["output_text"])
+        response.output_text = "<answer>Location: Test</answer>"
+        create = AsyncMock(return_value=response)
+        client.client.responses.create = create
+
+        history = [f"Place {i}: fact {i}" for i in range(8)]
+        await client.get_nearby_fact(55.7558, 37.6173, previous_facts=history)
+
+        user_prompt = create.call_args.kwargs["input"][1]["content"][0]["text"]
+        assert "Place 2: fact 2" not in user_prompt
+        assert all(f"Place {i}: fact {i}" in user_prompt for i in range(3, 8))
+
+    anyio.run(_test)
+
+
+def test_responses_request_reuses_system_message(openai_client):
+    """Test that requests for the same system prompt share one system item."""
+
+    async def _test():
+        first = await openai_client._build_responses_request("Rules", "Q1")
+        second = await openai_client._build_responses_request("Rules", "Q2")
+
+        assert first["input"][0] is second["input"][0]
+        assert first["input"][0]["content"][0]["text"].startswith("Rules\n\nTOOLS")
+        assert second["input"][1]["content"][0]["text"] == "Q2"
+
+    anyio.run(_test)
+
+
+def test_static_history_evicts_least_recently_used():
+    """Test that reading a location protects it from size-based eviction."""
+    history = StaticLocationHistory(max_entries=2)
+    history.add_fact("a", "Place A", "Fact A")
+    history.add_fact("b", "Place B", "Fact B")
+
+    # Touch "a" so "b" becomes the least recently used entry
+    assert history.get_previous_facts("a") == ["Place A: Fact A"]
+    history.add_fact("c", "Place C", "Fact C")
+
+    assert history.get_previous_facts("b") == []
+    assert history.get_previous_facts("a") == ["Place A: Fact A"]
+    assert history.get_cache_stats()["locations"] == 2
+
+
+def test_static_history_sweeps_expired_entries_at_most_once_per_interval(
+    monkeypatch,
+):
+    """Test that the TTL sweep is skipped until the cleanup interval passes."""
+    history = StaticLocationHistory()
+    history._last_cleanup = time.monotonic()
+    added_at = time.monotonic() - history._ttl_seconds
+    with monkeypatch.context() as m:
+        m.setattr(time, "monotonic", lambda: added_at)
+        history.add_fact("a", "Place A", "Fact A")
+
+    # Expired entries are hidden from readers but not swept yet
+    assert history.get_previous_facts("a") == []
+    assert history.get_cache_stats()["locations"] == 1
+
+    history._last_cleanup -= history._cleanup_interval
+    assert history.get_cache_stats()["locations"] == 0
+
+
+def test_http_session_is_shared_until_closed(openai_client):
+    """Test that geocoding reuses one aiohttp session and close() releases it."""
+
+    async def _test():
+        session = await openai_client._get_http_session()
+        assert await openai_client._get_http_session() is session
+
+        await openai_client.close()
+        assert session.closed
+        assert await openai_client._get_http_session() is not session
+        await openai_client.close()
+
+    anyio.run(_test)
+
+
+def test_search_keywords_takes_first_fallback_that_resolves(openai_client):
+    """Test that fallback queries run concurrently and the first hit wins."""
+
+    async def _test():
+        slow_started = asyncio.Event()
+
+        async def fake_nominatim(query, user_lat=None, user_lon=None):
+            if query == "Rue Boissonade, Paris":
+                slow_started.set()
+                await asyncio.Event().wait()  # never resolves unless cancelled
+            if query == "capucins, Paris":
+                # Only resolves while the first fallback is still in flight
+                await slow_started.wait()
+                return 48.8380, 2.3370
+            return None
+
+        openai_client.get_coordinates_from_nominatim = fake_nominatim
+        async with asyncio.timeout(5):  # guards against a hang, not a benchmark
+            coords = await openai_client.get_coordinates_from_search_keywords(
+                "Couvent des Capucins, Rue Boissonade, Paris"
+            )
+
+        assert coords == (48.8380, 2.3370)
+
+    anyio.run(_test)
+
+
+def test_user_language_is_memoized_between_calls(openai_client, monkeypatch):
+    """Test that repeated language lookups for a user reuse the cached value."""
+
+    async def _test():
+        donors_db = MagicMock()
+        donors_db.is_premium_user = AsyncMock(return_value=False)
+        donors_db.get_user_language = AsyncMock(return_value="en")
+        monkeypatch.setattr(
+            "src.services.async_donors_wrapper.get_async_donors_db",
+            AsyncMock(return_value=donors_db),
+        )
+
+        assert await openai_client._get_user_language(42) == "en"
+        assert await openai_client._get_user_language(42) == "en"
+        donors_db.get_user_language.assert_awaited_once_with(42)
+        donors_db.is_premium_user.assert_not_awaited()
+
+        # A language change is picked up once the memoized value expires
+        donors_db.get_user_language.return_value = "fr"
+        expired = time.monotonic() + _USER_PREFS_TTL_SECONDS
+        monkeypatch.setattr(time, "monotonic", lambda: expired)
+        assert await openai_client._get_user_language(42) == "fr"
+
+    anyio.run(_test)
+
+
+def test_fetch_nominatim_retries_transient_errors(
+    openai_client, mock_session, mock_response
+):
+    """Test that a dropped Nominatim connection is retried once."""
+
+    async def _test():
+        response = mock_response(json_data=[{"lat": "48.85", "lon": "2.35"}])
+        session = mock_session({"*": [aiohttp.ClientConnectionError(), response]})
+
+        data = await openai_client._fetch_nominatim(session, {"q": "Louvre"})
+
+        assert data == [{"lat": "48.85", "lon": "2.35"}]
+        assert session.get.call_count == 2
+
+    anyio.run(_test)
+
+
+def test_static_history_keeps_last_ten_and_returns_last_five():
+    """Test the per-location fact bound and the slice handed to prompts."""
+    history = StaticLocationHistory()
+    for i in range(12):
+        history.add_fact("a", f"Place {i}", f"Fact {i}")
+
+    assert history.get_cache_stats()["total_facts"] == 10
+    assert history.get_previous_facts("a") == [
+        f"Place {i}: Fact {i}" for i in range(7, 12)
+    ]
+
+
+def test_get_openai_client_returns_shared_instance(monkeypatch):
+    """Test that handlers share one client (HTTP pools and static history)."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    get_openai_client.cache_clear()
+    try:
+        client = get_openai_client()
+        assert get_openai_client() is client
+        assert client.static_history is get_openai_client().static_history
+    finally:
+        get_openai_client.cache_clear()
+
+
+def test_wikipedia_search_results_are_cached(openai_client):
+    """Test that repeated keyword searches skip the Wikipedia round-trips."""
+
+    async def _test():
+        fetch = AsyncMock(return_value=["https://example.org/a.jpg"])
+        openai_client._fetch_wikipedia_images = fetch
+
+        first = await openai_client._search_wikipedia_images("Louvre", "en", 3)
+        second = await openai_client._search_wikipedia_images("Louvre", "en", 3)
+
+        assert first == second == ["https://example.org/a.jpg"]
+        fetch.assert_awaited_once_with("Louvre", "en", 3)
+
+        # Empty results (possibly transient failures) are not cached
+        fetch.return_value = []
+        await openai_client._search_wikipedia_images("Nowhere", "en", 3)
+        await openai_client._search_wikipedia_images("Nowhere", "en", 3)
+        assert fetch.await_count == 3
+
+    anyio.run(_test)
+
+
+def test_wikipedia_search_cache_is_bounded(openai_client, monkeypatch):
+    """Test that the image search memo evicts the least recently used term."""
+    monkeypatch.setattr("src.services.openai_client._WIKI_SEARCH_CACHE_MAX_ENTRIES", 2)
+
+    async def _test():
+        openai_client._fetch_wikipedia_images = AsyncMock(return_value=["x.jpg"])
+        for term in ("a", "b", "a", "c"):
+            await openai_client._search_wikipedia_images(term, "en", 1)
+
+        assert list(openai_client._wiki_search_cache) == [
+            ("en", "a", 1),
+            ("en", "c", 1),
+        ]
+
+    anyio.run(_test)
+
+
+def test_wikipedia_images_pick_best_scored_titles_in_order(
+    openai_client, mock_session, mock_response
+):
+    """Test that top-scored media titles are selected, ties in page order."""
+
+    async def _test():
+        search = {"query": {"search": [{"title": "A"}]}}
+        session = mock_session({"*": mock_response(json_data=search)})
+        openai_client._get_http_session = AsyncMock(return_value=session)
+        openai_client._probe_image_urls = AsyncMock(
+            side_effect=lambda session, urls, headers: urls
+        )
+        openai_client._fetch_media_items = AsyncMock(
+            return_value=[
+                {"type": "image", "title": "File:Plan.png"},
+                {"type": "image", "title": "File:Louvre_1.jpg"},
+                {"type": "image", "title": "File:Other.gif"},
+                {"type": "image", "title": "File:Louvre_2.jpg"},
+            ]
+        )
+
+        images = await openai_client._fetch_wikipedia_images("Louvre", "en", 2)
+
+        assert [url.split("File%3A")[1].split("?")[0] for url in images] == [
+            "Louvre_1.jpg",
+            "Louvre_2.jpg",
+        ]
+
+    anyio.run(_test)
+
+
+def test_wikipedia_images_skip_disambiguation_and_list_pages(
+    openai_client, mock_session, mock_response
+):
+    """Test that media lists are not fetched for non-article search hits."""
+
+    async def _test():
+        search = {
+            "query": {
+                "search": [
+                    {"title": "Louvre (disambiguation)", "snippet": ""},
+                    {"title": "List of museums in Paris", "snippet": ""},
+                    {"title": "Лувр (значения)", "snippet": ""},
+                    {"title": "Louvre", "snippet": "Louvre may refer to:"},
+                    {"title": "Louvre Museum", "snippet": "The Louvre is"},
+                ]
+            }
+        }
+        session = mock_session({"*": mock_response(json_data=search)})
+        openai_client._get_http_session = AsyncMock(return_value=session)
+        openai_client._probe_image_urls = AsyncMock(
+            side_effect=lambda session, urls, headers: urls
+        )
+        openai_client._fetch_media_items = AsyncMock(return_value=[])
+
+        await openai_client._fetch_wikipedia_images("Louvre", "en", 2)
+
+        fetched = [
+            call.args[2] for call in openai_client._fetch_media_items.call_args_list
+        ]
+        assert fetched == ["Louvre Museum"]
+
+    anyio.run(_test)
+
+
+def test_static_history_expiry_heap_stays_bounded():
+    """Test that refreshing one location does not grow the expiry heap forever."""
+    history = StaticLocationHistory()
+    for i in range(500):
+        history.add_fact("a", "Place A", f"Fact {i}")
+
+    assert len(history._expiry_heap) <= 2 * len(history._cache) + 64
+    assert history.get_previous_facts("a")[-1] == "Place A: Fact 499"
+
+
+def test_static_history_drops_expired_before_evicting_live_entries(monkeypatch):
+    """Test that a full cache makes room from expired entries first."""
+    history = StaticLocationHistory(max_entries=2)
+    history._last_cleanup = time.monotonic()
+    added_at = time.monotonic() - history._ttl_seconds
+    with monkeypatch.context() as m:
+        m.setattr(time, "monotonic", lambda: added_at)
+        history.add_fact("old", "Old", "Expired fact")
+    history.add_fact("a", "Place A", "Fact A")
+    # Make "old" the most recently used so plain LRU would evict "a" instead
+    history._cache.move_to_end("old")
+
+    history.add_fact("b", "Place B", "Fact B")
+
+    assert "old" not in history._cache
+    assert history.get_previous_facts("a") == ["Place A: Fact A"]
+
+
+def test_nominatim_lookups_are_coalesced_and_cached(openai_client):
+    """Test that concurrent and repeated geocoding share one upstream call."""
+
+    async def _test():
+        calls = []
+
+        async def fake_fetch(place_name, user_lat=None, user_lon=None):
+            calls.append(place_name)
+            await asyncio.sleep(0.01)
+            return (48.8606, 2.3376) if place_name == "Louvre, Paris" else None
+
+        openai_client._fetch_nominatim_coordinates = fake_fetch
+
+        results = await asyncio.gather(
+            *(
+                openai_client.get_coordinates_from_nominatim(
+                    "Louvre, Paris", 48.86061, 2.33761
+                )
+                for _ in range(3)
+            )
+        )
+        cached = await openai_client.get_coordinates_from_nominatim(
+            "Louvre, Paris", 48.86059, 2.33759
+        )
+        assert await openai_client.get_coordinates_from_nominatim("Nowhere") is None
+        assert await openai_client.get_coordinates_from_nominatim("Nowhere") is None
+
+        assert results == [(48.8606, 2.3376)] * 3
+        assert cached == (48.8606, 2.3376)
+        assert calls == ["Louvre, Paris", "Nowhere", "Nowhere"]
+        assert not openai_client._nominatim_inflight
+
+    anyio.run(_test)
+
+
+def test_nominatim_limit_holds_after_waiters_are_cancelled(openai_client):
+    """Test that cancelled callers' lookups still count against the limit."""
+
+    async def _test():
+        active = 0
+        peak = 0
+
+        async def fake_fetch(place_name, user_lat=None, user_lon=None):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            return None
+
+        openai_client._fetch_nominatim_coordinates = fake_fetch
+
+        losers = [
+            asyncio.create_task(openai_client.get_coordinates_from_nominatim(f"a{i}"))
+            for i in range(4)
+        ]
+        await asyncio.sleep(0)
+        for loser in losers:
+            loser.cancel()
+        await asyncio.gather(
+            *(openai_client.get_coordinates_from_nominatim(f"b{i}") for i in range(4))
+        )
+        while openai_client._nominatim_inflight:
+            await asyncio.sleep(0.01)
+
+        assert peak == 2
+
+    anyio.run(_test)
+
+
+def test_identical_concurrent_fact_requests_share_one_call(openai_client):
+    """Test that duplicate in-flight get_nearby_fact calls are coalesced."""
+
+    async def _test():
+        calls = []
+
+        async def fake_generate(lat, lon, *args):
+            calls.append((lat, lon))
+            number = len(calls)
+            await asyncio.sleep(0.01)
+            return f"fact {number}"
+
+        openai_client._generate_nearby_fact = fake_generate
+
+        first, second, other = await asyncio.gather(
+            openai_client.get_nearby_fact(55.75581, 37.61731, user_id=1),
+            openai_client.get_nearby_fact(55.75582, 37.61732, user_id=1),
+            openai_client.get_nearby_fact(55.75581, 37.61731, user_id=2),
+        )
+
+        assert first == second == "fact 1"
+        assert other == "fact 2"
+        assert len(calls) == 2
+        assert not openai_client._fact_inflight
+
+    anyio.run(_test)